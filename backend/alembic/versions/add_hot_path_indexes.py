@@ -0,0 +1,59 @@
+"""add hot path indexes
+
+Revision ID: add_hot_path_indexes
+Revises: add_video_unique_constraint
+Create Date: 2024-04-10 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_hot_path_indexes'
+down_revision: Union[str, None] = 'add_video_unique_constraint'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A busca de youtube_video por (video_id, channel_id) já usa a
+    # restrição única uq_youtube_video_channel_video
+
+    # Remove vínculos repetidos do mesmo vídeo ao mesmo monitoramento,
+    # mantendo o mais antigo, antes de criar a restrição única
+    op.execute("""
+        DELETE FROM monitoring_video
+        USING monitoring_video AS kept
+        WHERE monitoring_video.monitoring_id = kept.monitoring_id
+          AND monitoring_video.video_id = kept.video_id
+          AND monitoring_video.id > kept.id
+    """)
+    op.create_unique_constraint(
+        'uq_monitoring_video_monitoring_video', 'monitoring_video', ['monitoring_id', 'video_id']
+    )
+    op.create_index(
+        'ix_monitoring_video_monitoring_status', 'monitoring_video', ['monitoring_id', 'status'], unique=False
+    )
+    op.create_index(
+        'ix_youtube_channel_access_user_channel_view',
+        'youtube_channel_access',
+        ['user_id', 'channel_id', 'can_view'],
+        unique=False
+    )
+    op.create_index(
+        'ix_youtube_monitoring_active_next_check',
+        'youtube_monitoring',
+        ['next_check_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'active'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_youtube_monitoring_active_next_check', table_name='youtube_monitoring')
+    op.drop_index('ix_youtube_channel_access_user_channel_view', table_name='youtube_channel_access')
+    op.drop_index('ix_monitoring_video_monitoring_status', table_name='monitoring_video')
+    op.drop_constraint('uq_monitoring_video_monitoring_video', 'monitoring_video', type_='unique')
\ No newline at end of file
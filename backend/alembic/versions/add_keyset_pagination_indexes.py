@@ -0,0 +1,42 @@
+"""add keyset pagination indexes
+
+Revision ID: add_keyset_pagination_indexes
+Revises: add_hot_path_indexes
+Create Date: 2024-04-12 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_keyset_pagination_indexes'
+down_revision: Union[str, None] = 'add_hot_path_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_youtube_channel_created_at_id', 'youtube_channel', ['created_at', 'id'], unique=False
+    )
+    op.create_index(
+        'ix_youtube_video_channel_published_at_id',
+        'youtube_video',
+        ['channel_id', 'published_at', 'id'],
+        unique=False
+    )
+    op.create_index(
+        'ix_youtube_monitoring_created_by_created_at_id',
+        'youtube_monitoring',
+        ['created_by', 'created_at', 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_youtube_monitoring_created_by_created_at_id', table_name='youtube_monitoring')
+    op.drop_index('ix_youtube_video_channel_published_at_id', table_name='youtube_video')
+    op.drop_index('ix_youtube_channel_created_at_id', table_name='youtube_channel')
\ No newline at end of file
@@ -0,0 +1,30 @@
+"""add monitoring circuit columns
+
+Revision ID: add_monitoring_circuit_columns
+Revises: create_channel_resolution_table
+Create Date: 2024-04-05 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_monitoring_circuit_columns'
+down_revision: Union[str, None] = 'create_channel_resolution_table'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('youtube_monitoring', sa.Column('consecutive_failures', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('youtube_monitoring', sa.Column('last_error', sa.Text(), nullable=True))
+    op.add_column('youtube_monitoring', sa.Column('circuit_open_until', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('youtube_monitoring', 'circuit_open_until')
+    op.drop_column('youtube_monitoring', 'last_error')
+    op.drop_column('youtube_monitoring', 'consecutive_failures')
\ No newline at end of file
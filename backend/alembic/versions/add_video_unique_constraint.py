@@ -0,0 +1,48 @@
+"""add video unique constraint
+
+Revision ID: add_video_unique_constraint
+Revises: add_monitoring_circuit_columns
+Create Date: 2024-04-08 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_video_unique_constraint'
+down_revision: Union[str, None] = 'add_monitoring_circuit_columns'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Mantém o registro mais antigo de cada (channel_id, video_id) e aponta
+    # os vínculos de monitoramento dos duplicados para ele
+    op.execute("""
+        WITH ranked AS (
+            SELECT id, MIN(id) OVER (PARTITION BY channel_id, video_id) AS keep_id
+            FROM youtube_video
+        )
+        UPDATE monitoring_video
+        SET video_id = ranked.keep_id
+        FROM ranked
+        WHERE monitoring_video.video_id = ranked.id
+          AND ranked.id <> ranked.keep_id
+    """)
+    op.execute("""
+        DELETE FROM youtube_video
+        USING youtube_video AS kept
+        WHERE youtube_video.channel_id = kept.channel_id
+          AND youtube_video.video_id = kept.video_id
+          AND youtube_video.id > kept.id
+    """)
+    op.create_unique_constraint(
+        'uq_youtube_video_channel_video', 'youtube_video', ['channel_id', 'video_id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_youtube_video_channel_video', 'youtube_video', type_='unique')
\ No newline at end of file
@@ -0,0 +1,26 @@
+"""add youtube_video updated_at
+
+Revision ID: add_youtube_video_updated_at
+Revises: add_keyset_pagination_indexes
+Create Date: 2024-04-15 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_youtube_video_updated_at'
+down_revision: Union[str, None] = 'add_keyset_pagination_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('youtube_video', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('youtube_video', 'updated_at')
@@ -0,0 +1,38 @@
+"""create channel resolution table
+
+Revision ID: create_channel_resolution_table
+Revises: fix_interval_time_type
+Create Date: 2024-04-02 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'create_channel_resolution_table'
+down_revision: Union[str, None] = 'fix_interval_time_type'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'youtube_channel_resolution',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('url_key', sa.String(), nullable=False),
+        sa.Column('youtube_id', sa.String(), nullable=True),
+        sa.Column('resolved_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_youtube_channel_resolution_id'), 'youtube_channel_resolution', ['id'], unique=False)
+    op.create_index(op.f('ix_youtube_channel_resolution_url_key'), 'youtube_channel_resolution', ['url_key'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_youtube_channel_resolution_url_key'), table_name='youtube_channel_resolution')
+    op.drop_index(op.f('ix_youtube_channel_resolution_id'), table_name='youtube_channel_resolution')
+    op.drop_table('youtube_channel_resolution')
\ No newline at end of file
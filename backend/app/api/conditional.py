@@ -0,0 +1,39 @@
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response, status
+
+# Cache-Control de cada tipo de leitura feita pelo painel
+NO_CACHE = "private, no-cache"  # Sempre revalida; o 304 evita reenviar o corpo
+SHORT_CACHE = "private, max-age=60"  # Dados raspados do YouTube, que mudam devagar
+
+
+def compute_etag(*parts: Any) -> str:
+    """ETag fraco derivado das versões (updated_at, contagens, etc.) do conteúdo."""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Indica se o If-None-Match da requisição já cobre `etag` (comparação fraca)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """Resposta 304, sem corpo."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
+
+
+def set_validators(response: Response, etag: str, cache_control: str) -> None:
+    """Anexa ETag e Cache-Control a uma resposta completa."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
@@ -1,16 +1,17 @@
-from typing import Generator, Optional
+from typing import AsyncGenerator, Generator, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.crud.crud_user import crud_user
 from app import models
 from app.core import security
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.db.session import AsyncSessionLocal, SessionLocal, get_async_engine
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/login"
@@ -24,6 +25,13 @@ def get_db() -> Generator:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Sessão assíncrona, para endpoints async que não devem bloquear o event loop."""
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def get_current_user(
     db: Session = Depends(get_db),
     token: str = Depends(reusable_oauth2)
@@ -1,39 +1,87 @@
-from typing import List, Optional, Any
-from fastapi import APIRouter, Depends, HTTPException, Query
+from contextlib import aclosing
+from typing import List, Optional, Any, Set
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from fastapi import status
 from datetime import datetime
 
+from app.crud.base import InvalidCursorError
 from app.crud.crud_monitoring import crud_monitoring
 from app.crud.crud_youtube import crud_youtube
 from app import models, schemas
 from app.api import deps
+from app.api.conditional import NO_CACHE, compute_etag, is_not_modified, not_modified, set_validators
 from app.core.security import get_current_active_user
 from app.services.youtube import YouTubeService
 
 router = APIRouter()
 
 
+async def _find_channel_playlists(
+    youtube_service: YouTubeService, channel_url: str, playlist_ids: List[str]
+) -> Set[str]:
+    """
+    Procura as playlists informadas no canal, em uma única leitura da aba de
+    playlists que para assim que todas forem encontradas.
+    """
+    wanted = set(playlist_ids)
+    found = set()
+    try:
+        pages = youtube_service.iter_playlists(channel_url)
+        async with aclosing(pages):
+            async for page in pages:
+                found.update(p["playlist_id"] for p in page["items"] if p["playlist_id"] in wanted)
+                if found == wanted:
+                    break
+    except Exception as e:
+        # Como em get_playlists, falhas de extração contam como não encontradas
+        pass
+    return found
+
+
 @router.get("/", response_model=List[schemas.MonitoringListItem])
 def list_monitorings(
     *,
     db: Session = Depends(deps.get_db),
+    response: Response,
     current_user: models.User = Depends(get_current_active_user),
-    skip: int = 0,
+    cursor: Optional[str] = Query(None, description="Cursor retornado em X-Next-Cursor"),
+    skip: int = Query(0, description="Obsoleto: prefira `cursor`"),
     limit: int = 100,
     status: Optional[models.MonitoringStatus] = None
 ):
     """
-    Retorna a lista de monitoramentos com informações resumidas.
+    Retorna a lista de monitoramentos com informações resumidas, do mais
+    novo ao mais antigo. O cursor da próxima página vem no cabeçalho
+    X-Next-Cursor (ausente na última).
     """
-    return crud_monitoring.get_multi_with_details(
-        db,
-        user_id=current_user.id,
-        skip=skip,
-        limit=limit,
-        status=status
-    )
+    if skip:
+        # Paginação antiga por OFFSET, mantida para clientes que ainda usam `skip`
+        return crud_monitoring.get_multi_with_details(
+            db,
+            user_id=current_user.id,
+            skip=skip,
+            limit=limit,
+            status=status
+        )
+
+    try:
+        monitorings, next_cursor = crud_monitoring.get_multi_with_details_page(
+            db,
+            user_id=current_user.id,
+            cursor=cursor,
+            limit=limit,
+            status=status
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e),
+        )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return monitorings
 
 
 @router.post("/", response_model=schemas.MonitoringInDB)
@@ -70,8 +118,9 @@ async def create_monitoring(
     # Se foram fornecidas playlists, verifica se elas existem no canal
     if monitoring_in.playlist_ids:
         youtube_service = YouTubeService()
-        playlists = await youtube_service.get_playlists(channel.channel_url)
-        valid_playlist_ids = [p["playlist_id"] for p in playlists]
+        valid_playlist_ids = await _find_channel_playlists(
+            youtube_service, channel.channel_url, monitoring_in.playlist_ids
+        )
         
         for playlist_id in monitoring_in.playlist_ids:
             if playlist_id not in valid_playlist_ids:
@@ -93,27 +142,42 @@ async def create_monitoring(
 @router.get("/{monitoring_id}", response_model=schemas.MonitoringWithDetails)
 def get_monitoring(
     *,
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     monitoring_id: int,
     current_user: models.User = Depends(deps.get_current_user),
 ) -> Any:
     """
-    Retorna os detalhes de um monitoramento.
+    Retorna os detalhes de um monitoramento. Responde 304, sem carregar os
+    vídeos, se o If-None-Match ainda corresponder à versão atual.
     """
-    monitoring = crud_monitoring.get_with_details(db, id=monitoring_id)
-    if not monitoring:
+    version = crud_monitoring.get_version(db, id=monitoring_id)
+    if not version:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Monitoramento não encontrado",
         )
 
     # Verifica se o usuário tem acesso ao canal
-    if not crud_youtube.user_can_access_channel(db, user_id=current_user.id, channel_id=monitoring["channel_id"]):
+    if not crud_youtube.user_can_access_channel(db, user_id=current_user.id, channel_id=version["channel_id"]):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Acesso não autorizado a este canal",
         )
 
+    etag = compute_etag("monitoring", monitoring_id, *version["version"])
+    if is_not_modified(request, etag):
+        return not_modified(etag, NO_CACHE)
+
+    monitoring = crud_monitoring.get_with_details(db, id=monitoring_id)
+    if not monitoring:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Monitoramento não encontrado",
+        )
+
+    set_validators(response, etag, NO_CACHE)
     return monitoring
 
 
@@ -172,8 +236,9 @@ async def update_monitoring(
     if monitoring_in.playlist_ids:
         youtube_service = YouTubeService()
         try:
-            playlists = await youtube_service.get_playlists(channel.channel_url)
-            playlist_ids = [p["playlist_id"] for p in playlists]
+            playlist_ids = await _find_channel_playlists(
+                youtube_service, channel.channel_url, monitoring_in.playlist_ids
+            )
             for playlist_id in monitoring_in.playlist_ids:
                 if playlist_id not in playlist_ids:
                     raise HTTPException(
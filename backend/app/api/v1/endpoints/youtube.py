@@ -1,14 +1,22 @@
+from contextlib import aclosing
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status, Body
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status, Body
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
 from datetime import datetime
 
 from app.crud.crud_youtube import crud_youtube
 from app import models, schemas
 from app.api import deps
+from app.api.conditional import NO_CACHE, SHORT_CACHE, compute_etag, is_not_modified, not_modified, set_validators
+from app.core.cache import YouTubeCache
+from app.core.executor import extraction_executor
+from app.core.metrics import cache_metrics
+from app.core.redis_pool import pool_stats, render_prometheus as render_pool_metrics
+from app.db import session as db_session
 from app.core.security import encrypt_api_key, decrypt_api_key, get_current_active_user
-from app.services.youtube import YouTubeService
+from app.services.youtube import InvalidCursorError, YouTubeService
 
 router = APIRouter()
 
@@ -33,7 +41,7 @@ async def create_channel(
         
         print("Extraindo ID do canal...")
         # Extrai o ID do canal da URL
-        channel_id = await youtube_service.extract_channel_id(channel_in.channel_url)
+        channel_id = await youtube_service.extract_channel_id(channel_in.channel_url, db=db)
         print(f"ID do canal extraído: {channel_id}")
         
         if not channel_id:
@@ -52,7 +60,9 @@ async def create_channel(
         
         print("Obtendo informações do canal...")
         # Obtém informações do canal
-        channel_info = await youtube_service.get_channel_info(channel_id)
+        channel_info = await youtube_service.get_channel_info(
+            f"https://www.youtube.com/channel/{channel_id}"
+        )
         print(f"Informações obtidas: {channel_info}")
         
         if not channel_info:
@@ -116,27 +126,62 @@ async def create_channel(
 @router.get("/channels", response_model=List[schemas.YoutubeChannel])
 async def list_channels(
     *,
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
-    skip: int = 0,
+    cursor: Optional[str] = Query(None, description="Cursor retornado em X-Next-Cursor"),
+    skip: int = Query(0, description="Obsoleto: prefira `cursor`"),
     limit: int = 100
-) -> List[models.YoutubeChannel]:
+) -> Any:
     """
-    Lista os canais do YouTube.
+    Lista os canais do YouTube, do mais novo ao mais antigo. O cursor da
+    próxima página vem no cabeçalho X-Next-Cursor (ausente na última).
+    Responde 304 se o If-None-Match ainda corresponder à página atual.
     """
     try:
+        next_cursor = None
+        if skip:
+            # Paginação antiga por OFFSET, mantida para clientes que ainda usam `skip`
+            if current_user.is_superuser:
+                channels = crud_youtube.get_multi(db, skip=skip, limit=limit)
+            else:
+                channels = crud_youtube.get_channels_by_user(
+                    db,
+                    user_id=current_user.id,
+                    skip=skip,
+                    limit=limit
+                )
         # Se o usuário for superusuário, retorna todos os canais
-        if current_user.is_superuser:
-            return crud_youtube.get_multi(db, skip=skip, limit=limit)
-        
-        # Caso contrário, retorna apenas os canais que o usuário tem acesso
-        return crud_youtube.get_channels_by_user(
-            db, 
-            user_id=current_user.id,
-            skip=skip,
-            limit=limit
+        elif current_user.is_superuser:
+            channels, next_cursor = crud_youtube.get_page(db, cursor=cursor, limit=limit)
+        else:
+            # Caso contrário, retorna apenas os canais que o usuário tem acesso
+            channels, next_cursor = crud_youtube.get_channels_by_user_page(
+                db, 
+                user_id=current_user.id,
+                cursor=cursor,
+                limit=limit
+            )
+
+        etag = compute_etag(
+            "channels",
+            current_user.id,
+            next_cursor,
+            *((channel.id, channel.created_at, channel.updated_at, channel.last_sync_at) for channel in channels)
         )
+        if is_not_modified(request, etag):
+            return not_modified(etag, NO_CACHE)
+        set_validators(response, etag, NO_CACHE)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return channels
         
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -147,17 +192,21 @@ async def list_channels(
 @router.get("/channels/{channel_id}", response_model=schemas.YoutubeChannelWithVideos)
 async def get_channel(
     *,
-    db: Session = Depends(deps.get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: models.User = Depends(deps.get_current_user),
     channel_id: int
 ) -> Any:
     """
-    Obtém detalhes de um canal específico.
+    Obtém detalhes de um canal específico. Se os vídeos recentes estiverem
+    em cache e o If-None-Match corresponder, responde 304 sem consultar o
+    YouTube.
     """
     try:
         # Verifica se o usuário tem acesso ao canal
         if not current_user.is_superuser:
-            if not crud_youtube.user_can_access_channel(
+            if not await crud_youtube.user_can_access_channel_async(
                 db,
                 user_id=current_user.id,
                 channel_id=channel_id
@@ -168,7 +217,7 @@ async def get_channel(
                 )
         
         # Obtém o canal do banco de dados
-        channel = crud_youtube.get_channel(db, id=channel_id)
+        channel = await crud_youtube.get_async(db, channel_id)
         if not channel:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -178,6 +227,16 @@ async def get_channel(
         # Inicializa o serviço do YouTube com a chave descriptografada
         decrypted_api_key = decrypt_api_key(channel.api_key)
         youtube_service = YouTubeService(api_key=decrypted_api_key)
+        await YouTubeCache.record_channel_access(channel.youtube_id)
+
+        def _channel_etag(videos_version: str) -> str:
+            return compute_etag(
+                "channel", channel.id, channel.updated_at, channel.last_sync_at, videos_version
+            )
+
+        videos_version = await youtube_service.get_recent_videos_version(channel.youtube_id)
+        if videos_version and is_not_modified(request, _channel_etag(videos_version)):
+            return not_modified(_channel_etag(videos_version), SHORT_CACHE)
         
         # Obtém os vídeos recentes
         videos = await youtube_service.get_recent_videos(channel.youtube_id)
@@ -216,6 +275,11 @@ async def get_channel(
             last_sync_at=channel.last_sync_at,
             recent_videos=recent_videos
         )
+
+        # Sem versão, os vídeos vieram vencidos ou de uma falha: não há o que validar depois
+        videos_version = await youtube_service.get_recent_videos_version(channel.youtube_id)
+        if videos_version:
+            set_validators(response, _channel_etag(videos_version), SHORT_CACHE)
         return channel_data
         
     except HTTPException as e:
@@ -253,10 +317,11 @@ async def get_channel_videos(
         # Primeiro tenta buscar do YouTube
         decrypted_api_key = decrypt_api_key(channel.api_key)
         youtube_service = YouTubeService(api_key=decrypted_api_key)
+        await YouTubeCache.record_channel_access(channel.youtube_id)
         videos = await youtube_service.get_recent_videos(channel.youtube_id, limit)
         
-        # Atualiza ou cria os vídeos no banco de dados
-        db_videos = []
+        # Atualiza ou cria os vídeos no banco de dados, em uma única instrução
+        videos_data = []
         for video in videos:
             # Garante que o video_id seja string
             video_id = str(video["id"])
@@ -272,25 +337,14 @@ async def get_channel_videos(
                 published_at=video["published_at"],
                 is_live=video.get("is_live", False)
             )
-            
-            # Verifica se o vídeo já existe
-            db_video = crud_youtube.get_video_by_youtube_id(db, youtube_id=video_id, channel_id=channel.id)
-            if db_video:
-                db_video = crud_youtube.update_video(db, db_obj=db_video, obj_in=video_data)
-            else:
-                db_video = crud_youtube.create_video(db, obj_in=video_data, channel_id=channel.id)
-            
-            db_videos.append(db_video)
+            videos_data.append(video_data.dict())
+
+        db_videos = crud_youtube.upsert_videos(db, channel_id=channel.id, videos=videos_data)
             
     except Exception as e:
         # Se falhar, retorna os vídeos do banco de dados
-        db_videos = (
-            db.query(models.YoutubeVideo)
-            .filter(models.YoutubeVideo.channel_id == channel_id)
-            .order_by(desc(models.YoutubeVideo.published_at))
-            .limit(limit)
-            .all()
-        )
+        db.rollback()
+        db_videos, _ = crud_youtube.get_videos_by_channel_page(db, channel_id=channel_id, limit=limit)
     
     return db_videos
 
@@ -366,8 +420,13 @@ async def sync_channel(
         api_key = decrypt_api_key(channel.api_key)
         youtube = YouTubeService(api_key)
         
+        # Descarta o que estiver em cache para buscar os dados atuais
+        await YouTubeCache.clear_channel_cache(channel.youtube_id)
+        
         # Sincroniza dados do canal
-        channel_info = await youtube.get_channel_info(channel.channel_url)
+        channel_info = await youtube.get_channel_info(
+            f"https://www.youtube.com/channel/{channel.youtube_id}"
+        )
         channel_data = {
             "updated_by": current_user.id,
             "last_sync_at": datetime.utcnow(),
@@ -489,11 +548,17 @@ async def validate_video(
 @router.get("/channels/{channel_id}/playlists", response_model=List[schemas.YoutubePlaylist])
 async def get_channel_playlists(
     channel_id: int,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="Cursor retornado em X-Next-Cursor"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Playlists por página"),
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
 ) -> Any:
     """
-    Retorna todas as playlists de um canal.
+    Retorna as playlists de um canal.
+
+    Sem `cursor` nem `limit`, retorna todas. Com eles, retorna uma página e
+    o cursor da próxima no cabeçalho X-Next-Cursor (ausente na última).
     """
     channel = crud_youtube.get_channel(db, id=channel_id)
     if not channel:
@@ -511,9 +576,23 @@ async def get_channel_playlists(
     try:
         decrypted_api_key = decrypt_api_key(channel.api_key)
         youtube_service = YouTubeService(api_key=decrypted_api_key)
-        playlists = await youtube_service.get_playlists(channel.channel_url)
-        
-        # Formata as playlists para incluir todos os campos obrigatórios
+        await YouTubeCache.record_channel_access(channel.youtube_id)
+
+        if cursor is not None or limit is not None:
+            playlists = []
+            pages = youtube_service.iter_playlists(channel.channel_url, page_size=limit, cursor=cursor)
+            async with aclosing(pages):
+                async for page in pages:
+                    playlists = page["items"]
+                    if page["next_cursor"]:
+                        response.headers["X-Next-Cursor"] = page["next_cursor"]
+                    break
+        else:
+            # A lista completa passa pelo cache, mantido aquecido para canais monitorados
+            playlists = await youtube_service.fetch_playlists(
+                f"https://www.youtube.com/channel/{channel.youtube_id}"
+            )
+
         formatted_playlists = []
         for playlist in playlists:
             formatted_playlist = schemas.YoutubePlaylist(
@@ -529,8 +608,47 @@ async def get_channel_playlists(
             formatted_playlists.append(formatted_playlist)
             
         return formatted_playlists
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Não foi possível obter as playlists do canal. Tente novamente mais tarde.",
-        ) 
\ No newline at end of file
+        ) 
+
+
+@router.get("/cache/stats")
+def get_cache_stats(
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Retorna as taxas de acerto do cache em memória (L1) e do Redis (L2),
+    os contadores por família de chaves, a latência do Redis, a ocupação
+    dos pools de conexão do Redis e do Postgres e a fila do pool de extração
+    do yt-dlp neste processo da API.
+    """
+    return {
+        **YouTubeCache.stats(),
+        "redis_pools": pool_stats(),
+        "db_pools": db_session.pool_stats(),
+        "extraction": extraction_executor.stats(),
+    }
+
+
+@router.get("/cache/metrics", response_class=PlainTextResponse)
+def get_cache_metrics(
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Exporta as métricas do cache, dos pools do Redis e do Postgres e do pool
+    de extração deste processo da API no formato texto do Prometheus.
+    """
+    return (
+        cache_metrics.render_prometheus()
+        + render_pool_metrics()
+        + db_session.render_prometheus()
+        + extraction_executor.render_prometheus()
+    )
\ No newline at end of file
@@ -1,25 +1,191 @@
+import asyncio
+import functools
+import hashlib
+import inspect
 import json
-from typing import Any, Optional
+import math
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, Mapping, Optional, Tuple, Type, Union
 from datetime import timedelta
-from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+from app.core.codec import CodecError, get_codec
 from app.core.config import settings
+from app.core.metrics import cache_metrics
+from app.core.redis_pool import create_redis
 
-# Configuração do Redis
-redis_url = f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}"
-redis_options = {
-    "db": settings.REDIS_DB,
-    "encoding": "utf-8",
-    "decode_responses": True
-}
+# Clientes do Redis, no banco lógico do cache
+redis = create_redis("cache", settings.REDIS_DB)
 
-if settings.REDIS_PASSWORD:
-    redis_options["password"] = settings.REDIS_PASSWORD
+# Cliente sem decodificação para os valores do cache, que são binários
+redis_binary = create_redis("cache_binary", settings.REDIS_DB, decode_responses=False)
+
+# O listener de invalidação fica bloqueado lendo mensagens: sem tempo limite
+redis_pubsub = create_redis("cache_pubsub", settings.REDIS_DB, socket_timeout=None, max_connections=2)
+
+# Canal do Redis por onde os processos avisam uns aos outros sobre escritas
+INVALIDATION_CHANNEL = "youtube:cache:invalidate"
+
+# Prefixo dos conjuntos que agrupam as chaves de um canal ou playlist
+TAG_PREFIX = "youtube:tag"
+
+# Conjunto ordenado com a frequência recente de acesso a cada canal
+CHANNEL_ACCESS_KEY = "youtube:access:channels"
+
+# Registra a chave no conjunto da tag, que vive pelo menos tanto quanto ela
+_TAG_KEY_SCRIPT = """
+redis.call("SADD", KEYS[1], ARGV[1])
+if redis.call("TTL", KEYS[1]) < tonumber(ARGV[2]) then
+    redis.call("EXPIRE", KEYS[1], ARGV[2])
+end
+return 1
+"""
+
+# Chaves removidas por comando DEL na invalidação em lote
+_DELETE_BATCH_SIZE = 500
+
+# Marca os valores guardados com validade flexível (stale-while-revalidate)
+_SWR_MARKER = "__swr__"
+
+# Marca as falhas memorizadas pelo cache negativo
+_NEGATIVE_MARKER = "__negative__"
+
+# Atualizações em segundo plano em andamento, para não serem coletadas
+_background_refreshes = set()
+
+# Libera o lock de recarga só se ele ainda pertencer a quem o adquiriu
+_RELEASE_REFRESH_LOCK_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+class LocalCache:
+    """
+    Cache em memória do processo (L1), com despejo LRU por tamanho e TTL
+    curto. Os valores são devolvidos sem cópia: quem lê não deve alterá-los.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Retorna (encontrado, valor)."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return False, None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        if self.max_size <= 0:
+            return
+        ttl = min(self.ttl, ttl) if ttl else self.ttl
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+local_cache = LocalCache(max_size=settings.CACHE_L1_MAX_SIZE, ttl=settings.CACHE_L1_TTL)
+
+# Identifica este processo nas mensagens de invalidação
+_process_id = uuid.uuid4().hex
+_stats = {"l1_hits": 0, "l1_misses": 0, "l2_hits": 0, "l2_misses": 0}
+
+
+@contextmanager
+def _timed(command: str) -> Iterator[None]:
+    """Mede a latência de um comando do Redis."""
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        cache_metrics.observe_latency(command, time.perf_counter() - started_at)
+
+
+async def _publish_invalidation(keys: Iterable[str]) -> None:
+    """Avisa os demais processos para descartarem as chaves do L1."""
+    message = json.dumps({"origin": _process_id, "keys": list(keys)})
+    try:
+        await redis.publish(INVALIDATION_CHANNEL, message)
+    except RedisError:
+        # Os demais processos ficam, no pior caso, até CACHE_L1_TTL defasados
+        pass
+
+
+def _apply_invalidation(data: str) -> None:
+    message = json.loads(data)
+    if message.get("origin") == _process_id:
+        return
+    local_cache.delete(*message.get("keys") or [])
+
+
+async def listen_invalidations() -> None:
+    """
+    Mantém o L1 deste processo coerente com as escritas feitas por outros
+    processos. Deve rodar como task de fundo durante toda a vida do processo.
+    """
+    while True:
+        pubsub = redis_pubsub.pubsub()
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            # Mensagens perdidas enquanto estava desconectado: descarta tudo
+            local_cache.clear()
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    _apply_invalidation(message["data"])
+        except RedisError:
+            await asyncio.sleep(1)
+        finally:
+            await pubsub.close()
+
+
+async def wait_background_refreshes() -> None:
+    """
+    Aguarda as atualizações em segundo plano iniciadas no event loop atual.
+    Quem fecha o loop ao fim de cada tarefa, como os workers do Celery, deve
+    chamá-la antes: do contrário as atualizações pendentes são canceladas.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        pending = [task for task in _background_refreshes if task.get_loop() is loop and not task.done()]
+        if not pending:
+            return
+        await asyncio.gather(*pending, return_exceptions=True)
 
-redis = aioredis.from_url(redis_url, **redis_options)
 
 class YouTubeCache:
     """
-    Gerenciador de cache para dados do YouTube usando Redis.
+    Gerenciador de cache para dados do YouTube, em duas camadas: um cache
+    em memória do processo (L1) na frente do Redis (L2).
     """
     
     @staticmethod
@@ -28,28 +194,400 @@ class YouTubeCache:
         return f"youtube:{key_type}:{id}:{subresource}".rstrip(":")
 
     @staticmethod
-    async def set_cache(key: str, data: Any, expire: int = 3600) -> None:
-        """Define um valor no cache com tempo de expiração."""
-        await redis.set(key, json.dumps(data), ex=expire)
+    def _tag_key(tag: str) -> str:
+        return f"{TAG_PREFIX}:{tag}"
+
+    @classmethod
+    async def set_cache(cls, key: str, data: Any, expire: int = 3600, tags: Iterable[str] = ()) -> None:
+        """
+        Define um valor no cache com tempo de expiração. A chave é registrada
+        em cada tag (ex.: "channel:<id>") para ser invalidada junto com ela.
+        O valor é serializado pelo codec configurado em CACHE_CODEC.
+        """
+        await cls.set_many({key: data}, expire=expire, tags={key: tags})
+
+    @classmethod
+    async def _set_quietly(cls, key: str, data: Any, expire: int, tags: Iterable[str] = ()) -> None:
+        """Como set_cache, mas uma falha do Redis só deixa de guardar o valor."""
+        try:
+            await cls.set_cache(key, data, expire=expire, tags=tags)
+        except RedisError:
+            pass
+
+    @classmethod
+    async def _get_quietly(cls, key: str) -> Optional[Any]:
+        """Como _get_raw, mas uma falha do Redis vale como ausência."""
+        try:
+            return await cls._get_raw(key)
+        except RedisError:
+            return None
+
+    @classmethod
+    async def get_cache(cls, key: str) -> Optional[Any]:
+        """Recupera um valor do cache, consultando o L1 antes do Redis."""
+        return cls._unwrap(await cls._get_raw(key))
+
+    @staticmethod
+    def _is_envelope(value: Any) -> bool:
+        return isinstance(value, dict) and bool(value.get(_SWR_MARKER))
 
     @staticmethod
-    async def get_cache(key: str) -> Optional[Any]:
-        """Recupera um valor do cache."""
-        data = await redis.get(key)
-        return json.loads(data) if data else None
+    def _is_negative(value: Any) -> bool:
+        return isinstance(value, dict) and bool(value.get(_NEGATIVE_MARKER))
+
+    @classmethod
+    def _unwrap(cls, value: Any) -> Any:
+        if cls._is_envelope(value):
+            return value["value"]
+        if cls._is_negative(value):
+            return None
+        return value
+
+    @staticmethod
+    def _decode(key: str, data: Optional[bytes]) -> Optional[Any]:
+        """Decodifica um valor lido do Redis e o guarda no L1."""
+        if not data:
+            return None
+        cache_metrics.incr(key, "bytes_read", len(data))
+        try:
+            value = get_codec().decode(data)
+        except CodecError:
+            # Entrada de outra versão ou de outro codec: vale como ausente
+            return None
+        local_cache.set(key, value)
+        return value
+
+    @classmethod
+    def _count_read(cls, key: str, level: str, value: Optional[Any]) -> None:
+        """Contabiliza uma consulta ao L1 ("l1") ou ao Redis ("l2")."""
+        if value is None:
+            _stats[f"{level}_misses"] += 1
+            # Falta no L1 ainda segue para o Redis: só a do Redis vale para a família
+            if level == "l2":
+                cache_metrics.incr(key, "misses")
+            return
+        _stats[f"{level}_hits"] += 1
+        cache_metrics.incr(key, "negative_hits" if cls._is_negative(value) else "hits")
+
+    @classmethod
+    async def _get_raw(cls, key: str) -> Optional[Any]:
+        found, value = local_cache.get(key)
+        if found:
+            cls._count_read(key, "l1", value)
+            return value
+        cls._count_read(key, "l1", None)
+        with _timed("get"):
+            data = await redis_binary.get(key)
+        value = cls._decode(key, data)
+        cls._count_read(key, "l2", value)
+        return value
+
+    @classmethod
+    async def get_version(cls, key: str) -> Optional[str]:
+        """
+        Identifica a carga atual de uma entrada com stale-while-revalidate,
+        mudando a cada recarga. None se a entrada não existe ou já venceu.
+        """
+        envelope = await cls._get_raw(key)
+        if not cls._is_envelope(envelope) or time.time() >= envelope["soft_expires_at"]:
+            return None
+        return repr(envelope["soft_expires_at"])
+
+    @classmethod
+    async def get_many(cls, keys: Iterable[str], count_misses: bool = True) -> Dict[str, Any]:
+        """
+        Recupera vários valores de uma vez: o que não está no L1 é lido do
+        Redis com um único MGET. Retorna só as chaves encontradas.
+
+        Com `count_misses=False`, as chaves ausentes e as entradas negativas
+        não entram nas métricas: o chamador vai consultá-las de novo, uma a
+        uma, e essa segunda consulta é a que conta.
+        """
+        def _count(key: str, level: str, value: Optional[Any]) -> None:
+            if count_misses or (value is not None and not cls._is_negative(value)):
+                if level == "l2":
+                    cls._count_read(key, "l1", None)
+                cls._count_read(key, level, value)
+
+        result = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            found, value = local_cache.get(key)
+            if not found:
+                missing.append(key)
+                continue
+            _count(key, "l1", value)
+            value = cls._unwrap(value)
+            if value is not None:
+                result[key] = value
+
+        if missing:
+            try:
+                with _timed("mget"):
+                    values = await redis_binary.mget(missing)
+            except RedisError:
+                # Sem o Redis, o que não está no L1 vale como ausente
+                values = [None] * len(missing)
+            for key, data in zip(missing, values):
+                value = cls._decode(key, data)
+                _count(key, "l2", value)
+                value = cls._unwrap(value)
+                if value is not None:
+                    result[key] = value
+        return result
+
+    @classmethod
+    async def set_many(
+        cls,
+        items: Mapping[str, Any],
+        expire: int = 3600,
+        ttls: Optional[Mapping[str, int]] = None,
+        tags: Optional[Mapping[str, Iterable[str]]] = None
+    ) -> None:
+        """
+        Define vários valores em um único pipeline. `ttls` e `tags` permitem
+        expiração e tags próprias por chave; as demais usam `expire`.
+        """
+        if not items:
+            return
+        ttls = ttls or {}
+        tags = tags or {}
+        codec = get_codec()
+        async with redis_binary.pipeline(transaction=False) as pipe:
+            for key, data in items.items():
+                key_expire = ttls.get(key, expire)
+                payload = codec.encode(data)
+                cache_metrics.incr(key, "bytes_written", len(payload))
+                pipe.set(key, payload, ex=key_expire)
+                for tag in tags.get(key, ()):
+                    pipe.eval(_TAG_KEY_SCRIPT, 1, cls._tag_key(tag), key, key_expire)
+            with _timed("set"):
+                await pipe.execute()
+        for key, data in items.items():
+            local_cache.set(key, data, ttl=ttls.get(key, expire))
+        await _publish_invalidation(items.keys())
+
+    @classmethod
+    async def _serve_envelope(
+        cls,
+        key: str,
+        envelope: Dict[str, Any],
+        loader: Callable[[], Awaitable[Any]],
+        soft_ttl: int,
+        hard_ttl: int,
+        tags: Union[Iterable[str], Callable[[Any], Iterable[str]]]
+    ) -> Any:
+        """
+        Serve uma entrada com stale-while-revalidate.
+
+        Até `soft_ttl` o valor é servido normalmente. Depois disso, e até
+        `hard_ttl`, o valor antigo continua sendo servido na hora enquanto
+        uma única atualização em segundo plano, protegida por um lock no
+        Redis, executa `loader` e regrava a entrada. Perto do vencimento a
+        atualização pode começar antes, com probabilidade que cresce com o
+        custo da recarga, para espalhar as recargas no tempo.
+        """
+        if time.time() >= envelope["soft_expires_at"]:
+            cache_metrics.incr(key, "stale_hits")
+
+        # Vencimento antecipado probabilístico (XFetch)
+        early = envelope["delta"] * settings.CACHE_EARLY_EXPIRATION_BETA * -math.log(1.0 - random.random())
+        if time.time() + early >= envelope["soft_expires_at"]:
+            await cls._refresh_in_background(key, loader, soft_ttl, hard_ttl, tags)
+        return envelope["value"]
+
+    @classmethod
+    async def _load(
+        cls,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        soft_ttl: int,
+        hard_ttl: int,
+        tags: Union[Iterable[str], Callable[[Any], Iterable[str]]]
+    ) -> Optional[Any]:
+        started_at = time.monotonic()
+        value = await loader()
+        if value is not None:
+            envelope = {
+                _SWR_MARKER: 1,
+                "value": value,
+                "soft_expires_at": time.time() + soft_ttl,
+                # Custo da recarga, usado no vencimento antecipado
+                "delta": time.monotonic() - started_at,
+            }
+            # As tags podem depender do valor carregado
+            await cls._set_quietly(key, envelope, expire=hard_ttl, tags=tags(value) if callable(tags) else tags)
+        return value
+
+    @classmethod
+    async def _refresh_in_background(
+        cls,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        soft_ttl: int,
+        hard_ttl: int,
+        tags: Union[Iterable[str], Callable[[Any], Iterable[str]]]
+    ) -> None:
+        # O lock expira sozinho se o processo morrer no meio da recarga
+        lock_key = f"{key}:refresh"
+        token = uuid.uuid4().hex
+        try:
+            acquired = await redis.set(lock_key, token, nx=True, ex=settings.CACHE_REFRESH_LOCK_TTL)
+        except RedisError:
+            return
+        if not acquired:
+            return
+
+        async def _refresh() -> None:
+            try:
+                await cls._load(key, loader, soft_ttl, hard_ttl, tags)
+            except Exception:
+                pass
+            finally:
+                try:
+                    await redis.eval(_RELEASE_REFRESH_LOCK_SCRIPT, 1, lock_key, token)
+                except RedisError:
+                    pass
+
+        task = asyncio.ensure_future(_refresh())
+        _background_refreshes.add(task)
+        task.add_done_callback(_background_refreshes.discard)
 
     @staticmethod
     async def delete_cache(key: str) -> None:
         """Remove um valor do cache."""
-        await redis.delete(key)
+        with _timed("delete"):
+            await redis.delete(key)
+        local_cache.delete(key)
+        await _publish_invalidation([key])
+
+    @classmethod
+    async def invalidate_tags(cls, *tags: str) -> int:
+        """
+        Remove todas as chaves registradas nas tags, sem percorrer o keyspace.
+        Retorna quantas chaves foram removidas.
+        """
+        keys = set()
+        for tag in tags:
+            # Lê e apaga o conjunto de uma vez: escritas concorrentes entram
+            # em um conjunto novo, e não se perdem
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.smembers(cls._tag_key(tag))
+                pipe.delete(cls._tag_key(tag))
+                members, _ = await pipe.execute()
+            keys.update(members)
+
+        keys = sorted(keys)
+        if keys:
+            async with redis.pipeline(transaction=False) as pipe:
+                for start in range(0, len(keys), _DELETE_BATCH_SIZE):
+                    pipe.delete(*keys[start:start + _DELETE_BATCH_SIZE])
+                with _timed("delete"):
+                    await pipe.execute()
+            local_cache.delete(*keys)
+            await _publish_invalidation(keys)
+        return len(keys)
 
     @classmethod
     async def clear_channel_cache(cls, channel_id: str) -> None:
         """Limpa todo o cache relacionado a um canal."""
-        pattern = cls._generate_key("channel", channel_id, "*")
-        keys = await redis.keys(pattern)
-        if keys:
-            await redis.delete(*keys)
+        await cls.invalidate_tags(f"channel:{channel_id}")
+
+    @classmethod
+    async def clear_playlist_cache(cls, playlist_id: str) -> None:
+        """Limpa todo o cache relacionado a uma playlist."""
+        await cls.invalidate_tags(f"playlist:{playlist_id}")
+
+    @classmethod
+    async def sweep_tags(cls, batch_size: int = 500) -> Dict[str, int]:
+        """
+        Remove das tags as chaves que já expiraram e apaga as tags vazias.
+        Usa SCAN/SSCAN para não bloquear o Redis, que também é o broker do
+        Celery. Retorna {"tags", "orphans", "empty_tags"}.
+        """
+        result = {"tags": 0, "orphans": 0, "empty_tags": 0}
+        async for tag_key in redis.scan_iter(match=f"{TAG_PREFIX}:*", count=batch_size):
+            result["tags"] += 1
+            cursor = 0
+            while True:
+                cursor, members = await redis.sscan(tag_key, cursor=cursor, count=batch_size)
+                if members:
+                    async with redis.pipeline(transaction=False) as pipe:
+                        for member in members:
+                            pipe.exists(member)
+                        exists = await pipe.execute()
+                    orphans = [member for member, found in zip(members, exists) if not found]
+                    if orphans:
+                        await redis.srem(tag_key, *orphans)
+                        result["orphans"] += len(orphans)
+                if cursor == 0:
+                    break
+            # SREM do último membro já apaga o conjunto no Redis
+            if not await redis.exists(tag_key):
+                result["empty_tags"] += 1
+        return result
+
+    @staticmethod
+    async def get_ttls(keys: Iterable[str]) -> Dict[str, int]:
+        """
+        Tempo restante de cada chave, em segundos, em um único pipeline.
+        -2 indica chave ausente e -1, chave sem expiração.
+        """
+        keys = list(keys)
+        if not keys:
+            return {}
+        async with redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.ttl(key)
+            ttls = await pipe.execute()
+        return dict(zip(keys, ttls))
+
+    @staticmethod
+    async def record_channel_access(channel_id: str) -> None:
+        """Conta uma leitura do canal pela API, usada para priorizar o aquecimento."""
+        try:
+            await redis.zincrby(CHANNEL_ACCESS_KEY, 1, channel_id)
+        except RedisError:
+            pass
+
+    @staticmethod
+    async def get_channel_access_scores(channel_ids: Iterable[str]) -> Dict[str, float]:
+        """Frequência recente de acesso de cada canal; 0 para os nunca lidos."""
+        channel_ids = list(channel_ids)
+        if not channel_ids:
+            return {}
+        async with redis.pipeline(transaction=False) as pipe:
+            for channel_id in channel_ids:
+                pipe.zscore(CHANNEL_ACCESS_KEY, channel_id)
+            scores = await pipe.execute()
+        return {channel_id: score or 0.0 for channel_id, score in zip(channel_ids, scores)}
+
+    @staticmethod
+    async def decay_channel_access(factor: float) -> None:
+        """
+        Multiplica todas as frequências por `factor`, para que acessos
+        antigos pesem menos que os recentes, e descarta as desprezíveis.
+        """
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.zunionstore(CHANNEL_ACCESS_KEY, {CHANNEL_ACCESS_KEY: factor})
+            pipe.zremrangebyscore(CHANNEL_ACCESS_KEY, "-inf", 0.01)
+            await pipe.execute()
+
+    @staticmethod
+    def stats() -> Dict[str, Any]:
+        """
+        Acertos e falhas de cada camada desde o início do processo, além dos
+        contadores por família de chaves e da latência do Redis.
+        """
+        l1_total = _stats["l1_hits"] + _stats["l1_misses"]
+        l2_total = _stats["l2_hits"] + _stats["l2_misses"]
+        return {
+            **_stats,
+            "l1_hit_ratio": _stats["l1_hits"] / l1_total if l1_total else 0.0,
+            "l2_hit_ratio": _stats["l2_hits"] / l2_total if l2_total else 0.0,
+            "l1_size": len(local_cache),
+            **cache_metrics.snapshot(),
+        }
 
     # Métodos específicos para cada tipo de dado
     @classmethod
@@ -58,11 +596,28 @@ class YouTubeCache:
         key = cls._generate_key("channel", channel_id)
         return await cls.get_cache(key)
 
+    @classmethod
+    async def get_channels_info(cls, channel_ids: Iterable[str]) -> Dict[str, dict]:
+        """Obtém informações de vários canais do cache em uma ida ao Redis."""
+        keys = {cls._generate_key("channel", channel_id): channel_id for channel_id in channel_ids}
+        found = await cls.get_many(keys)
+        return {keys[key]: value for key, value in found.items()}
+
+    @classmethod
+    async def get_channels_details(cls, channel_ids: Iterable[str]) -> Dict[str, dict]:
+        """
+        Obtém, em uma ida ao Redis, os dados extraídos de vários canais
+        guardados por YouTubeService.get_channel_info, mesmo que já vencidos.
+        """
+        keys = {cls._generate_key("channel", channel_id, "details"): channel_id for channel_id in channel_ids}
+        found = await cls.get_many(keys)
+        return {keys[key]: value for key, value in found.items()}
+
     @classmethod
     async def set_channel_info(cls, channel_id: str, data: dict) -> None:
         """Armazena informações do canal no cache por 1 hora."""
         key = cls._generate_key("channel", channel_id)
-        await cls.set_cache(key, data, expire=3600)  # 1 hora
+        await cls.set_cache(key, data, expire=3600, tags=[f"channel:{channel_id}"])  # 1 hora
 
     @classmethod
     async def get_playlists(cls, channel_id: str) -> Optional[list]:
@@ -74,7 +629,7 @@ class YouTubeCache:
     async def set_playlists(cls, channel_id: str, data: list) -> None:
         """Armazena playlists do canal no cache por 6 horas."""
         key = cls._generate_key("channel", channel_id, "playlists")
-        await cls.set_cache(key, data, expire=21600)  # 6 horas
+        await cls.set_cache(key, data, expire=21600, tags=[f"channel:{channel_id}"])  # 6 horas
 
     @classmethod
     async def get_recent_videos(cls, channel_id: str) -> Optional[list]:
@@ -86,7 +641,7 @@ class YouTubeCache:
     async def set_recent_videos(cls, channel_id: str, data: list) -> None:
         """Armazena vídeos recentes do canal no cache por 15 minutos."""
         key = cls._generate_key("channel", channel_id, "recent_videos")
-        await cls.set_cache(key, data, expire=900)  # 15 minutos
+        await cls.set_cache(key, data, expire=900, tags=[f"channel:{channel_id}"])  # 15 minutos
 
     @classmethod
     async def get_playlist_videos(cls, playlist_id: str) -> Optional[list]:
@@ -98,4 +653,179 @@ class YouTubeCache:
     async def set_playlist_videos(cls, playlist_id: str, data: list) -> None:
         """Armazena vídeos de uma playlist no cache por 2 horas."""
         key = cls._generate_key("playlist", playlist_id, "videos")
-        await cls.set_cache(key, data, expire=7200)  # 2 horas 
\ No newline at end of file
+        await cls.set_cache(key, data, expire=7200, tags=[f"playlist:{playlist_id}"])  # 2 horas
+
+    @classmethod
+    async def get_video_info(cls, video_id: str) -> Optional[dict]:
+        """Obtém informações de um vídeo do cache."""
+        key = cls._generate_key("video", video_id)
+        return await cls.get_cache(key)
+
+    @classmethod
+    async def get_videos_info(cls, video_ids: Iterable[str], count_misses: bool = True) -> Dict[str, dict]:
+        """Obtém informações de vários vídeos do cache em uma ida ao Redis."""
+        keys = {cls._generate_key("video", video_id): video_id for video_id in video_ids}
+        found = await cls.get_many(keys, count_misses=count_misses)
+        return {keys[key]: value for key, value in found.items()}
+
+    @classmethod
+    async def set_video_info(cls, video_id: str, data: dict) -> None:
+        """Armazena informações de um vídeo no cache por 6 horas."""
+        key = cls._generate_key("video", video_id)
+        tags = [f"channel:{data['channel_id']}"] if data.get("channel_id") else []
+        await cls.set_cache(key, data, expire=21600, tags=tags)  # 6 horas
+
+    @classmethod
+    async def get_channel_resolution(cls, url_key: str) -> Optional[dict]:
+        """
+        Obtém a resolução de uma URL de canal do cache.
+        Retorna {"youtube_id": None} para resoluções negativas.
+        """
+        key = cls._generate_key("resolution", url_key)
+        return await cls.get_cache(key)
+
+    @classmethod
+    async def set_channel_resolution(cls, url_key: str, youtube_id: Optional[str], expire: int) -> None:
+        """Armazena a resolução de uma URL de canal no cache."""
+        key = cls._generate_key("resolution", url_key)
+        await cls.set_cache(key, {"youtube_id": youtube_id}, expire=expire)
+
+    @classmethod
+    async def get_latest_video_id(cls, monitoring_id: int) -> Optional[str]:
+        """Obtém o vídeo mais recente já registrado para um monitoramento."""
+        key = cls._generate_key("monitoring", str(monitoring_id), "latest_video")
+        return await cls.get_cache(key)
+
+    @classmethod
+    async def get_latest_video_ids(cls, monitoring_ids: Iterable[int]) -> Dict[int, str]:
+        """Obtém o último vídeo registrado de vários monitoramentos de uma vez."""
+        keys = {
+            cls._generate_key("monitoring", str(monitoring_id), "latest_video"): monitoring_id
+            for monitoring_id in monitoring_ids
+        }
+        found = await cls.get_many(keys)
+        return {keys[key]: value for key, value in found.items()}
+
+    @classmethod
+    async def set_latest_video_id(cls, monitoring_id: int, video_id: str) -> None:
+        """Armazena o vídeo mais recente de um monitoramento por 30 dias."""
+        key = cls._generate_key("monitoring", str(monitoring_id), "latest_video")
+        await cls.set_cache(key, video_id, expire=2592000)  # 30 dias
+
+
+class CachedFailureError(Exception):
+    """Falha memorizada pelo cache negativo; a mensagem é a do erro original."""
+
+
+def _hash_arguments(arguments: Dict[str, Any]) -> str:
+    data = json.dumps(arguments, sort_keys=True, default=str)
+    return hashlib.sha1(data.encode()).hexdigest()[:16]
+
+
+def cached(
+    key_type: str,
+    ttl: int,
+    key: Optional[Callable[..., Optional[str]]] = None,
+    soft_ttl: Optional[int] = None,
+    tags: Optional[Callable[..., Iterable[str]]] = None,
+    negative_ttl: Optional[int] = None,
+    negative_exceptions: Tuple[Type[BaseException], ...] = (),
+    exclude: Iterable[str] = ("self", "db")
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """
+    Guarda no YouTubeCache o resultado de um método assíncrono.
+
+    A chave é youtube:<key_type>:<id>. O <id> vem de `key`, chamado com os
+    argumentos da chamada por nome; sem `key`, é o nome do método seguido de
+    um hash dos argumentos, menos os de `exclude`. Se `key` retornar None, a
+    chamada não passa pelo cache. `tags` recebe o resultado (None nas
+    entradas negativas) e os argumentos e retorna as tags da entrada.
+
+    Com `soft_ttl`, a leitura usa stale-while-revalidate e `ttl` passa a ser
+    a validade máxima. Com `negative_ttl`, resultados None e exceções de
+    `negative_exceptions` também são guardados, por esse tempo: até lá, as
+    chamadas retornam None ou levantam CachedFailureError sem executar o
+    método.
+
+    Se o Redis estiver indisponível, a leitura vale como ausência e a
+    gravação é ignorada: o método é executado como se não houvesse cache.
+
+    O método decorado aceita ainda `force_refresh=True`, que ignora o valor
+    guardado e o regrava (sem trocá-lo por uma falha), e `use_cache=False`,
+    que não lê nem grava. `metodo.cache_key(self, ...)` retorna a chave de
+    uma chamada, e `ttl` e `soft_ttl` ficam expostos como atributos.
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        signature = inspect.signature(func)
+
+        def _arguments(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return {name: value for name, value in bound.arguments.items() if name not in exclude}
+
+        def _key(arguments: Dict[str, Any]) -> Optional[str]:
+            cache_id = key(**arguments) if key else f"{func.__name__}:{_hash_arguments(arguments)}"
+            return YouTubeCache._generate_key(key_type, cache_id) if cache_id is not None else None
+
+        def cache_key(*args: Any, **kwargs: Any) -> Optional[str]:
+            return _key(_arguments(args, kwargs))
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, force_refresh: bool = False, use_cache: bool = True, **kwargs: Any) -> Any:
+            if not use_cache:
+                return await func(*args, **kwargs)
+
+            arguments = _arguments(args, kwargs)
+            cache_key = _key(arguments)
+            if cache_key is None:
+                return await func(*args, **kwargs)
+
+            entry_tags = (lambda result: tags(result, **arguments)) if tags else ()
+            loader = lambda: func(*args, **kwargs)
+
+            if not force_refresh:
+                entry = await YouTubeCache._get_quietly(cache_key)
+                if YouTubeCache._is_negative(entry):
+                    if entry["error"] is not None:
+                        raise CachedFailureError(entry["error"])
+                    return None
+                if soft_ttl and YouTubeCache._is_envelope(entry):
+                    return await YouTubeCache._serve_envelope(cache_key, entry, loader, soft_ttl, ttl, entry_tags)
+                if not soft_ttl and entry is not None:
+                    return entry
+
+            try:
+                if soft_ttl:
+                    result = await YouTubeCache._load(cache_key, loader, soft_ttl, ttl, entry_tags)
+                else:
+                    result = await loader()
+                    if result is not None:
+                        await YouTubeCache._set_quietly(
+                            cache_key, result, expire=ttl, tags=entry_tags(result) if tags else ()
+                        )
+            except negative_exceptions as e:
+                if negative_ttl and not force_refresh:
+                    await YouTubeCache._set_quietly(
+                        cache_key,
+                        {_NEGATIVE_MARKER: 1, "error": str(e) or type(e).__name__},
+                        expire=negative_ttl,
+                        tags=entry_tags(None) if tags else ()
+                    )
+                raise
+
+            # As entradas negativas levam as mesmas tags, para serem invalidadas junto
+            if result is None and negative_ttl and not force_refresh:
+                await YouTubeCache._set_quietly(
+                    cache_key,
+                    {_NEGATIVE_MARKER: 1, "error": None},
+                    expire=negative_ttl,
+                    tags=entry_tags(None) if tags else ()
+                )
+            return result
+
+        wrapper.cache_key = cache_key
+        wrapper.ttl = ttl
+        wrapper.soft_ttl = soft_ttl
+        return wrapper
+
+    return decorator
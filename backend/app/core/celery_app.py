@@ -1,14 +1,18 @@
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_init, worker_process_shutdown
+
+from app.core.executor import extraction_executor
+from app.core.redis_pool import celery_redis_options
+from app.db import session as db_session
 
 celery_app = Celery(
     "worker",
-    broker="redis://localhost:6379/0",
-    backend="redis://localhost:6379/0",
-    include=["app.worker.monitoring"]
+    include=["app.worker.monitoring", "app.worker.cache"]
 )
 
 celery_app.conf.update(
+    **celery_redis_options(),
     task_serializer="json",
     accept_content=["json"],
     result_serializer="json",
@@ -22,4 +26,24 @@ celery_app.conf.beat_schedule = {
         "task": "check_monitoring_videos",
         "schedule": crontab(minute="*/5"),  # A cada 5 minutos
     },
-} 
\ No newline at end of file
+    "warm-monitoring-cache": {
+        "task": "warm_monitoring_cache",
+        "schedule": crontab(minute="*/5"),  # A cada 5 minutos
+    },
+    "sweep-cache-tags": {
+        "task": "sweep_cache_tags",
+        "schedule": crontab(minute=17),  # A cada hora
+    },
+}
+
+
+@worker_process_init.connect
+def configure_worker_db_pool(**kwargs):
+    # Cada processo filho abre o próprio pool, menor que o da API, sem herdar as conexões do pai
+    db_session.configure_engine("worker")
+
+
+@worker_process_shutdown.connect
+def log_worker_db_pool(**kwargs):
+    db_session.log_pool_summary()
+    extraction_executor.log_summary() 
\ No newline at end of file
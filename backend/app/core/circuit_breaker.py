@@ -0,0 +1,100 @@
+import time
+from typing import Any, Dict, Optional
+
+from redis.exceptions import RedisError
+
+from app.core.cache import redis
+from app.core.config import settings
+
+
+class CircuitBreaker:
+    """
+    Disjuntor por chave (por exemplo, o ID de um canal do YouTube), com o
+    estado no Redis para ser compartilhado por todos os workers.
+
+    Depois de `failure_threshold` falhas seguidas o circuito abre e as
+    chamadas são recusadas durante uma janela de espera. Ao fim da janela,
+    uma única chamada de teste é liberada: se ela falhar, o circuito reabre
+    com o dobro da espera, até `max_cooldown`; se der certo, o estado é
+    zerado. Se o Redis estiver indisponível, o disjuntor deixa as chamadas
+    passarem.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        base_cooldown: float,
+        max_cooldown: float,
+        prefix: str = "youtube:circuit"
+    ):
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self.prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    async def state(self, key: str) -> Dict[str, Any]:
+        """
+        Retorna {"failures", "trips", "open_until"}, em que open_until é um
+        timestamp Unix ou None se o circuito nunca abriu.
+        """
+        try:
+            data = await redis.hgetall(self._key(key))
+        except RedisError:
+            data = {}
+        open_until: Optional[float] = float(data["open_until"]) if data.get("open_until") else None
+        return {
+            "failures": int(data.get("failures") or 0),
+            "trips": int(data.get("trips") or 0),
+            "open_until": open_until,
+        }
+
+    async def allow(self, key: str) -> bool:
+        """Indica se uma chamada pode ser feita agora para a chave."""
+        open_until = (await self.state(key))["open_until"]
+        if open_until is None:
+            return True
+        if time.time() < open_until:
+            return False
+        # Janela encerrada: libera uma única chamada de teste por vez
+        try:
+            return bool(await redis.set(
+                f"{self._key(key)}:probe", "1", nx=True, ex=max(1, int(self.base_cooldown))
+            ))
+        except RedisError:
+            return True
+
+    async def record_success(self, key: str) -> None:
+        """Fecha o circuito e zera o histórico de falhas."""
+        try:
+            await redis.delete(self._key(key), f"{self._key(key)}:probe")
+        except RedisError:
+            pass
+
+    async def record_failure(self, key: str) -> Dict[str, Any]:
+        """
+        Registra uma falha e abre o circuito se o limite foi atingido.
+        Retorna o estado atualizado.
+        """
+        redis_key = self._key(key)
+        try:
+            failures = await redis.hincrby(redis_key, "failures", 1)
+            if failures >= self.failure_threshold:
+                trips = await redis.hincrby(redis_key, "trips", 1)
+                cooldown = min(self.max_cooldown, self.base_cooldown * (2 ** (trips - 1)))
+                await redis.hset(redis_key, "open_until", str(time.time() + cooldown))
+                await redis.delete(f"{redis_key}:probe")
+            # O histórico expira depois de um longo período sem falhas
+            await redis.expire(redis_key, int(self.max_cooldown * 2))
+        except RedisError:
+            pass
+        return await self.state(key)
+
+
+channel_circuit_breaker = CircuitBreaker(
+    failure_threshold=settings.CHANNEL_CIRCUIT_FAILURE_THRESHOLD,
+    base_cooldown=settings.CHANNEL_CIRCUIT_BASE_COOLDOWN,
+    max_cooldown=settings.CHANNEL_CIRCUIT_MAX_COOLDOWN
+)
\ No newline at end of file
@@ -0,0 +1,171 @@
+import json
+import zlib
+from datetime import date, datetime, time, timedelta
+from enum import Enum
+from typing import Any, Optional
+
+import msgpack
+
+from app.core.config import settings
+
+# Cabeçalho dos valores gravados no cache: assinatura, versão e flags.
+# Entradas com outra versão (ou sem cabeçalho, como as antigas em JSON puro)
+# são tratadas como ausentes e recarregadas.
+_MAGIC = b"HV"
+_FLAG_COMPRESSED = 0x01
+
+# Tipos estendidos do msgpack
+_EXT_DATETIME = 1
+_EXT_DATE = 2
+_EXT_TIME = 3
+_EXT_TIMEDELTA = 4
+
+
+class CodecError(ValueError):
+    """Valor do cache ilegível: versão, formato ou compressão desconhecidos."""
+
+
+class BaseCodec:
+    """
+    Converte os valores do cache em bytes e de volta.
+
+    Datetimes, datas e horários voltam com o mesmo tipo; enums são gravados
+    pelo seu valor. Payloads maiores que `compress_threshold` bytes são
+    comprimidos com zlib (0 desativa).
+    """
+
+    name = ""
+    version = 0
+
+    def __init__(self, compress_threshold: int = 0, compress_level: int = 6):
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+
+    def _dumps(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    def _loads(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+    def encode(self, value: Any) -> bytes:
+        body = self._dumps(value)
+        flags = 0
+        if self.compress_threshold and len(body) > self.compress_threshold:
+            body = zlib.compress(body, self.compress_level)
+            flags |= _FLAG_COMPRESSED
+        return _MAGIC + bytes((self.version, flags)) + body
+
+    def decode(self, data: bytes) -> Any:
+        if len(data) < 4 or data[:2] != _MAGIC or data[2] != self.version:
+            raise CodecError("Versão de payload desconhecida")
+        flags, body = data[3], data[4:]
+        try:
+            if flags & _FLAG_COMPRESSED:
+                body = zlib.decompress(body)
+            return self._loads(body)
+        except CodecError:
+            raise
+        except Exception as e:
+            raise CodecError(f"Payload inválido: {e}")
+
+
+def _encode_ext(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return msgpack.ExtType(_EXT_DATETIME, value.isoformat().encode())
+    if isinstance(value, date):
+        return msgpack.ExtType(_EXT_DATE, value.isoformat().encode())
+    if isinstance(value, time):
+        return msgpack.ExtType(_EXT_TIME, value.isoformat().encode())
+    if isinstance(value, timedelta):
+        return msgpack.ExtType(_EXT_TIMEDELTA, msgpack.packb(value.total_seconds()))
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Tipo não suportado no cache: {type(value).__name__}")
+
+
+def _decode_ext(code: int, data: bytes) -> Any:
+    if code == _EXT_DATETIME:
+        return datetime.fromisoformat(data.decode())
+    if code == _EXT_DATE:
+        return date.fromisoformat(data.decode())
+    if code == _EXT_TIME:
+        return time.fromisoformat(data.decode())
+    if code == _EXT_TIMEDELTA:
+        return timedelta(seconds=msgpack.unpackb(data))
+    raise CodecError(f"Tipo estendido desconhecido: {code}")
+
+
+class MsgpackCodec(BaseCodec):
+    """Formato binário compacto; é o padrão."""
+
+    name = "msgpack"
+    version = 1
+
+    def _dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, default=_encode_ext, use_bin_type=True, datetime=False)
+
+    def _loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, ext_hook=_decode_ext, raw=False, strict_map_key=False)
+
+
+_JSON_TYPE_KEY = "__type__"
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {_JSON_TYPE_KEY: "datetime", "v": value.isoformat()}
+    if isinstance(value, date):
+        return {_JSON_TYPE_KEY: "date", "v": value.isoformat()}
+    if isinstance(value, time):
+        return {_JSON_TYPE_KEY: "time", "v": value.isoformat()}
+    if isinstance(value, timedelta):
+        return {_JSON_TYPE_KEY: "timedelta", "v": value.total_seconds()}
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Tipo não suportado no cache: {type(value).__name__}")
+
+
+_JSON_TYPES = {
+    "datetime": datetime.fromisoformat,
+    "date": date.fromisoformat,
+    "time": time.fromisoformat,
+    "timedelta": lambda v: timedelta(seconds=v),
+}
+
+
+def _json_object_hook(obj: dict) -> Any:
+    parse = _JSON_TYPES.get(obj.get(_JSON_TYPE_KEY)) if len(obj) == 2 else None
+    return parse(obj["v"]) if parse else obj
+
+
+class JsonCodec(BaseCodec):
+    """JSON legível, útil para inspecionar o Redis durante depuração."""
+
+    name = "json"
+    version = 2
+
+    def _dumps(self, value: Any) -> bytes:
+        return json.dumps(value, default=_json_default, separators=(",", ":")).encode()
+
+    def _loads(self, data: bytes) -> Any:
+        return json.loads(data, object_hook=_json_object_hook)
+
+
+_CODECS = {codec.name: codec for codec in (MsgpackCodec, JsonCodec)}
+
+_codec: Optional[BaseCodec] = None
+
+
+def get_codec() -> BaseCodec:
+    """Retorna o codec configurado em CACHE_CODEC: "msgpack" (padrão) ou "json"."""
+    global _codec
+    if _codec is None:
+        codec_class = _CODECS.get(settings.CACHE_CODEC)
+        if codec_class is None:
+            raise ValueError(f"CACHE_CODEC inválido: {settings.CACHE_CODEC}")
+        _codec = codec_class(compress_threshold=settings.CACHE_COMPRESSION_THRESHOLD)
+    return _codec
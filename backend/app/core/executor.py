@@ -0,0 +1,244 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionTimeoutError(Exception):
+    """A extração excedeu o tempo limite configurado."""
+
+
+class ExtractionExecutor:
+    """
+    Pool de threads dedicado às chamadas bloqueantes do yt-dlp.
+
+    As extrações rodam fora do event loop, limitadas a `max_workers` threads,
+    e cada chamada tem seu próprio tempo limite. A thread de uma extração que
+    estourou o tempo não pode ser interrompida: ela continua ocupando o pool
+    até o yt-dlp retornar, mas o chamador é liberado imediatamente.
+    """
+
+    def __init__(self, max_workers: int, timeout: float):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._total_run = 0.0
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        # Criado sob demanda para não abrir threads em processos que nunca extraem
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="youtube-extract"
+                    )
+        return self._pool
+
+    def _submit(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Enfileira `func` no pool, contabilizando espera e execução."""
+        submitted_at = time.monotonic()
+
+        def _task() -> Any:
+            started_at = time.monotonic()
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._total_wait += started_at - submitted_at
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._total_run += time.monotonic() - started_at
+
+        with self._lock:
+            self._queued += 1
+        return self._get_pool().submit(_task)
+
+    async def run(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any
+    ) -> Any:
+        """
+        Executa `func` no pool e aguarda o resultado sem bloquear o event loop.
+        Levanta ExtractionTimeoutError se o tempo limite for excedido.
+        """
+        future = self._submit(func, *args, **kwargs)
+
+        try:
+            result = await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                timeout=timeout or self.timeout
+            )
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._timeouts += 1
+                # Cancelada antes de começar: nunca saiu da fila
+                if future.cancelled():
+                    self._queued -= 1
+            raise ExtractionTimeoutError(
+                f"Extração excedeu o tempo limite de {timeout or self.timeout}s"
+            )
+        except Exception:
+            with self._lock:
+                self._failed += 1
+            raise
+
+        with self._lock:
+            self._completed += 1
+        return result
+
+    async def iterate(
+        self,
+        func: Callable[..., Iterator[Any]],
+        *args: Any,
+        timeout: Optional[float] = None,
+        buffer: int = 1,
+        **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        """
+        Percorre no pool o iterador retornado por `func`, entregando os itens
+        conforme são produzidos. A thread adianta no máximo `buffer` itens, e
+        o tempo limite vale para a espera de cada item, não para a iteração
+        inteira. Se o consumidor parar antes do fim, o iterador é fechado na
+        thread sem ser lido até o final.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        slots = threading.Semaphore(buffer)
+        stop = threading.Event()
+
+        def _send(kind: str, value: Any = None) -> None:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, (kind, value))
+            except RuntimeError:
+                # O event loop já foi encerrado: não há mais quem receba
+                stop.set()
+
+        def _produce() -> None:
+            iterator = None
+            try:
+                iterator = func(*args, **kwargs)
+                for item in iterator:
+                    while not slots.acquire(timeout=0.1):
+                        if stop.is_set():
+                            return
+                    if stop.is_set():
+                        return
+                    _send("item", item)
+                _send("end")
+            except Exception as e:
+                _send("error", e)
+            finally:
+                close = getattr(iterator, "close", None)
+                if close is not None:
+                    close()
+
+        future = self._submit(_produce)
+        try:
+            while True:
+                try:
+                    kind, value = await asyncio.wait_for(queue.get(), timeout=timeout or self.timeout)
+                except asyncio.TimeoutError:
+                    with self._lock:
+                        self._timeouts += 1
+                    raise ExtractionTimeoutError(
+                        f"Extração excedeu o tempo limite de {timeout or self.timeout}s"
+                    )
+                if kind == "end":
+                    break
+                if kind == "error":
+                    with self._lock:
+                        self._failed += 1
+                    raise value
+                slots.release()
+                yield value
+            with self._lock:
+                self._completed += 1
+        finally:
+            stop.set()
+            # Cancelada antes de começar: nunca saiu da fila
+            if future.cancel():
+                with self._lock:
+                    self._queued -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna métricas de uso e profundidade de fila do pool."""
+        with self._lock:
+            finished = self._completed + self._failed
+            return {
+                "max_workers": self.max_workers,
+                "active": self._active,
+                "queued": self._queued,
+                "completed": self._completed,
+                "failed": self._failed,
+                "timeouts": self._timeouts,
+                "avg_wait_seconds": self._total_wait / finished if finished else 0.0,
+                "avg_run_seconds": self._total_run / finished if finished else 0.0,
+            }
+
+    def render_prometheus(self) -> str:
+        """Exporta as métricas do pool no formato texto do Prometheus."""
+        stats = self.stats()
+        metrics = (
+            ("max_workers", "gauge"),
+            ("active", "gauge"),
+            ("queued", "gauge"),
+            ("completed", "counter"),
+            ("failed", "counter"),
+            ("timeouts", "counter"),
+            ("avg_wait_seconds", "gauge"),
+            ("avg_run_seconds", "gauge"),
+        )
+        lines: List[str] = []
+        for metric, metric_type in metrics:
+            name = f"youtube_extraction_{metric}" + ("_total" if metric_type == "counter" else "")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.append(f"{name} {stats[metric]}")
+        return "\n".join(lines) + "\n"
+
+    def log_summary(self) -> None:
+        """Registra a ocupação do pool, com alerta quando há fila ou timeouts."""
+        stats = self.stats()
+        logger.log(
+            logging.WARNING if stats["queued"] or stats["timeouts"] else logging.INFO,
+            "extraction pool: active=%d/%d queued=%d completed=%d failed=%d timeouts=%d wait=%.3fs run=%.3fs",
+            stats["active"],
+            stats["max_workers"],
+            stats["queued"],
+            stats["completed"],
+            stats["failed"],
+            stats["timeouts"],
+            stats["avg_wait_seconds"],
+            stats["avg_run_seconds"],
+        )
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Encerra o pool; um novo é criado na próxima extração."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+extraction_executor = ExtractionExecutor(
+    max_workers=settings.YOUTUBE_EXTRACTION_WORKERS,
+    timeout=settings.YOUTUBE_EXTRACTION_TIMEOUT
+)
\ No newline at end of file
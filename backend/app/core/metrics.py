@@ -0,0 +1,149 @@
+import bisect
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Limites dos buckets de latência do Redis, em segundos
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class Histogram:
+    """Histograma cumulativo no formato do Prometheus."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimativa pelo limite superior do bucket; inf se cair no último."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+        }
+
+
+def key_family(key: str) -> str:
+    """
+    Agrupa as chaves do cache por tipo de dado, ex.:
+    youtube:channel:<id>:playlists -> "playlists".
+    """
+    parts = key.split(":")
+    if len(parts) < 3 or parts[0] != "youtube":
+        return "other"
+    key_type, subresource = parts[1], parts[3] if len(parts) > 3 else ""
+    if key_type == "channel":
+        if subresource == "playlists":
+            return "playlists"
+        if subresource in ("recent_videos", "recent_entries"):
+            return "recent_videos"
+        return "channel"
+    if key_type == "playlist":
+        return "playlist_videos"
+    return key_type
+
+
+# Contadores mantidos por família de chaves
+_COUNTERS = ("hits", "misses", "stale_hits", "negative_hits", "bytes_read", "bytes_written")
+
+
+class CacheMetrics:
+    """
+    Contadores por família de chaves e histogramas de latência por comando
+    do Redis, acumulados desde o início do processo.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(_COUNTERS, 0))
+        self._latency: Dict[str, Histogram] = defaultdict(Histogram)
+
+    def incr(self, key: str, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[key_family(key)][counter] += amount
+
+    def observe_latency(self, command: str, seconds: float) -> None:
+        with self._lock:
+            self._latency[command].observe(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            families = {}
+            for family, counters in self._counters.items():
+                # Uma entrada negativa também poupa a carga: conta como acerto
+                found = counters["hits"] + counters["negative_hits"]
+                lookups = found + counters["misses"]
+                families[family] = {
+                    **counters,
+                    "hit_ratio": found / lookups if lookups else 0.0,
+                }
+            latency = {command: histogram.snapshot() for command, histogram in self._latency.items()}
+        return {"families": families, "redis_latency": latency}
+
+    def render_prometheus(self) -> str:
+        """Exporta as métricas no formato texto do Prometheus."""
+        lines: List[str] = []
+        with self._lock:
+            for counter in _COUNTERS:
+                name = f"youtube_cache_{counter}_total"
+                lines.append(f"# TYPE {name} counter")
+                for family, counters in sorted(self._counters.items()):
+                    lines.append(f'{name}{{family="{family}"}} {counters[counter]}')
+
+            name = "youtube_cache_redis_latency_seconds"
+            lines.append(f"# TYPE {name} histogram")
+            for command, histogram in sorted(self._latency.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{name}_bucket{{command="{command}",le="{le}"}} {cumulative}')
+                lines.append(f'{name}_sum{{command="{command}"}} {histogram.sum}')
+                lines.append(f'{name}_count{{command="{command}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    def log_summary(self) -> None:
+        """Registra no log uma linha por família e por comando do Redis."""
+        snapshot = self.snapshot()
+        for family, counters in sorted(snapshot["families"].items()):
+            logger.info(
+                "cache %s: hits=%d misses=%d stale=%d negative=%d hit_ratio=%.2f read=%dB written=%dB",
+                family,
+                counters["hits"],
+                counters["misses"],
+                counters["stale_hits"],
+                counters["negative_hits"],
+                counters["hit_ratio"],
+                counters["bytes_read"],
+                counters["bytes_written"],
+            )
+        for command, latency in sorted(snapshot["redis_latency"].items()):
+            logger.info(
+                "redis %s: count=%d p50<=%.4fs p99<=%.4fs",
+                command, latency["count"], latency["p50"], latency["p99"]
+            )
+
+
+cache_metrics = CacheMetrics()
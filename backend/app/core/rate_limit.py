@@ -0,0 +1,172 @@
+import asyncio
+import random
+import time
+from typing import Dict, Optional
+
+from redis.exceptions import RedisError
+
+from app.core.cache import redis
+from app.core.config import settings
+
+# Balde de tokens atômico. Usa o relógio do Redis para que API e workers,
+# em máquinas diferentes, enxerguem o mesmo estado. Retorna
+# {permitido, espera em segundos, tokens restantes}.
+_TOKEN_BUCKET_SCRIPT = """
+local bucket_key = KEYS[1]
+local backoff_key = KEYS[2]
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+
+local t = redis.call("TIME")
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local data = redis.call("HMGET", bucket_key, "tokens", "ts")
+local tokens = tonumber(data[1]) or capacity
+local ts = tonumber(data[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local backoff = redis.call("PTTL", backoff_key)
+if backoff > 0 then
+    return {0, tostring(backoff / 1000), tostring(tokens)}
+end
+
+local allowed = 0
+local wait = 0
+if requested <= 0 then
+    allowed = 1
+elseif tokens >= requested then
+    tokens = tokens - requested
+    allowed = 1
+else
+    wait = (requested - tokens) / rate
+end
+
+if requested > 0 then
+    redis.call("HSET", bucket_key, "tokens", tostring(tokens), "ts", tostring(now))
+    redis.call("EXPIRE", bucket_key, math.ceil(capacity / rate) + 60)
+end
+return {allowed, tostring(wait), tostring(tokens)}
+"""
+
+# Trechos de mensagens do yt-dlp que indicam bloqueio por excesso de tráfego
+THROTTLING_MARKERS = (
+    "429",
+    "too many requests",
+    "captcha",
+    "confirm you're not a bot",
+    "confirm you’re not a bot",
+)
+
+
+class RateLimitExceeded(Exception):
+    """Não houve orçamento disponível dentro do tempo de espera."""
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """Indica se o erro do yt-dlp corresponde a um bloqueio do YouTube."""
+    message = str(error).lower()
+    return any(marker in message for marker in THROTTLING_MARKERS)
+
+
+class YouTubeRateLimiter:
+    """
+    Limitador de tráfego de saída para o YouTube, compartilhado por todos os
+    processos (API e workers do Celery) através do Redis.
+
+    Cada classe de endpoint ("channel", "playlist", "video") tem seu próprio
+    balde de tokens. Quando o YouTube responde com 429 ou captcha, todas as
+    classes entram em espera com backoff exponencial e jitter. Se o Redis
+    estiver indisponível, o limitador deixa as chamadas passarem.
+    """
+
+    def __init__(
+        self,
+        limits: Dict[str, int],
+        burst: int,
+        backoff_base: float,
+        backoff_max: float,
+        prefix: str = "youtube:ratelimit"
+    ):
+        self.limits = limits
+        self.burst = burst
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.prefix = prefix
+        self._backoff_key = f"{prefix}:backoff"
+        self._backoff_level_key = f"{prefix}:backoff:level"
+
+    def _bucket(self, endpoint_class: str):
+        per_minute = self.limits.get(endpoint_class) or self.limits.get("default", 60)
+        return f"{self.prefix}:{endpoint_class}", per_minute / 60.0, float(self.burst)
+
+    async def _take(self, endpoint_class: str, tokens: float):
+        bucket_key, rate, capacity = self._bucket(endpoint_class)
+        allowed, wait, remaining = await redis.eval(
+            _TOKEN_BUCKET_SCRIPT, 2, bucket_key, self._backoff_key, rate, capacity, tokens
+        )
+        return bool(int(allowed)), float(wait), float(remaining)
+
+    async def acquire(self, endpoint_class: str, timeout: Optional[float] = None) -> None:
+        """
+        Aguarda até haver um token disponível para a classe de endpoint.
+        Levanta RateLimitExceeded se a espera passar de `timeout` segundos.
+        """
+        deadline = time.monotonic() + (timeout if timeout is not None else settings.YOUTUBE_RATE_LIMIT_TIMEOUT)
+        while True:
+            try:
+                allowed, wait, _ = await self._take(endpoint_class, 1)
+            except RedisError:
+                return
+            if allowed:
+                return
+            if time.monotonic() + wait > deadline:
+                raise RateLimitExceeded(
+                    f"Limite de requisições ao YouTube atingido para '{endpoint_class}'"
+                )
+            await asyncio.sleep(wait)
+
+    async def remaining(self, endpoint_class: str) -> float:
+        """
+        Retorna quantos tokens restam para a classe de endpoint sem consumi-los.
+        Durante um backoff, retorna 0.
+        """
+        try:
+            allowed, _, remaining = await self._take(endpoint_class, 0)
+        except RedisError:
+            return float(self.burst)
+        return remaining if allowed else 0.0
+
+    async def report_throttled(self) -> float:
+        """
+        Registra um bloqueio do YouTube e inicia o backoff para todas as
+        classes. Cada bloqueio seguido dobra a espera, até `backoff_max`.
+        Retorna a espera aplicada, em segundos.
+        """
+        try:
+            # Falhas simultâneas do mesmo bloqueio contam uma única vez
+            current = await redis.pttl(self._backoff_key)
+            if current > 0:
+                return current / 1000
+            level = await redis.incr(self._backoff_level_key)
+            # O nível volta a zero depois de um período sem bloqueios
+            await redis.expire(self._backoff_level_key, int(self.backoff_max * 4))
+        except RedisError:
+            return 0.0
+
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (level - 1)))
+        # Jitter para que os processos não voltem todos ao mesmo tempo
+        delay = delay * random.uniform(0.5, 1.0)
+        try:
+            await redis.set(self._backoff_key, str(level), px=int(delay * 1000))
+        except RedisError:
+            pass
+        return delay
+
+
+youtube_rate_limiter = YouTubeRateLimiter(
+    limits=settings.YOUTUBE_RATE_LIMITS,
+    burst=settings.YOUTUBE_RATE_LIMIT_BURST,
+    backoff_base=settings.YOUTUBE_BACKOFF_BASE,
+    backoff_max=settings.YOUTUBE_BACKOFF_MAX
+)
\ No newline at end of file
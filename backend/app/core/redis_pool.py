@@ -0,0 +1,178 @@
+import logging
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+
+from redis import asyncio as aioredis
+from redis.exceptions import ConnectionError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Fração do pool em uso a partir da qual o resumo periódico emite um alerta
+_SATURATION_WARNING = 0.8
+
+
+def build_redis_url(db: int) -> str:
+    """URL do Redis configurado em Settings, no banco lógico `db`."""
+    password = f":{quote(settings.REDIS_PASSWORD, safe='')}@" if settings.REDIS_PASSWORD else ""
+    return f"redis://{password}{settings.REDIS_HOST}:{settings.REDIS_PORT}/{db}"
+
+
+class InstrumentedConnectionPool(aioredis.BlockingConnectionPool):
+    """
+    Pool que espera por uma conexão livre em vez de abrir conexões sem
+    limite, e mede a própria ocupação: conexões em uso, pico, esperas e
+    retiradas que falharam por esgotamento ou erro de conexão.
+    """
+
+    def __init__(self, name: str, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.name = name
+        self.stats = {
+            "in_use": 0,
+            "peak_in_use": 0,
+            "checkouts": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "checkout_errors": 0,
+        }
+
+    async def get_connection(self, *args: Any, **kwargs: Any):
+        started_at = time.perf_counter()
+        try:
+            connection = await super().get_connection(*args, **kwargs)
+        except ConnectionError:
+            self.stats["checkout_errors"] += 1
+            raise
+        waited = time.perf_counter() - started_at
+        stats = self.stats
+        stats["checkouts"] += 1
+        stats["in_use"] += 1
+        stats["peak_in_use"] = max(stats["peak_in_use"], stats["in_use"])
+        # Abrir uma conexão nova leva menos que isso; acima, houve fila
+        if waited > 0.005:
+            stats["waits"] += 1
+            stats["wait_seconds"] += waited
+        return connection
+
+    async def release(self, connection: Any) -> None:
+        try:
+            await super().release(connection)
+        finally:
+            self.stats["in_use"] = max(0, self.stats["in_use"] - 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "max_connections": self.max_connections,
+            "utilization": self.stats["in_use"] / self.max_connections if self.max_connections else 0.0,
+        }
+
+
+_pools: Dict[str, InstrumentedConnectionPool] = {}
+
+
+def create_redis(
+    name: str,
+    db: int,
+    decode_responses: bool = True,
+    **overrides: Any
+) -> aioredis.Redis:
+    """
+    Cria um cliente assíncrono com pool próprio, configurado pelas opções
+    REDIS_* de Settings. `overrides` substitui opções da conexão, ex.:
+    socket_timeout=None para conexões que ficam bloqueadas esperando pub/sub.
+    """
+    options = {
+        "host": settings.REDIS_HOST,
+        "port": settings.REDIS_PORT,
+        "db": db,
+        "password": settings.REDIS_PASSWORD or None,
+        "encoding": "utf-8",
+        "decode_responses": decode_responses,
+        "socket_timeout": settings.REDIS_SOCKET_TIMEOUT,
+        "socket_connect_timeout": settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+        "socket_keepalive": True,
+        "health_check_interval": settings.REDIS_HEALTH_CHECK_INTERVAL,
+        "retry_on_timeout": settings.REDIS_RETRY_ON_TIMEOUT,
+        "max_connections": settings.REDIS_MAX_CONNECTIONS,
+        "timeout": settings.REDIS_POOL_TIMEOUT,
+        **overrides,
+    }
+    pool = InstrumentedConnectionPool(name=name, **options)
+    _pools[name] = pool
+    return aioredis.Redis(connection_pool=pool)
+
+
+async def disconnect_all() -> None:
+    """Fecha as conexões de todos os pools, ex.: antes de encerrar um event loop."""
+    for pool in _pools.values():
+        await pool.disconnect()
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Ocupação de cada pool deste processo."""
+    return {name: pool.snapshot() for name, pool in _pools.items()}
+
+
+def render_prometheus() -> str:
+    """Exporta a ocupação dos pools no formato texto do Prometheus."""
+    lines: List[str] = []
+    metrics = (
+        ("in_use", "gauge"),
+        ("peak_in_use", "gauge"),
+        ("max_connections", "gauge"),
+        ("checkouts", "counter"),
+        ("waits", "counter"),
+        ("wait_seconds", "counter"),
+        ("checkout_errors", "counter"),
+    )
+    stats = pool_stats()
+    for metric, metric_type in metrics:
+        name = f"redis_pool_{metric}" + ("_total" if metric_type == "counter" else "")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for pool_name, snapshot in sorted(stats.items()):
+            lines.append(f'{name}{{pool="{pool_name}"}} {snapshot[metric]}')
+    return "\n".join(lines) + "\n"
+
+
+def log_pool_summary() -> None:
+    """Registra a ocupação dos pools, com alerta quando estão perto do limite."""
+    for name, snapshot in sorted(pool_stats().items()):
+        saturated = snapshot["peak_in_use"] >= _SATURATION_WARNING * snapshot["max_connections"]
+        logger.log(
+            logging.WARNING if saturated or snapshot["checkout_errors"] else logging.INFO,
+            "redis pool %s: in_use=%d peak=%d/%d waits=%d wait=%.3fs errors=%d",
+            name,
+            snapshot["in_use"],
+            snapshot["peak_in_use"],
+            snapshot["max_connections"],
+            snapshot["waits"],
+            snapshot["wait_seconds"],
+            snapshot["checkout_errors"],
+        )
+
+
+def celery_redis_options() -> Dict[str, Any]:
+    """Configuração do broker e do backend de resultados do Celery."""
+    transport_options = {
+        "socket_timeout": settings.REDIS_SOCKET_TIMEOUT,
+        "socket_connect_timeout": settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+        "socket_keepalive": True,
+        "health_check_interval": settings.REDIS_HEALTH_CHECK_INTERVAL,
+        "retry_on_timeout": settings.REDIS_RETRY_ON_TIMEOUT,
+    }
+    return {
+        "broker_url": build_redis_url(settings.REDIS_BROKER_DB),
+        "result_backend": build_redis_url(settings.REDIS_BROKER_DB),
+        "broker_pool_limit": settings.CELERY_BROKER_POOL_LIMIT,
+        "broker_transport_options": transport_options,
+        "redis_max_connections": settings.REDIS_MAX_CONNECTIONS,
+        "redis_socket_timeout": settings.REDIS_SOCKET_TIMEOUT,
+        "redis_socket_connect_timeout": settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+        "redis_socket_keepalive": True,
+        "redis_retry_on_timeout": settings.REDIS_RETRY_ON_TIMEOUT,
+        "redis_backend_health_check_interval": settings.REDIS_HEALTH_CHECK_INTERVAL,
+    }
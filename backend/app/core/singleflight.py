@@ -0,0 +1,118 @@
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict
+
+from redis.exceptions import RedisError
+
+from app.core.cache import redis
+from app.core.config import settings
+
+# Remove o lock apenas se ele ainda pertencer a quem o criou
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """
+    Coalesce chamadas idênticas e simultâneas em uma única execução.
+
+    Dentro do processo, chamadas com a mesma chave aguardam a mesma task.
+    Entre processos, um lock no Redis elege quem executa; os demais aguardam
+    o resultado publicado no Redis e só executam por conta própria se o
+    líder falhar ou o tempo de espera acabar. Os resultados precisam ser
+    serializáveis em JSON.
+    """
+
+    def __init__(
+        self,
+        lock_ttl: int,
+        result_ttl: int,
+        poll_interval: float = 0.25,
+        prefix: str = "youtube:inflight"
+    ):
+        self.lock_ttl = lock_ttl
+        self.result_ttl = result_ttl
+        self.poll_interval = poll_interval
+        self.prefix = prefix
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def make_key(method: str, url: str, options: Dict[str, Any]) -> str:
+        """Gera uma chave estável para (método, URL, opções)."""
+        raw = json.dumps([method, url, options], sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Executa `func` uma única vez para todas as chamadas simultâneas com a
+        mesma chave e devolve o mesmo resultado a todas elas.
+        """
+        future = self._inflight.get(key)
+        if future is None or future.get_loop() is not asyncio.get_running_loop():
+            future = asyncio.ensure_future(self._do_distributed(key, func))
+            self._inflight[key] = future
+            future.add_done_callback(lambda f: self._forget(key, f))
+        # shield: o cancelamento de um chamador não derruba os demais
+        return await asyncio.shield(future)
+
+    def _forget(self, key: str, future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+
+    async def _do_distributed(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        lock_key = f"{self.prefix}:{key}"
+        result_key = f"{lock_key}:result"
+        token = uuid.uuid4().hex
+
+        try:
+            acquired = await redis.set(lock_key, token, nx=True, ex=self.lock_ttl)
+        except RedisError:
+            # Sem Redis, o coalescimento fica restrito ao processo atual
+            return await func()
+
+        if acquired:
+            try:
+                result = await func()
+                try:
+                    await redis.set(result_key, json.dumps(result), ex=self.result_ttl)
+                except (TypeError, ValueError, RedisError):
+                    pass
+                return result
+            finally:
+                try:
+                    await redis.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                except RedisError:
+                    pass
+
+        # Outro processo já está executando: aguarda o resultado publicado
+        deadline = time.monotonic() + self.lock_ttl
+        try:
+            while time.monotonic() < deadline:
+                data = await redis.get(result_key)
+                if data is not None:
+                    return json.loads(data)
+                if not await redis.exists(lock_key):
+                    # O líder terminou; confere uma última vez antes de desistir
+                    data = await redis.get(result_key)
+                    if data is not None:
+                        return json.loads(data)
+                    break
+                await asyncio.sleep(self.poll_interval)
+        except RedisError:
+            pass
+
+        # O líder falhou ou demorou demais: executa localmente
+        return await func()
+
+
+youtube_singleflight = SingleFlight(
+    lock_ttl=settings.YOUTUBE_SINGLEFLIGHT_LOCK_TTL,
+    result_ttl=settings.YOUTUBE_SINGLEFLIGHT_RESULT_TTL
+)
\ No newline at end of file
@@ -1,7 +1,13 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+import base64
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, Type, TypeVar, Union
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy import and_, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.db.base_class import Base
@@ -11,6 +17,78 @@ CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+class InvalidCursorError(ValueError):
+    """Cursor de paginação malformado ou emitido para outra listagem."""
+
+
+def _scope_hash(scope: str) -> str:
+    return hashlib.sha1(scope.encode()).hexdigest()[:12]
+
+
+def encode_keyset_cursor(scope: str, sort_value: Optional[datetime], id: int) -> str:
+    """
+    Gera o cursor opaco que retoma a listagem `scope` depois da linha
+    (sort_value, id). sort_value pode ser None.
+    """
+    payload = {"s": _scope_hash(scope), "k": [sort_value.isoformat() if sort_value else None, id]}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_keyset_cursor(scope: str, cursor: str) -> Tuple[Optional[datetime], int]:
+    """Retorna a chave guardada no cursor, validando que ele pertence a `scope`."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        sort_value, id = payload["k"]
+        key = (datetime.fromisoformat(sort_value) if sort_value is not None else None, int(id))
+        scope_hash = payload["s"]
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursorError("Cursor de paginação inválido")
+    if scope_hash != _scope_hash(scope):
+        raise InvalidCursorError("Cursor de paginação inválido")
+    return key
+
+
+def paginate_keyset(
+    query: Any,
+    *,
+    sort_column: Any,
+    id_column: Any,
+    scope: str,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    key: Optional[Callable[[Any], Tuple[Optional[datetime], int]]] = None
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Pagina `query` do mais novo ao mais antigo por (sort_column, id_column).
+    Em vez de OFFSET, filtra as linhas depois da chave do cursor, então
+    qualquer página custa o mesmo que a primeira e não se desloca quando
+    entram linhas novas. `key` extrai (sort_value, id) de uma linha; por
+    padrão, os atributos de mesmo nome das colunas. Se sort_column aceitar
+    NULL, essas linhas vêm por último.
+
+    Retorna (linhas, next_cursor); next_cursor é None na última página.
+    """
+    if key is None:
+        key = lambda row: (getattr(row, sort_column.key), getattr(row, id_column.key))
+    # Colunas NOT NULL mantêm a ordenação simples, atendida pelos índices
+    nullable = getattr(getattr(sort_column, "expression", sort_column), "nullable", True)
+    if cursor:
+        sort_value, id = decode_keyset_cursor(scope, cursor)
+        if sort_value is None:
+            query = query.filter(and_(sort_column.is_(None), id_column < id))
+        elif nullable:
+            query = query.filter(or_(tuple_(sort_column, id_column) < tuple_(sort_value, id), sort_column.is_(None)))
+        else:
+            query = query.filter(tuple_(sort_column, id_column) < tuple_(sort_value, id))
+    sort_order = sort_column.desc().nulls_last() if nullable else sort_column.desc()
+    rows = query.order_by(sort_order, id_column.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_keyset_cursor(scope, *key(rows[-1]))
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
         """
@@ -29,6 +107,22 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     ) -> List[ModelType]:
         return db.query(self.model).offset(skip).limit(limit).all()
 
+    def get_page(
+        self, db: Session, *, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """
+        Variante de get_multi paginada por cursor, do registro mais novo ao
+        mais antigo por (created_at, id). Retorna (registros, next_cursor).
+        """
+        return paginate_keyset(
+            db.query(self.model),
+            sort_column=self.model.created_at,
+            id_column=self.model.id,
+            scope=self.model.__tablename__,
+            cursor=cursor,
+            limit=limit
+        )
+
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = jsonable_encoder(obj_in)
         db_obj = self.model(**obj_in_data)
@@ -61,4 +155,49 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj = db.query(self.model).get(id)
         db.delete(obj)
         db.commit()
+        return obj
+
+    # Variantes para AsyncSession (deps.get_async_db)
+
+    async def get_async(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        return await db.get(self.model, id)
+
+    async def get_multi_async(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+    ) -> List[ModelType]:
+        result = await db.scalars(select(self.model).offset(skip).limit(limit))
+        return list(result)
+
+    async def create_async(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        obj_in_data = jsonable_encoder(obj_in)
+        db_obj = self.model(**obj_in_data)
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def update_async(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        obj_data = jsonable_encoder(db_obj)
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.dict(exclude_unset=True)
+        for field in obj_data:
+            if field in update_data:
+                setattr(db_obj, field, update_data[field])
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def delete_async(self, db: AsyncSession, *, id: int) -> ModelType:
+        obj = await db.get(self.model, id)
+        await db.delete(obj)
+        await db.commit()
         return obj 
\ No newline at end of file
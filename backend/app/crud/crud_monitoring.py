@@ -1,10 +1,10 @@
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, List, Optional, Tuple, Union, Any
 from sqlalchemy.orm import Session
 from sqlalchemy import func, case
 from fastapi.encoders import jsonable_encoder
 from datetime import datetime, timedelta
 
-from app.crud.base import CRUDBase
+from app.crud.base import CRUDBase, paginate_keyset
 from app.models.monitoring import (
     YoutubeMonitoring,
     MonitoringVideo,
@@ -20,15 +20,9 @@ class CRUDMonitoring(CRUDBase[YoutubeMonitoring, MonitoringCreate, MonitoringUpd
     def __init__(self):
         super().__init__(model=YoutubeMonitoring)
 
-    def get_multi_with_details(
-        self,
-        db: Session,
-        *,
-        user_id: int,
-        skip: int = 0,
-        limit: int = 100,
-        status: Optional[MonitoringStatus] = None
-    ) -> List[YoutubeMonitoring]:
+    def _details_query(
+        self, db: Session, *, user_id: int, status: Optional[MonitoringStatus] = None
+    ):
         query = (
             db.query(
                 YoutubeMonitoring,
@@ -48,9 +42,9 @@ class CRUDMonitoring(CRUDBase[YoutubeMonitoring, MonitoringCreate, MonitoringUpd
         
         if status:
             query = query.filter(YoutubeMonitoring.status == status)
-        
-        results = query.offset(skip).limit(limit).all()
-        
+        return query
+
+    def _with_details(self, results: List[Any]) -> List[YoutubeMonitoring]:
         # Converte os resultados para objetos YoutubeMonitoring com os campos adicionais
         monitorings = []
         for result in results:
@@ -63,6 +57,42 @@ class CRUDMonitoring(CRUDBase[YoutubeMonitoring, MonitoringCreate, MonitoringUpd
             
         return monitorings
 
+    def get_multi_with_details(
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        status: Optional[MonitoringStatus] = None
+    ) -> List[YoutubeMonitoring]:
+        query = self._details_query(db, user_id=user_id, status=status)
+        return self._with_details(query.offset(skip).limit(limit).all())
+
+    def get_multi_with_details_page(
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        status: Optional[MonitoringStatus] = None
+    ) -> Tuple[List[YoutubeMonitoring], Optional[str]]:
+        """
+        Variante de get_multi_with_details paginada por cursor, do
+        monitoramento mais novo ao mais antigo. Retorna (monitoramentos, next_cursor).
+        """
+        results, next_cursor = paginate_keyset(
+            self._details_query(db, user_id=user_id, status=status),
+            sort_column=YoutubeMonitoring.created_at,
+            id_column=YoutubeMonitoring.id,
+            scope=f"monitorings:user:{user_id}:{status.value if status else ''}",
+            cursor=cursor,
+            limit=limit,
+            key=lambda row: (row[0].created_at, row[0].id)
+        )
+        return self._with_details(results), next_cursor
+
     def get_with_details(self, db: Session, *, id: int) -> Optional[Dict[str, Any]]:
         """
         Retorna um monitoramento com detalhes do canal e estatísticas.
@@ -109,6 +139,53 @@ class CRUDMonitoring(CRUDBase[YoutubeMonitoring, MonitoringCreate, MonitoringUpd
             "playlists": playlists
         }
 
+    def get_version(self, db: Session, *, id: int) -> Optional[Dict[str, Any]]:
+        """
+        Retorna {"channel_id", "version"} de um monitoramento em uma única
+        consulta, sem carregar os vídeos, para gerar o ETag.
+
+        A versão combina as colunas do monitoramento, a contagem de vídeos por
+        status, o maior updated_at/processed_at dos vídeos, as playlists e o
+        nome/avatar/updated_at do canal. Mudanças de error_message ou de
+        status de um vídeo passam pelo ORM e atualizam o updated_at dele;
+        escritas em SQL puro que não o tocam não são detectadas.
+        """
+        monitoring_videos = db.query(MonitoringVideo).filter(
+            MonitoringVideo.monitoring_id == YoutubeMonitoring.id
+        )
+        monitoring_playlists = db.query(MonitoringPlaylist).filter(
+            MonitoringPlaylist.monitoring_id == YoutubeMonitoring.id
+        )
+        row = (
+            db.query(
+                YoutubeMonitoring,
+                YoutubeChannel.channel_name,
+                YoutubeChannel.avatar_image,
+                YoutubeChannel.updated_at,
+                monitoring_videos.with_entities(func.count(MonitoringVideo.id)).scalar_subquery(),
+                *(
+                    monitoring_videos.with_entities(func.count(case(
+                        (MonitoringVideo.status == status, 1),
+                        else_=None
+                    ))).scalar_subquery()
+                    for status in VideoProcessingStatus
+                ),
+                monitoring_videos.with_entities(func.max(MonitoringVideo.updated_at)).scalar_subquery(),
+                monitoring_videos.with_entities(func.max(MonitoringVideo.processed_at)).scalar_subquery(),
+                monitoring_playlists.with_entities(func.count(MonitoringPlaylist.id)).scalar_subquery(),
+                monitoring_playlists.with_entities(func.max(MonitoringPlaylist.id)).scalar_subquery(),
+            )
+            .outerjoin(YoutubeChannel, YoutubeChannel.id == YoutubeMonitoring.channel_id)
+            .filter(YoutubeMonitoring.id == id)
+            .first()
+        )
+        if not row:
+            return None
+
+        monitoring = row[0]
+        columns = [getattr(monitoring, column.key) for column in YoutubeMonitoring.__table__.columns]
+        return {"channel_id": monitoring.channel_id, "version": [*columns, *row[1:]]}
+
     def create_with_videos(
         self,
         db: Session,
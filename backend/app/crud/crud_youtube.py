@@ -1,9 +1,18 @@
-from typing import List, Optional, Dict, Any
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Dict, Any, Sequence, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 
-from app.crud.base import CRUDBase
-from app.models.youtube import YoutubeChannel, YoutubeVideo, YoutubeChannelAccess
+from app.crud.base import CRUDBase, paginate_keyset
+from app.models.youtube import (
+    YoutubeChannel,
+    YoutubeVideo,
+    YoutubeChannelAccess,
+    YoutubeChannelResolution
+)
 from app.schemas.youtube import (
     YoutubeChannelCreate as ChannelCreate,
     YoutubeChannelUpdate as ChannelUpdate,
@@ -42,6 +51,30 @@ class CRUDYoutube(CRUDBase[YoutubeChannel, ChannelCreate, ChannelUpdate]):
             .all()
         )
 
+    def get_channels_by_user_page(
+        self, db: Session, *, user_id: int, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[YoutubeChannel], Optional[str]]:
+        """
+        Variante de get_channels_by_user paginada por cursor, do canal mais
+        novo ao mais antigo. Retorna (canais, next_cursor).
+        """
+        query = (
+            db.query(YoutubeChannel)
+            .join(YoutubeChannelAccess, YoutubeChannel.id == YoutubeChannelAccess.channel_id)
+            .filter(
+                YoutubeChannelAccess.user_id == user_id,
+                YoutubeChannelAccess.can_view == True
+            )
+        )
+        return paginate_keyset(
+            query,
+            sort_column=YoutubeChannel.created_at,
+            id_column=YoutubeChannel.id,
+            scope=f"channels:user:{user_id}",
+            cursor=cursor,
+            limit=limit
+        )
+
     def get_video(self, db: Session, *, id: int) -> Optional[YoutubeVideo]:
         return db.query(YoutubeVideo).filter(YoutubeVideo.id == id).first()
 
@@ -80,6 +113,22 @@ class CRUDYoutube(CRUDBase[YoutubeChannel, ChannelCreate, ChannelUpdate]):
             .all()
         )
 
+    def get_videos_by_channel_page(
+        self, db: Session, *, channel_id: int, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[YoutubeVideo], Optional[str]]:
+        """
+        Variante de get_videos_by_channel paginada por cursor, do vídeo
+        publicado mais recentemente ao mais antigo. Retorna (vídeos, next_cursor).
+        """
+        return paginate_keyset(
+            db.query(YoutubeVideo).filter(YoutubeVideo.channel_id == channel_id),
+            sort_column=YoutubeVideo.published_at,
+            id_column=YoutubeVideo.id,
+            scope=f"videos:channel:{channel_id}",
+            cursor=cursor,
+            limit=limit
+        )
+
     def create_video(
         self, db: Session, *, obj_in: VideoCreate, channel_id: int
     ) -> YoutubeVideo:
@@ -96,6 +145,58 @@ class CRUDYoutube(CRUDBase[YoutubeChannel, ChannelCreate, ChannelUpdate]):
         db.refresh(db_obj)
         return db_obj
 
+    def upsert_videos(
+        self,
+        db: Session,
+        *,
+        channel_id: int,
+        videos: Sequence[Dict[str, Any]],
+        commit: bool = True
+    ) -> List[YoutubeVideo]:
+        """
+        Cria ou atualiza um lote de vídeos do canal em uma única instrução
+        INSERT … ON CONFLICT (channel_id, video_id). Cada item traz video_id,
+        title, thumbnail_url, published_at e is_live. Retorna os vídeos na
+        ordem recebida, já com o id; repetições do mesmo video_id valem pela
+        última ocorrência.
+        """
+        rows = {}
+        for video in videos:
+            rows[video["video_id"]] = {
+                "channel_id": channel_id,
+                "video_id": video["video_id"],
+                "title": video["title"],
+                "thumbnail_url": video.get("thumbnail_url"),
+                "published_at": video["published_at"],
+                "is_live": video.get("is_live") or False,
+            }
+        if not rows:
+            return []
+
+        # SQLite aceita a mesma sintaxe; é usado pelos scripts de benchmark
+        dialect = sqlite if db.get_bind().dialect.name == "sqlite" else postgresql
+        statement = dialect.insert(YoutubeVideo).values(list(rows.values()))
+        statement = statement.on_conflict_do_update(
+            index_elements=["channel_id", "video_id"],
+            set_={
+                "title": statement.excluded.title,
+                "thumbnail_url": statement.excluded.thumbnail_url,
+                "published_at": statement.excluded.published_at,
+                "is_live": statement.excluded.is_live,
+                # O onupdate da coluna não vale para o ON CONFLICT
+                "updated_at": func.now(),
+            },
+        ).returning(YoutubeVideo)
+        db_videos = {
+            db_video.video_id: db_video
+            for db_video in db.scalars(
+                statement, execution_options={"populate_existing": True}
+            )
+        }
+        if commit:
+            db.commit()
+        return [db_videos[video_id] for video_id in rows]
+
     def update_video(
         self, db: Session, *, db_obj: YoutubeVideo, obj_in: VideoUpdate
     ) -> YoutubeVideo:
@@ -113,6 +214,19 @@ class CRUDYoutube(CRUDBase[YoutubeChannel, ChannelCreate, ChannelUpdate]):
         ).first()
         return access is not None
 
+    async def user_can_access_channel_async(self, db: AsyncSession, channel_id: int, user_id: int) -> bool:
+        """
+        Variante de user_can_access_channel para AsyncSession.
+        """
+        access_id = await db.scalar(
+            select(YoutubeChannelAccess.id).filter(
+                YoutubeChannelAccess.channel_id == channel_id,
+                YoutubeChannelAccess.user_id == user_id,
+                YoutubeChannelAccess.can_view == True
+            ).limit(1)
+        )
+        return access_id is not None
+
     def create_access(
         self,
         db: Session,
@@ -135,5 +249,48 @@ class CRUDYoutube(CRUDBase[YoutubeChannel, ChannelCreate, ChannelUpdate]):
         db.refresh(db_obj)
         return db_obj
 
+    def get_channel_resolution(
+        self, db: Session, *, url_key: str
+    ) -> Optional[YoutubeChannelResolution]:
+        """
+        Obtém uma resolução de URL de canal ainda válida.
+        """
+        return (
+            db.query(YoutubeChannelResolution)
+            .filter(
+                YoutubeChannelResolution.url_key == url_key,
+                YoutubeChannelResolution.expires_at > func.now()
+            )
+            .first()
+        )
+
+    def save_channel_resolution(
+        self, db: Session, *, url_key: str, youtube_id: Optional[str], ttl: int
+    ) -> None:
+        """
+        Registra (ou renova) a resolução de uma URL de canal.
+        """
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl)
+        db_obj = (
+            db.query(YoutubeChannelResolution)
+            .filter(YoutubeChannelResolution.url_key == url_key)
+            .first()
+        )
+        if db_obj:
+            db_obj.youtube_id = youtube_id
+            db_obj.expires_at = expires_at
+        else:
+            db_obj = YoutubeChannelResolution(
+                url_key=url_key,
+                youtube_id=youtube_id,
+                expires_at=expires_at
+            )
+            db.add(db_obj)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Outro processo registrou a mesma URL ao mesmo tempo
+            db.rollback()
+
 
 crud_youtube = CRUDYoutube() 
\ No newline at end of file
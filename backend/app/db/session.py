@@ -1,7 +1,201 @@
-from sqlalchemy import create_engine
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import settings
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine) 
\ No newline at end of file
+logger = logging.getLogger(__name__)
+
+# Fração do pool em uso a partir da qual o resumo periódico emite um alerta
+_SATURATION_WARNING = 0.8
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool que mede a própria ocupação: conexões retiradas, pico,
+    esperas por uma conexão livre e retiradas que esgotaram DB_POOL_TIMEOUT.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.stats = {
+            "peak_checked_out": 0,
+            "checkouts": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "checkout_timeouts": 0,
+        }
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats["checkout_timeouts"] += 1
+            raise
+        waited = time.perf_counter() - started_at
+        stats = self.stats
+        stats["checkouts"] += 1
+        stats["peak_checked_out"] = max(stats["peak_checked_out"], self.checkedout())
+        # Abrir uma conexão nova leva menos que isso; acima, houve fila
+        if waited > 0.05:
+            stats["waits"] += 1
+            stats["wait_seconds"] += waited
+        return connection
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.profile = self.profile
+        return pool
+
+    def snapshot(self) -> Dict[str, Any]:
+        capacity = self.size() + max(self._max_overflow, 0)
+        return {
+            **self.stats,
+            "profile": self.profile,
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "utilization": self.checkedout() / capacity if capacity else 0.0,
+        }
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """InstrumentedQueuePool para o engine assíncrono."""
+
+
+def _pool_options(profile: str) -> Dict[str, Any]:
+    options = settings.DB_POOL_PROFILES[profile]
+    return {
+        "pool_size": options["pool_size"],
+        "max_overflow": options["max_overflow"],
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_use_lifo": True,
+    }
+
+
+def create_db_engine(profile: str) -> Engine:
+    """
+    Cria o engine com o perfil de pool `profile` de DB_POOL_PROFILES
+    ("api" ou "worker"). Todas as conexões passam por pre-ping e são
+    recicladas após DB_POOL_RECYCLE segundos.
+    """
+    engine = create_engine(
+        str(settings.SQLALCHEMY_DATABASE_URI),
+        poolclass=InstrumentedQueuePool,
+        **_pool_options(profile)
+    )
+    engine.pool.profile = profile
+    return engine
+
+
+def async_database_uri() -> str:
+    """SQLALCHEMY_ASYNC_DATABASE_URI ou, se vazio, SQLALCHEMY_DATABASE_URI com o driver asyncpg."""
+    if settings.SQLALCHEMY_ASYNC_DATABASE_URI:
+        return settings.SQLALCHEMY_ASYNC_DATABASE_URI
+    url = make_url(str(settings.SQLALCHEMY_DATABASE_URI))
+    return url.set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+def create_async_db_engine(profile: str) -> AsyncEngine:
+    """Engine assíncrono (asyncpg) com o mesmo perfil de pool de create_db_engine."""
+    engine = create_async_engine(
+        async_database_uri(),
+        poolclass=InstrumentedAsyncQueuePool,
+        **_pool_options(profile)
+    )
+    engine.pool.profile = f"{profile}_async"
+    return engine
+
+
+engine = create_db_engine(settings.DB_POOL_PROFILE)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# O engine assíncrono é criado no primeiro uso: os workers do Celery, que
+# rodam cada task em um event loop novo, continuam apenas com o síncrono
+_async_engine: Optional[AsyncEngine] = None
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+
+def get_async_engine() -> AsyncEngine:
+    """Retorna o engine assíncrono deste processo, criando-o se preciso."""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_db_engine(settings.DB_POOL_PROFILE)
+        AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    """Fecha as conexões do engine assíncrono, ex.: ao encerrar a API."""
+    if _async_engine is not None:
+        await _async_engine.dispose()
+
+
+def configure_engine(profile: str) -> Engine:
+    """
+    Troca o engine de SessionLocal por um novo com o perfil `profile`, ex.:
+    em cada processo filho do Celery, que não deve herdar as conexões do pai.
+    """
+    global engine
+    engine.dispose(close=False)
+    engine = create_db_engine(profile)
+    SessionLocal.configure(bind=engine)
+    return engine
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Ocupação dos pools deste processo, por perfil."""
+    engines = [engine] + ([_async_engine.sync_engine] if _async_engine is not None else [])
+    return {db_engine.pool.profile: db_engine.pool.snapshot() for db_engine in engines}
+
+
+def render_prometheus() -> str:
+    """Exporta a ocupação do pool no formato texto do Prometheus."""
+    lines: List[str] = []
+    metrics = (
+        ("checked_out", "gauge"),
+        ("overflow", "gauge"),
+        ("peak_checked_out", "gauge"),
+        ("pool_size", "gauge"),
+        ("max_overflow", "gauge"),
+        ("checkouts", "counter"),
+        ("waits", "counter"),
+        ("wait_seconds", "counter"),
+        ("checkout_timeouts", "counter"),
+    )
+    stats = pool_stats()
+    for metric, metric_type in metrics:
+        name = f"db_pool_{metric}" + ("_total" if metric_type == "counter" else "")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for profile, snapshot in sorted(stats.items()):
+            lines.append(f'{name}{{profile="{profile}"}} {snapshot[metric]}')
+    return "\n".join(lines) + "\n"
+
+
+def log_pool_summary() -> None:
+    """Registra a ocupação dos pools, com alerta quando estão perto do limite."""
+    for profile, snapshot in sorted(pool_stats().items()):
+        capacity = snapshot["pool_size"] + snapshot["max_overflow"]
+        saturated = snapshot["peak_checked_out"] >= _SATURATION_WARNING * capacity
+        logger.log(
+            logging.WARNING if saturated or snapshot["checkout_timeouts"] else logging.INFO,
+            "db pool %s: checked_out=%d overflow=%d peak=%d/%d waits=%d wait=%.3fs timeouts=%d",
+            profile,
+            snapshot["checked_out"],
+            snapshot["overflow"],
+            snapshot["peak_checked_out"],
+            capacity,
+            snapshot["waits"],
+            snapshot["wait_seconds"],
+            snapshot["checkout_timeouts"],
+        )
\ No newline at end of file
@@ -1,8 +1,15 @@
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.api import api_router
+from app.core.cache import listen_invalidations
 from app.core.config import settings
+from app.core.executor import extraction_executor
+from app.core.metrics import cache_metrics
+from app.core.redis_pool import log_pool_summary
+from app.db import session as db_session
 
 app = FastAPI(
     title="HolyVoice API",
@@ -21,13 +28,55 @@ app.add_middleware(
         "Accept",
         "Origin",
         "X-Requested-With",
+        "If-None-Match",
         "Access-Control-Allow-Origin",
         "Access-Control-Allow-Methods",
         "Access-Control-Allow-Headers",
         "Access-Control-Allow-Credentials"
     ],
-    expose_headers=["*"],
+    # Com credenciais, o curinga "*" não vale: os cabeçalhos lidos pelo
+    # frontend precisam ser listados
+    expose_headers=["ETag", "X-Next-Cursor"],
     max_age=3600
 )
 
-app.include_router(api_router, prefix=settings.API_V1_STR) 
\ No newline at end of file
+app.include_router(api_router, prefix=settings.API_V1_STR) 
+
+
+@app.on_event("startup")
+async def start_cache_invalidation_listener():
+    # Mantém o cache em memória coerente com as escritas de outros processos
+    app.state.cache_listener = asyncio.create_task(listen_invalidations())
+
+
+@app.on_event("shutdown")
+async def stop_cache_invalidation_listener():
+    app.state.cache_listener.cancel()
+
+
+@app.on_event("shutdown")
+async def close_async_db_engine():
+    await db_session.dispose_async_engine()
+
+
+async def _log_cache_metrics() -> None:
+    while True:
+        await asyncio.sleep(settings.CACHE_METRICS_LOG_INTERVAL)
+        cache_metrics.log_summary()
+        log_pool_summary()
+        db_session.log_pool_summary()
+        extraction_executor.log_summary()
+
+
+@app.on_event("startup")
+async def start_cache_metrics_log():
+    # Resumo periódico das métricas do cache, para calibrar os TTLs
+    app.state.cache_metrics_log = None
+    if settings.CACHE_METRICS_LOG_INTERVAL > 0:
+        app.state.cache_metrics_log = asyncio.create_task(_log_cache_metrics())
+
+
+@app.on_event("shutdown")
+async def stop_cache_metrics_log():
+    if app.state.cache_metrics_log:
+        app.state.cache_metrics_log.cancel()
@@ -1,5 +1,11 @@
 from app.models.user import User
-from app.models.youtube import YoutubeChannel, YoutubePlaylist, YoutubeVideo, YoutubeChannelAccess
+from app.models.youtube import (
+    YoutubeChannel,
+    YoutubePlaylist,
+    YoutubeVideo,
+    YoutubeChannelAccess,
+    YoutubeChannelResolution
+)
 from app.models.monitoring import (
     YoutubeMonitoring,
     MonitoringVideo,
@@ -13,5 +19,6 @@ __all__ = [
     "YoutubeChannel",
     "YoutubePlaylist",
     "YoutubeVideo",
-    "YoutubeChannelAccess"
+    "YoutubeChannelAccess",
+    "YoutubeChannelResolution"
 ] 
\ No newline at end of file
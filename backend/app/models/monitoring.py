@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text, Enum
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text, Enum, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -56,6 +56,16 @@ class MonitoringPlaylist(Base):
 
 class YoutubeMonitoring(Base):
     __tablename__ = "youtube_monitoring"
+    __table_args__ = (
+        # Consulta periódica do beat: monitoramentos ativos com verificação vencida
+        Index(
+            "ix_youtube_monitoring_active_next_check",
+            "next_check_at",
+            postgresql_where=text("status = 'active'"),
+        ),
+        # Paginação por cursor (created_at, id) dos monitoramentos do usuário
+        Index("ix_youtube_monitoring_created_by_created_at_id", "created_by", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     channel_id = Column(Integer, ForeignKey("youtube_channel.id"), nullable=False)
@@ -69,6 +79,10 @@ class YoutubeMonitoring(Base):
     updated_at = Column(DateTime(timezone=True), nullable=True)
     last_check_at = Column(DateTime(timezone=True), nullable=True)
     next_check_at = Column(DateTime(timezone=True), nullable=True)
+    # Falhas seguidas de extração do canal e suspensão pelo disjuntor
+    consecutive_failures = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(Text, nullable=True)
+    circuit_open_until = Column(DateTime(timezone=True), nullable=True)
 
     # Relacionamentos
     channel = relationship("YoutubeChannel", back_populates="monitorings")
@@ -81,6 +95,10 @@ class YoutubeMonitoring(Base):
 
 class MonitoringVideo(Base):
     __tablename__ = "monitoring_video"
+    __table_args__ = (
+        UniqueConstraint("monitoring_id", "video_id", name="uq_monitoring_video_monitoring_video"),
+        Index("ix_monitoring_video_monitoring_status", "monitoring_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     monitoring_id = Column(Integer, ForeignKey("youtube_monitoring.id"), nullable=False)
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -9,6 +9,10 @@ from app.db.base_class import Base
 
 class YoutubeChannel(Base):
     __tablename__ = "youtube_channel"
+    __table_args__ = (
+        # Paginação por cursor (created_at, id)
+        Index("ix_youtube_channel_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     channel_url = Column(String, nullable=False)
@@ -62,6 +66,12 @@ class YoutubePlaylist(Base):
 
 class YoutubeVideo(Base):
     __tablename__ = "youtube_video"
+    __table_args__ = (
+        # Alvo do ON CONFLICT em CRUDYoutube.upsert_videos
+        UniqueConstraint("channel_id", "video_id", name="uq_youtube_video_channel_video"),
+        # Paginação por cursor (published_at, id) dentro do canal
+        Index("ix_youtube_video_channel_published_at_id", "channel_id", "published_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     channel_id = Column(Integer, ForeignKey("youtube_channel.id"), nullable=False)
@@ -72,6 +82,7 @@ class YoutubeVideo(Base):
     is_live = Column(Boolean, default=False)
     published_at = Column(DateTime(timezone=True), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relacionamentos
     channel = relationship("YoutubeChannel", back_populates="videos")
@@ -81,8 +92,28 @@ class YoutubeVideo(Base):
         return f"<YoutubeVideo {self.title}>"
 
 
+class YoutubeChannelResolution(Base):
+    """
+    Resolução persistente de URLs de canal (handles, /c/, /user/) para o ID
+    canônico (UC…). youtube_id nulo registra uma resolução negativa.
+    """
+    __tablename__ = "youtube_channel_resolution"
+
+    id = Column(Integer, primary_key=True, index=True)
+    url_key = Column(String, nullable=False, unique=True, index=True)  # URL normalizada
+    youtube_id = Column(String, nullable=True)  # ID do canal no YouTube
+    resolved_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<YoutubeChannelResolution {self.url_key} -> {self.youtube_id}>"
+
+
 class YoutubeChannelAccess(Base):
     __tablename__ = "youtube_channel_access"
+    __table_args__ = (
+        Index("ix_youtube_channel_access_user_channel_view", "user_id", "channel_id", "can_view"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     channel_id = Column(Integer, ForeignKey("youtube_channel.id"), nullable=False)
@@ -81,6 +81,9 @@ class MonitoringInDB(MonitoringBase):
     updated_at: Optional[datetime] = None
     last_check_at: Optional[datetime] = None
     next_check_at: Optional[datetime] = None
+    consecutive_failures: int = 0
+    last_error: Optional[str] = None
+    circuit_open_until: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -107,6 +110,9 @@ class MonitoringListItem(BaseModel):
     interval_time: Optional[int]  # Intervalo em minutos
     created_at: datetime
     last_check_at: Optional[datetime]
+    consecutive_failures: int = 0
+    last_error: Optional[str] = None
+    circuit_open_until: Optional[datetime] = None
     total_videos: int
     processed_videos: int
 
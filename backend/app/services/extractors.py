@@ -0,0 +1,358 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, Optional
+
+import yt_dlp
+from yt_dlp.utils import DownloadError
+
+from app.core.config import settings
+from app.services.youtube_url import (
+    parse_channel_handle,
+    parse_channel_id,
+    parse_video_id
+)
+
+
+class BaseExtractor:
+    """
+    Interface das fontes de dados usadas pelo YouTubeService.
+
+    As implementações são síncronas e rodam no pool de extração. Os retornos
+    seguem o formato do yt-dlp e precisam ser serializáveis em JSON.
+    """
+
+    def extract_info(self, url: str, ydl_opts: Dict[str, Any], process: bool = True) -> Dict[str, Any]:
+        """Equivalente a YoutubeDL.extract_info(url, download=False)."""
+        raise NotImplementedError
+
+    def iter_entries(self, url: str, ydl_opts: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Percorre as entradas de um feed ou playlist sob demanda."""
+        raise NotImplementedError
+
+
+def _fixture_name(url: str, process: bool, playlist_items: Optional[str] = None) -> str:
+    """
+    Nome do arquivo de fixture de uma extração. Extrações paginadas com
+    'playlist_items' ganham um arquivo por trecho, sem sobrescrever a
+    gravação completa.
+    """
+    reference = f"{url}|{int(process)}"
+    if playlist_items:
+        reference += f"|{playlist_items}"
+    return hashlib.sha1(reference.encode()).hexdigest()[:20] + ".json"
+
+
+class YtDlpExtractor(BaseExtractor):
+    """
+    Extrai os dados do YouTube com o yt-dlp.
+
+    Se `record_dir` for informado, cada resposta também é gravada como
+    fixture para ser reproduzida depois pelo FixtureExtractor.
+    """
+
+    def __init__(self, record_dir: Optional[str] = None):
+        self.record_dir = record_dir
+
+    def _record(
+        self, url: str, process: bool, info: Dict[str, Any], playlist_items: Optional[str] = None
+    ) -> None:
+        if not self.record_dir:
+            return
+        os.makedirs(self.record_dir, exist_ok=True)
+        path = os.path.join(self.record_dir, _fixture_name(url, process, playlist_items))
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"url": url, "process": process, "playlist_items": playlist_items, "info": info}, f)
+
+    def extract_info(self, url: str, ydl_opts: Dict[str, Any], process: bool = True) -> Dict[str, Any]:
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(url, download=False, process=process)
+            # Converte para JSON puro para poder compartilhar o resultado via Redis
+            info = yt_dlp.YoutubeDL.sanitize_info(info)
+        self._record(url, process, info, ydl_opts.get("playlist_items"))
+        return info
+
+    def iter_entries(self, url: str, ydl_opts: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        # Com process=False o yt-dlp entrega as entradas como gerador, buscando
+        # as páginas seguintes só quando necessário
+        seen = []
+        try:
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                info = ydl.extract_info(url, download=False, process=False)
+                for entry in info.get('entries') or []:
+                    if not entry:
+                        continue
+                    entry = yt_dlp.YoutubeDL.sanitize_info(entry)
+                    seen.append(entry)
+                    yield entry
+        finally:
+            # Grava apenas o trecho do feed que foi de fato percorrido
+            if self.record_dir and seen:
+                self._record(url, False, {"_type": "playlist", "entries": seen})
+
+
+class _FaultInjectionMixin:
+    """Latência e falhas artificiais para testes de carga."""
+
+    latency: float = 0.0
+    error_rate: float = 0.0
+    error_message: str = "Erro injetado"
+
+    def _simulate(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+        if self.error_rate and self._random.random() < self.error_rate:
+            raise DownloadError(f"ERROR: {self.error_message}")
+
+
+class FixtureExtractor(_FaultInjectionMixin, BaseExtractor):
+    """
+    Reproduz respostas gravadas pelo YtDlpExtractor, sem acessar a rede.
+    URLs sem fixture falham como um vídeo ou canal inexistente.
+    """
+
+    def __init__(
+        self,
+        fixtures_dir: str,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_message: str = "Erro injetado",
+        seed: Optional[int] = None
+    ):
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_message = error_message
+        self._random = random.Random(seed)
+
+    def _find(self, url: str, process: bool, playlist_items: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        # Uma feed gravada com process=False também serve para process=True
+        for candidate in (process, not process):
+            path = os.path.join(self.fixtures_dir, _fixture_name(url, candidate, playlist_items))
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    return json.load(f)["info"]
+        return None
+
+    def _load(self, url: str, process: bool) -> Dict[str, Any]:
+        info = self._find(url, process)
+        if info is None:
+            raise DownloadError(f"ERROR: Nenhuma fixture gravada para {url}")
+        return info
+
+    def extract_info(self, url: str, ydl_opts: Dict[str, Any], process: bool = True) -> Dict[str, Any]:
+        self._simulate()
+        playlist_items = ydl_opts.get("playlist_items")
+        if playlist_items:
+            # O trecho gravado já vem recortado pelo yt-dlp
+            info = self._find(url, process, playlist_items)
+            if info is not None:
+                return info
+        info = self._load(url, process)
+        return _apply_playlist_items(info, ydl_opts)
+
+    def iter_entries(self, url: str, ydl_opts: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        self._simulate()
+        for entry in self._load(url, False).get('entries') or []:
+            if entry:
+                yield entry
+
+
+class SyntheticExtractor(_FaultInjectionMixin, BaseExtractor):
+    """
+    Gera canais, playlists e vídeos determinísticos a partir da URL.
+
+    Cada canal tem `videos_per_channel` vídeos e, se `new_video_interval`
+    for positivo, ganha um vídeo novo a cada intervalo, o que permite
+    exercitar a descoberta incremental do worker de monitoramento.
+    """
+
+    def __init__(
+        self,
+        videos_per_channel: int = 5000,
+        playlists_per_channel: int = 20,
+        new_video_interval: float = 0.0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_message: str = "Erro injetado",
+        seed: Optional[int] = None
+    ):
+        self.videos_per_channel = videos_per_channel
+        self.playlists_per_channel = playlists_per_channel
+        self.new_video_interval = new_video_interval
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_message = error_message
+        self._random = random.Random(seed)
+        self._started_at = time.time()
+        # Vídeos gerados -> canal, para que get_video_info saiba o dono
+        self._video_channels: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _make_id(prefix: str, seed: str, length: int) -> str:
+        alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+        digest = hashlib.sha256(seed.encode()).digest()
+        return prefix + "".join(alphabet[b % 64] for b in digest)[:length - len(prefix)]
+
+    def channel_id_for(self, url: str) -> str:
+        """ID do canal sintético correspondente à URL ou handle."""
+        channel_id = parse_channel_id(url)
+        if channel_id:
+            return channel_id
+        reference = parse_channel_handle(url) or url.rstrip("/").split("/")[-1]
+        return self._make_id("UC", reference.lower(), 24)
+
+    def _video_count(self) -> int:
+        if self.new_video_interval > 0:
+            elapsed = time.time() - self._started_at
+            return self.videos_per_channel + int(elapsed / self.new_video_interval)
+        return self.videos_per_channel
+
+    def _video_entry(self, channel_id: str, index: int) -> Dict[str, Any]:
+        # index 0 é o vídeo mais antigo; o feed é entregue do mais novo ao mais antigo
+        video_id = self._make_id("", f"{channel_id}:{index}", 11)
+        with self._lock:
+            self._video_channels[video_id] = channel_id
+        upload_date = datetime(2015, 1, 1) + timedelta(hours=6 * index)
+        return {
+            "_type": "url",
+            "ie_key": "Youtube",
+            "id": video_id,
+            "url": f"https://www.youtube.com/watch?v={video_id}",
+            "title": f"Vídeo sintético {index}",
+            "description": "",
+            "upload_date": upload_date.strftime("%Y%m%d"),
+            "view_count": (index * 37) % 100000,
+            "channel_id": channel_id,
+        }
+
+    def _video_entries(self, channel_id: str) -> Iterator[Dict[str, Any]]:
+        for index in range(self._video_count() - 1, -1, -1):
+            yield self._video_entry(channel_id, index)
+
+    def _playlist_entries(self, channel_id: str) -> Iterator[Dict[str, Any]]:
+        for index in range(self.playlists_per_channel):
+            playlist_id = self._make_id("PL", f"{channel_id}:playlist:{index}", 34)
+            yield {
+                "_type": "url",
+                "ie_key": "YoutubeTab",
+                "id": playlist_id,
+                "url": f"https://www.youtube.com/playlist?list={playlist_id}",
+                "title": f"Playlist sintética {index}",
+                "description": "",
+                "video_count": 10 + index,
+            }
+
+    def _video_info(self, video_id: str) -> Dict[str, Any]:
+        with self._lock:
+            channel_id = self._video_channels.get(video_id)
+        channel_id = channel_id or self._make_id("UC", f"orphan:{video_id}", 24)
+        return {
+            "_type": "video",
+            "id": video_id,
+            "channel_id": channel_id,
+            "title": f"Vídeo sintético {video_id}",
+            "description": "",
+            "thumbnail": f"https://i.ytimg.com/vi/{video_id}/maxresdefault.jpg",
+            "upload_date": "20240101",
+            "view_count": 1000,
+            "like_count": 10,
+            "is_live": False,
+        }
+
+    def extract_info(self, url: str, ydl_opts: Dict[str, Any], process: bool = True) -> Dict[str, Any]:
+        self._simulate()
+        video_id = parse_video_id(url)
+        if video_id:
+            return self._video_info(video_id)
+
+        channel_id = self.channel_id_for(url)
+        if url.rstrip("/").endswith("/playlists"):
+            entries = self._playlist_entries(channel_id)
+        else:
+            entries = self._video_entries(channel_id)
+
+        info = {
+            "_type": "playlist",
+            "id": channel_id,
+            "channel_id": channel_id,
+            "channel": f"Canal sintético {channel_id[-6:]}",
+            "title": f"Canal sintético {channel_id[-6:]}",
+            "description": "Canal gerado para testes de carga",
+            "thumbnails": [{"url": f"https://yt3.ggpht.com/{channel_id}"}],
+            "playlist_count": self._video_count(),
+            "entries": entries,
+        }
+        return _apply_playlist_items(info, ydl_opts)
+
+    def iter_entries(self, url: str, ydl_opts: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        self._simulate()
+        channel_id = self.channel_id_for(url)
+        if url.rstrip("/").endswith("/playlists"):
+            yield from self._playlist_entries(channel_id)
+        else:
+            yield from self._video_entries(channel_id)
+
+
+def _apply_playlist_items(info: Dict[str, Any], ydl_opts: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Aplica a opção 'playlist_items' ("início-fim", base 1) às entradas,
+    como o yt-dlp faria, e materializa a lista.
+    """
+    if "entries" not in info:
+        return info
+    entries = info["entries"]
+    items = ydl_opts.get("playlist_items")
+    start, end = 1, None
+    if items:
+        first, _, last = str(items).replace(":", "-").partition("-")
+        start = int(first or 1)
+        end = int(last) if last else start
+    selected = []
+    for position, entry in enumerate(entries, start=1):
+        if end is not None and position > end:
+            break
+        if position >= start:
+            selected.append(entry)
+    return {**info, "entries": selected}
+
+
+_extractor: Optional[BaseExtractor] = None
+
+
+def get_extractor() -> BaseExtractor:
+    """
+    Retorna a fonte de dados configurada em YOUTUBE_EXTRACTOR_BACKEND:
+    "yt_dlp" (padrão), "fixture" ou "synthetic".
+    """
+    global _extractor
+    if _extractor is None:
+        backend = settings.YOUTUBE_EXTRACTOR_BACKEND
+        if backend == "fixture":
+            _extractor = FixtureExtractor(
+                settings.YOUTUBE_FIXTURES_DIR,
+                latency=settings.YOUTUBE_FIXTURE_LATENCY,
+                error_rate=settings.YOUTUBE_FIXTURE_ERROR_RATE,
+                error_message=settings.YOUTUBE_FIXTURE_ERROR_MESSAGE
+            )
+        elif backend == "synthetic":
+            _extractor = SyntheticExtractor(
+                videos_per_channel=settings.YOUTUBE_SYNTHETIC_VIDEOS_PER_CHANNEL,
+                playlists_per_channel=settings.YOUTUBE_SYNTHETIC_PLAYLISTS_PER_CHANNEL,
+                new_video_interval=settings.YOUTUBE_SYNTHETIC_NEW_VIDEO_INTERVAL,
+                latency=settings.YOUTUBE_FIXTURE_LATENCY,
+                error_rate=settings.YOUTUBE_FIXTURE_ERROR_RATE,
+                error_message=settings.YOUTUBE_FIXTURE_ERROR_MESSAGE
+            )
+        elif backend == "yt_dlp":
+            _extractor = YtDlpExtractor(
+                record_dir=settings.YOUTUBE_FIXTURES_DIR if settings.YOUTUBE_FIXTURE_RECORD else None
+            )
+        else:
+            raise ValueError(f"YOUTUBE_EXTRACTOR_BACKEND inválido: {backend}")
+    return _extractor
\ No newline at end of file
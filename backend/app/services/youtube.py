@@ -1,12 +1,71 @@
+import asyncio
+import base64
+import hashlib
+import json
+import time
 import yt_dlp
+from contextlib import aclosing
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from app.core.cache import YouTubeCache
+from sqlalchemy.orm import Session
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+from app.core.cache import YouTubeCache, cached
+from app.core.config import settings
+from app.core.executor import extraction_executor
+from app.core.rate_limit import is_throttling_error, youtube_rate_limiter
+from app.core.singleflight import youtube_singleflight
+from app.crud.base import InvalidCursorError
+from app.crud.crud_youtube import crud_youtube
+from app.services.extractors import BaseExtractor, get_extractor
+from app.services.youtube_url import (
+    VIDEO_ID_PATTERN,
+    normalize_channel_url,
+    parse_channel_id,
+    parse_video_id
+)
+
+
+def _encode_cursor(url: str, offset: int, last_id: str) -> str:
+    """
+    Gera o cursor opaco que retoma a leitura de `url` logo depois da entrada
+    `last_id`, que estava na posição `offset` - 1.
+    """
+    payload = {"u": hashlib.sha1(url.encode()).hexdigest()[:12], "o": offset, "v": last_id}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(url: str, cursor: str) -> Tuple[int, Optional[str]]:
+    """
+    Retorna (offset, last_id) guardados no cursor, validando que ele pertence
+    a `url`. Cursores antigos, só com o offset, retornam last_id None.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        offset = int(payload["o"])
+        url_hash = payload["u"]
+        last_id = payload.get("v")
+    except (ValueError, TypeError, KeyError, AttributeError):
+        raise InvalidCursorError("Cursor de paginação inválido")
+    if offset < 0 or url_hash != hashlib.sha1(url.encode()).hexdigest()[:12]:
+        raise InvalidCursorError("Cursor de paginação inválido")
+    return offset, str(last_id) if last_id is not None else None
+
+
+def _channel_cache_key(channel_url: str, subresource: str) -> Optional[str]:
+    """Só URLs /channel/UC… passam pelo cache, pois só elas trazem o ID."""
+    channel_id = parse_channel_id(channel_url)
+    return f"{channel_id}:{subresource}" if channel_id else None
+
+
+def _channel_cache_tags(result: Any, channel_url: str, **_: Any) -> List[str]:
+    return [f"channel:{parse_channel_id(channel_url)}"]
 
 
 class YouTubeService:
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, extractor: Optional[BaseExtractor] = None):
         # api_key não será mais necessária, mas mantemos o parâmetro para compatibilidade
+        # A fonte de dados padrão vem de YOUTUBE_EXTRACTOR_BACKEND
+        self.extractor = extractor or get_extractor()
         self.ydl_opts = {
             'quiet': True,
             'extract_flat': True,
@@ -14,78 +73,362 @@ class YouTubeService:
             'no_warnings': True
         }
 
-    async def extract_channel_id(self, channel_url: str) -> Optional[str]:
+    # Classe de endpoint de cada método, usada pelo limitador de tráfego
+    _ENDPOINT_CLASSES = {
+        "extract_channel_id": "channel",
+        "get_channel_info": "channel",
+        "get_recent_videos": "channel",
+        "get_playlists": "playlist",
+        "extract_video_id": "video",
+        "get_video_info": "video",
+    }
+
+    def _extract_info_sync(self, url: str, ydl_opts: Dict[str, Any], process: bool = True) -> Dict[str, Any]:
+        """Chamada bloqueante ao extrator; deve rodar apenas no pool de extração."""
+        return self.extractor.extract_info(url, ydl_opts, process=process)
+
+    async def _extract_info(
+        self,
+        method: str,
+        url: str,
+        ydl_opts: Optional[Dict[str, Any]] = None,
+        process: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Executa o yt-dlp no pool dedicado, fora do event loop.
+        Chamadas simultâneas com o mesmo (método, URL, opções) compartilham
+        uma única extração, inclusive entre processos.
+        """
+        ydl_opts = ydl_opts or self.ydl_opts
+        return await self._run_extraction(
+            method,
+            url,
+            {**ydl_opts, "process": process},
+            self._extract_info_sync,
+            url,
+            ydl_opts,
+            process
+        )
+
+    async def _run_extraction(
+        self,
+        method: str,
+        url: str,
+        options: Dict[str, Any],
+        func: Callable[..., Any],
+        *args: Any
+    ) -> Any:
+        """
+        Executa `func` no pool de extração, coalescendo chamadas simultâneas
+        com a mesma chave (método, URL, opções). Só a execução efetiva
+        consome orçamento do limitador de tráfego.
+        """
+        endpoint_class = self._ENDPOINT_CLASSES.get(method.split(":")[0], "default")
+
+        async def _execute() -> Any:
+            await youtube_rate_limiter.acquire(endpoint_class)
+            try:
+                return await extraction_executor.run(func, *args)
+            except Exception as e:
+                if is_throttling_error(e):
+                    await youtube_rate_limiter.report_throttled()
+                raise
+
+        key = youtube_singleflight.make_key(method, url, options)
+        return await youtube_singleflight.do(key, _execute)
+
+    async def _stream_entries(self, method: str, url: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Percorre as entradas de um feed ou playlist em uma única leitura
+        preguiçosa do yt-dlp, no pool de extração. As páginas do YouTube só
+        são buscadas quando o consumidor chega a elas, e parar a iteração
+        interrompe a leitura.
+        """
+        endpoint_class = self._ENDPOINT_CLASSES.get(method, "default")
+        await youtube_rate_limiter.acquire(endpoint_class)
         try:
-            with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
-                info = ydl.extract_info(channel_url, download=False)
-                channel_id = info.get('channel_id')
-                return channel_id
+            async with aclosing(
+                extraction_executor.iterate(self.extractor.iter_entries, url, self.ydl_opts)
+            ) as entries:
+                async for entry in entries:
+                    if entry:
+                        yield entry
         except Exception as e:
+            if is_throttling_error(e):
+                await youtube_rate_limiter.report_throttled()
+            raise
+
+    async def _entries_after(
+        self, method: str, url: str, offset: int, last_id: Optional[str]
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Entrega (posição, entrada) das entradas que vêm depois do ponto do
+        cursor: logo depois de `last_id`, onde quer que ela esteja agora, ou
+        a partir de `offset` se ela tiver saído do feed.
+        """
+        anchored = last_id is None and offset == 0
+        # Entradas a partir de offset, guardadas enquanto last_id não aparece
+        pending: List[Tuple[int, Dict[str, Any]]] = []
+        position = -1
+        async with aclosing(self._stream_entries(method, url)) as entries:
+            async for entry in entries:
+                position += 1
+                if anchored:
+                    yield position, entry
+                elif last_id is not None and str(entry.get('id', '')) == last_id:
+                    anchored = True
+                    pending = []
+                elif position >= offset:
+                    if last_id is None:
+                        anchored = True
+                        yield position, entry
+                    else:
+                        pending.append((position, entry))
+
+        for item in pending:
+            yield item
+
+    async def _iter_entry_pages(
+        self,
+        method: str,
+        url: str,
+        page_size: Optional[int] = None,
+        cursor: Optional[str] = None,
+        stop_at: Optional[Iterable[str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Lê as entradas de um feed ou playlist em uma única passada e as
+        entrega página a página: {"entries", "next_cursor"}; next_cursor é
+        None na última página. Com `stop_at`, a leitura termina antes da
+        primeira entrada cujo ID esteja no conjunto, sem buscar o restante
+        do feed.
+
+        Ao retomar por um cursor, o feed é lido desde o início uma única vez
+        e a entrega recomeça logo depois da última entrada já entregue.
+        """
+        page_size = page_size or settings.YOUTUBE_PAGE_SIZE
+        offset, last_id = _decode_cursor(url, cursor) if cursor else (0, None)
+        stop_at = set(stop_at or ())
+
+        page: List[Tuple[int, Dict[str, Any]]] = []
+        async with aclosing(self._entries_after(method, url, offset, last_id)) as entries:
+            async for position, entry in entries:
+                if str(entry.get('id', '')) in stop_at:
+                    break
+                # Só fecha a página quando sabe que há uma entrada seguinte
+                if len(page) == page_size:
+                    last_position, last_entry = page[-1]
+                    yield {
+                        "entries": [item for _, item in page],
+                        "next_cursor": _encode_cursor(url, last_position + 1, str(last_entry.get('id', '')))
+                    }
+                    page = []
+                page.append((position, entry))
+
+        yield {"entries": [item for _, item in page], "next_cursor": None}
+
+    async def extract_channel_id(
+        self, channel_url: str, db: Optional[Session] = None
+    ) -> Optional[str]:
+        """
+        Resolve a URL do canal para o ID canônico (UC…).
+
+        URLs /channel/UC… são resolvidas localmente. Handles e URLs
+        personalizadas passam pelo cache do Redis e, se `db` for informado,
+        pela tabela youtube_channel_resolution antes de recorrer ao yt-dlp.
+        Resoluções negativas também são memorizadas, por menos tempo.
+        """
+        channel_id = parse_channel_id(channel_url)
+        if channel_id:
+            return channel_id
+
+        url_key = normalize_channel_url(channel_url)
+        if url_key:
+            cached_data = await YouTubeCache.get_channel_resolution(url_key)
+            if cached_data is not None:
+                return cached_data["youtube_id"]
+
+            if db is not None:
+                resolution = crud_youtube.get_channel_resolution(db, url_key=url_key)
+                if resolution:
+                    await YouTubeCache.set_channel_resolution(
+                        url_key,
+                        resolution.youtube_id,
+                        expire=settings.YOUTUBE_RESOLUTION_TTL
+                        if resolution.youtube_id else settings.YOUTUBE_RESOLUTION_NEGATIVE_TTL
+                    )
+                    return resolution.youtube_id
+
+        try:
+            info = await self._extract_info("extract_channel_id", channel_url)
+            channel_id = info.get('channel_id')
+        except yt_dlp.utils.DownloadError as e:
+            # O YouTube respondeu que o canal não existe ou não está acessível
+            channel_id = None
+        except Exception as e:
+            # Falhas transitórias (tempo limite, rede) não são memorizadas
             return None
 
+        if url_key:
+            ttl = settings.YOUTUBE_RESOLUTION_TTL if channel_id else settings.YOUTUBE_RESOLUTION_NEGATIVE_TTL
+            await YouTubeCache.set_channel_resolution(url_key, channel_id, expire=ttl)
+            if db is not None:
+                crud_youtube.save_channel_resolution(db, url_key=url_key, youtube_id=channel_id, ttl=ttl)
+        return channel_id
+
+    @cached(
+        "channel",
+        ttl=86400,
+        soft_ttl=3600,
+        key=lambda channel_url: _channel_cache_key(channel_url, "details"),
+        tags=_channel_cache_tags,
+        negative_ttl=settings.YOUTUBE_NEGATIVE_CACHE_TTL
+    )
     async def get_channel_info(self, channel_url: str) -> Optional[Dict[str, Any]]:
+        """
+        Obtém os dados do canal. URLs /channel/UC… usam o cache com
+        stale-while-revalidate: atualiza em segundo plano depois de 1 hora e
+        serve o valor antigo por até 1 dia. As demais são sempre extraídas.
+
+        Retorna None, e memoriza a ausência, só quando o YouTube responde que
+        o canal não existe ou não está acessível; falhas transitórias (tempo
+        limite, limite de requisições, circuito aberto) são propagadas.
+        """
         try:
-            with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
-                info = ydl.extract_info(f"{channel_url}/videos", download=False)
-                
-                # Obtém a thumbnail de melhor qualidade
-                thumbnails = info.get('thumbnails', [])
-                avatar_url = thumbnails[-1].get('url') if thumbnails else ''
-                
-                channel_info = {
-                    "title": info.get('channel', ''),
-                    "description": info.get('description', ''),
-                    "avatar_image": avatar_url,
-                    "banner_image": avatar_url,  # Usando mesmo avatar como banner por enquanto
-                    "subscriber_count": 0,  # Valor fixo por enquanto
-                    "video_count": info.get('playlist_count', 0),
-                    "view_count": 0  # Será calculado pela soma dos vídeos
-                }
-                return channel_info
-        except Exception as e:
+            info = await self._extract_info("get_channel_info", f"{channel_url}/videos")
+        except yt_dlp.utils.DownloadError:
             return None
 
-    async def get_recent_videos(self, channel_id: str, max_results: int = 12) -> List[Dict[str, Any]]:
+        # Obtém a thumbnail de melhor qualidade
+        thumbnails = info.get('thumbnails', [])
+        avatar_url = thumbnails[-1].get('url') if thumbnails else ''
+
+        channel_info = {
+            "title": info.get('channel', ''),
+            "description": info.get('description', ''),
+            "avatar_image": avatar_url,
+            "banner_image": avatar_url,  # Usando mesmo avatar como banner por enquanto
+            "subscriber_count": 0,  # Valor fixo por enquanto
+            "video_count": info.get('playlist_count', 0),
+            "view_count": 0  # Será calculado pela soma dos vídeos
+        }
+        return channel_info
+
+    @staticmethod
+    def _parse_video_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Converte uma entrada do feed do canal no formato usado pela API."""
+        upload_date = entry.get('upload_date', '')
         try:
-            ydl_opts = {
-                **self.ydl_opts,
-                'playlist_items': f'1-{max_results}'
-            }
+            published_at = datetime.strptime(upload_date, '%Y%m%d') if upload_date else datetime.now()
+        except:
+            published_at = datetime.now()
+        
+        # Garante que o ID seja string
+        video_id = str(entry.get('id', ''))
+        # Usa o formato padrão de thumbnail do YouTube em alta qualidade
+        thumbnail_url = f"https://i.ytimg.com/vi/{video_id}/maxresdefault.jpg"
+        
+        return {
+            "id": video_id,
+            "title": entry.get('title', ''),
+            "description": entry.get('description', ''),
+            "thumbnail_url": thumbnail_url,
+            "published_at": published_at,
+            "view_count": entry.get('view_count', 0),
+            "like_count": entry.get('like_count', 0),
+            "is_live": entry.get('is_live', False)
+        }
+
+    async def get_recent_videos(
+        self,
+        channel_id: str,
+        max_results: int = 12,
+        force_refresh: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Obtém os vídeos mais recentes do canal.
+        """
+        try:
+            entries = await self._load_recent_entries(
+                channel_id, max_results, force_refresh=force_refresh
+            )
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(f"https://www.youtube.com/channel/{channel_id}/videos", download=False)
-                
-                videos = []
-                for entry in info.get('entries', []):
-                    if entry:
-                        upload_date = entry.get('upload_date', '')
-                        try:
-                            published_at = datetime.strptime(upload_date, '%Y%m%d') if upload_date else datetime.now()
-                        except:
-                            published_at = datetime.now()
-                        
-                        # Garante que o ID seja string
-                        video_id = str(entry.get('id', ''))
-                        # Usa o formato padrão de thumbnail do YouTube em alta qualidade
-                        thumbnail_url = f"https://i.ytimg.com/vi/{video_id}/maxresdefault.jpg"
-                        
-                        video = {
-                            "id": video_id,
-                            "title": entry.get('title', ''),
-                            "description": entry.get('description', ''),
-                            "thumbnail_url": thumbnail_url,
-                            "published_at": published_at,
-                            "view_count": entry.get('view_count', 0),
-                            "like_count": entry.get('like_count', 0),
-                            "is_live": entry.get('is_live', False)
-                        }
-                        videos.append(video)
-                
-                return videos
+            videos = []
+            for entry in entries or []:
+                videos.append(self._parse_video_entry(entry))
+            
+            return videos
                 
         except Exception as e:
             return []
 
+    async def get_recent_videos_version(self, channel_id: str, max_results: int = 12) -> Optional[str]:
+        """
+        Versão dos vídeos recentes guardados em cache, que muda a cada
+        recarga; None se não houver valor ainda válido. Permite responder a
+        requisições condicionais sem extrair nada.
+        """
+        key = YouTubeService._load_recent_entries.cache_key(self, channel_id, max_results)
+        return await YouTubeCache.get_version(key)
+
+    # Campos das entradas do feed usados por _parse_video_entry
+    _VIDEO_ENTRY_FIELDS = (
+        'id', 'title', 'description', 'upload_date', 'view_count', 'like_count', 'is_live'
+    )
+
+    @cached(
+        "channel",
+        ttl=7200,
+        soft_ttl=900,
+        key=lambda channel_id, max_results: f"{channel_id}:recent_entries:{max_results}",
+        tags=lambda result, channel_id, **_: [f"channel:{channel_id}"],
+        negative_ttl=settings.YOUTUBE_NEGATIVE_CACHE_TTL,
+        negative_exceptions=(yt_dlp.utils.DownloadError,)
+    )
+    async def _load_recent_entries(self, channel_id: str, max_results: int) -> List[Dict[str, Any]]:
+        """
+        Extrai as primeiras entradas do feed, só com os campos usados.
+        Atualiza em segundo plano depois de 15 minutos e serve o valor antigo
+        por até 2 horas.
+        """
+        channel_videos_url = f"https://www.youtube.com/channel/{channel_id}/videos"
+        ydl_opts = {
+            **self.ydl_opts,
+            'playlist_items': f'1-{max_results}'
+        }
+        
+        info = await self._extract_info("get_recent_videos", channel_videos_url, ydl_opts)
+        return [
+            {field: entry[field] for field in self._VIDEO_ENTRY_FIELDS if field in entry}
+            for entry in info.get('entries', []) if entry
+        ]
+
+    async def iter_recent_videos(
+        self,
+        channel_id: str,
+        page_size: Optional[int] = None,
+        cursor: Optional[str] = None,
+        known_video_ids: Optional[Iterable[str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Percorre os vídeos do canal, do mais novo ao mais antigo, uma página
+        por vez: {"items": [...], "next_cursor": ...}. Para retomar a leitura
+        depois, passe o next_cursor da última página recebida.
+
+        Com `known_video_ids`, a leitura para no primeiro vídeo já conhecido,
+        de modo que só os vídeos novos são entregues e as páginas seguintes
+        do feed nem são buscadas.
+        """
+        channel_videos_url = f"https://www.youtube.com/channel/{channel_id}/videos"
+        pages = self._iter_entry_pages(
+            "get_recent_videos", channel_videos_url, page_size, cursor, stop_at=known_video_ids
+        )
+        async for page in pages:
+            yield {
+                "items": [self._parse_video_entry(entry) for entry in page["entries"]],
+                "next_cursor": page["next_cursor"]
+            }
+
     async def validate_channel(self, channel_url: str) -> Dict[str, Any]:
         """
         Valida se o canal existe e retorna suas informações básicas.
@@ -107,15 +450,18 @@ class YouTubeService:
 
         return await self.get_channel_info_by_id(channel_id)
 
+    @cached(
+        "channel",
+        ttl=3600,
+        key=lambda channel_id: channel_id,
+        tags=lambda result, channel_id: [f"channel:{channel_id}"],
+        negative_ttl=settings.YOUTUBE_NEGATIVE_CACHE_TTL,
+        negative_exceptions=(ValueError,)
+    )
     async def get_channel_info_by_id(self, channel_id: str) -> Dict[str, Any]:
         """
         Obtém informações detalhadas do canal pelo ID.
         """
-        # Tenta obter do cache primeiro
-        cached_data = await YouTubeCache.get_channel_info(channel_id)
-        if cached_data:
-            return cached_data
-
         params = {
             "part": "snippet,statistics,brandingSettings",
             "id": channel_id
@@ -133,52 +479,85 @@ class YouTubeService:
             "subscriber_count": int(channel["statistics"].get("subscriberCount", 0)),
             "channel_email": channel["snippet"].get("email")
         }
-
-        # Salva no cache
-        await YouTubeCache.set_channel_info(channel_id, channel_info)
         return channel_info
 
-    async def get_playlists(self, channel_url: str) -> List[Dict[str, Any]]:
+    async def get_playlists(self, channel_url: str, force_refresh: bool = False) -> List[Dict[str, Any]]:
         """
         Obtém todas as playlists do canal usando yt-dlp.
         """
         try:
-            playlists_url = f"{channel_url}/playlists"
-            
-            ydl_opts = {
-                **self.ydl_opts,
-                'extract_flat': True,
-            }
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(playlists_url, download=False)
-                
-                playlists = []
-                for entry in info.get('entries', []):
-                    if entry:
-                        playlist = {
-                            "playlist_id": entry.get('id', ''),
-                            "title": entry.get('title', ''),
-                            "description": entry.get('description', ''),
-                            "thumbnail_url": entry.get('thumbnail', ''),
-                            "video_count": entry.get('video_count', 0)
-                        }
-                        playlists.append(playlist)
-                
-                return playlists
-                
+            return await self.fetch_playlists(channel_url, force_refresh=force_refresh)
         except Exception as e:
             return []
 
+    @cached(
+        "channel",
+        ttl=21600,
+        key=lambda channel_url: _channel_cache_key(channel_url, "playlists"),
+        tags=_channel_cache_tags,
+        negative_ttl=settings.YOUTUBE_NEGATIVE_CACHE_TTL,
+        negative_exceptions=(yt_dlp.utils.DownloadError,)
+    )
+    async def fetch_playlists(self, channel_url: str) -> List[Dict[str, Any]]:
+        """
+        Extrai as playlists do canal; guardadas por 6 horas. Diferente de
+        get_playlists, propaga as falhas de extração.
+        """
+        playlists_url = f"{channel_url}/playlists"
+        
+        ydl_opts = {
+            **self.ydl_opts,
+            'extract_flat': True,
+        }
+        
+        info = await self._extract_info("get_playlists", playlists_url, ydl_opts)
+        
+        playlists = []
+        for entry in info.get('entries', []):
+            if entry:
+                playlists.append(self._parse_playlist_entry(entry))
+        
+        return playlists
+
+    @staticmethod
+    def _parse_playlist_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Converte uma entrada da aba de playlists no formato usado pela API."""
+        return {
+            "playlist_id": entry.get('id', ''),
+            "title": entry.get('title', ''),
+            "description": entry.get('description', ''),
+            "thumbnail_url": entry.get('thumbnail', ''),
+            "video_count": entry.get('video_count', 0)
+        }
+
+    async def iter_playlists(
+        self,
+        channel_url: str,
+        page_size: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Versão paginada de get_playlists: entrega as playlists do canal uma
+        página por vez, no formato {"items": [...], "next_cursor": ...}.
+        Diferente de get_playlists, propaga as falhas de extração.
+        """
+        playlists_url = f"{channel_url}/playlists"
+        async for page in self._iter_entry_pages("get_playlists", playlists_url, page_size, cursor):
+            yield {
+                "items": [self._parse_playlist_entry(entry) for entry in page["entries"]],
+                "next_cursor": page["next_cursor"]
+            }
+
+    @cached(
+        "playlist",
+        ttl=7200,
+        key=lambda playlist_id, max_results: f"{playlist_id}:videos:{max_results}",
+        tags=lambda result, playlist_id, **_: [f"playlist:{playlist_id}"]
+    )
     async def get_playlist_videos(self, playlist_id: str, max_results: int = 50) -> List[Dict[str, Any]]:
         """
         Obtém os vídeos de uma playlist específica.
         """
-        # Tenta obter do cache primeiro
-        cached_data = await YouTubeCache.get_playlist_videos(playlist_id)
-        if cached_data:
-            return cached_data
-
         params = {
             "part": "snippet,contentDetails",
             "playlistId": playlist_id,
@@ -197,52 +576,158 @@ class YouTubeService:
                 "position": item["snippet"]["position"]
             }
             videos.append(video_data)
-
-        # Salva no cache
-        await YouTubeCache.set_playlist_videos(playlist_id, videos)
         return videos
 
     async def extract_video_id(self, video_url: str) -> Optional[str]:
+        # Formatos conhecidos são resolvidos localmente, sem acessar o YouTube
+        video_id = parse_video_id(video_url)
+        if video_id:
+            return video_id
+
         try:
-            with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
-                info = ydl.extract_info(video_url, download=False, process=False)
-                # Verifica se é um vídeo individual
-                if info.get('_type') == 'url' and 'watch?v=' in video_url:
-                    # Extrai o ID do vídeo da URL
-                    import re
-                    video_id_match = re.search(r'v=([^&]+)', video_url)
-                    if video_id_match:
-                        video_id = video_id_match.group(1)
-                        return video_id
-                # Se não for um vídeo individual, tenta pegar o ID diretamente
-                video_id = info.get('id')
-                return video_id
+            return await self._resolve_video_id(video_url)
         except Exception as e:
             return None
 
-    async def get_video_info(self, video_id: str) -> Optional[Dict[str, Any]]:
+    @cached(
+        "video_resolution",
+        ttl=settings.YOUTUBE_RESOLUTION_TTL,
+        negative_ttl=settings.YOUTUBE_RESOLUTION_NEGATIVE_TTL,
+        negative_exceptions=(yt_dlp.utils.DownloadError,)
+    )
+    async def _resolve_video_id(self, video_url: str) -> Optional[str]:
+        """Resolve pelo yt-dlp URLs de vídeo em formatos desconhecidos."""
+        info = await self._extract_info("extract_video_id", video_url, process=False)
+        # Só aceita o ID se a URL realmente apontar para um vídeo
+        video_id = info.get('id')
+        if video_id and VIDEO_ID_PATTERN.match(str(video_id)):
+            return video_id
+        return None
+
+    # Campos do yt-dlp necessários para montar as informações de um vídeo
+    _VIDEO_INFO_FIELDS = (
+        'id', 'channel_id', 'title', 'description', 'thumbnail',
+        'upload_date', 'view_count', 'like_count', 'is_live'
+    )
+
+    @staticmethod
+    def _parse_video_info(info: Dict[str, Any]) -> Dict[str, Any]:
+        """Converte a resposta do yt-dlp de um vídeo no formato usado pela API."""
+        upload_date = info.get('upload_date', '')
         try:
-            video_url = f"https://www.youtube.com/watch?v={video_id}"
-            with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
-                info = ydl.extract_info(video_url, download=False)
-                
-                upload_date = info.get('upload_date', '')
-                try:
-                    published_at = datetime.strptime(upload_date, '%Y%m%d') if upload_date else datetime.now()
-                except:
-                    published_at = datetime.now()
-                
-                video_info = {
-                    "id": info.get('id', ''),
-                    "channel_id": info.get('channel_id', ''),
-                    "title": info.get('title', ''),
-                    "description": info.get('description', ''),
-                    "thumbnail_url": info.get('thumbnail', ''),
-                    "published_at": published_at,
-                    "view_count": info.get('view_count', 0),
-                    "like_count": info.get('like_count', 0),
-                    "is_live": info.get('is_live', False)
-                }
-                return video_info
+            published_at = datetime.strptime(upload_date, '%Y%m%d') if upload_date else datetime.now()
+        except:
+            published_at = datetime.now()
+        
+        return {
+            "id": info.get('id', ''),
+            "channel_id": info.get('channel_id', ''),
+            "title": info.get('title', ''),
+            "description": info.get('description', ''),
+            "thumbnail_url": info.get('thumbnail', ''),
+            "published_at": published_at,
+            "view_count": info.get('view_count', 0),
+            "like_count": info.get('like_count', 0),
+            "is_live": info.get('is_live', False)
+        }
+
+    async def _fetch_video_info(self, video_id: str, force_refresh: bool = False) -> Dict[str, Any]:
+        """
+        Obtém as informações de um vídeo, reaproveitando o cache.
+        Diferente de get_video_info, propaga a exceção em caso de falha.
+        """
+        raw_info = await self._load_video_info(video_id, force_refresh=force_refresh)
+        return self._parse_video_info(raw_info)
+
+    @cached(
+        "video",
+        ttl=21600,
+        key=lambda video_id: video_id,
+        tags=lambda result, **_: [f"channel:{result['channel_id']}"] if result and result.get("channel_id") else [],
+        negative_ttl=settings.YOUTUBE_NEGATIVE_CACHE_TTL,
+        negative_exceptions=(yt_dlp.utils.DownloadError,)
+    )
+    async def _load_video_info(self, video_id: str) -> Dict[str, Any]:
+        """Extrai do YouTube só os campos usados de um vídeo; guardados por 6 horas."""
+        video_url = f"https://www.youtube.com/watch?v={video_id}"
+        info = await self._extract_info("get_video_info", video_url)
+        return {field: info.get(field) for field in self._VIDEO_INFO_FIELDS}
+
+    async def get_video_info(self, video_id: str, force_refresh: bool = False) -> Optional[Dict[str, Any]]:
+        try:
+            return await self._fetch_video_info(video_id, force_refresh=force_refresh)
         except Exception as e:
-            return None 
\ No newline at end of file
+            return None
+
+    async def iter_videos_info(
+        self,
+        video_ids: Iterable[str],
+        concurrency: Optional[int] = None,
+        rate_per_second: Optional[float] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Obtém as informações de vários vídeos em paralelo.
+
+        No máximo `concurrency` extrações ficam em andamento ao mesmo tempo e
+        novas extrações começam a no máximo `rate_per_second` por segundo.
+        Os resultados são entregues na ordem em que terminam, no formato
+        {"video_id", "info", "error"}; a falha de um vídeo não interrompe os
+        demais. Vídeos já em cache não consomem extração.
+        """
+        concurrency = concurrency or settings.YOUTUBE_BATCH_CONCURRENCY
+        rate_per_second = rate_per_second or settings.YOUTUBE_BATCH_RATE_PER_SECOND
+        semaphore = asyncio.Semaphore(concurrency)
+        rate_lock = asyncio.Lock()
+        min_interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        last_start = 0.0
+
+        async def _throttle() -> None:
+            nonlocal last_start
+            async with rate_lock:
+                wait = last_start + min_interval - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                last_start = time.monotonic()
+
+        async def _fetch(video_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                await _throttle()
+                try:
+                    info = await self._fetch_video_info(video_id)
+                    return {"video_id": video_id, "info": info, "error": None}
+                except Exception as e:
+                    return {"video_id": video_id, "info": None, "error": str(e) or type(e).__name__}
+
+        # Remove duplicados preservando a ordem
+        unique_ids = list(dict.fromkeys(str(video_id) for video_id in video_ids))
+
+        # Os vídeos já em cache são lidos em uma única ida ao Redis; os demais
+        # passam pelo cache de _load_video_info, que contabiliza a falta
+        hits = await YouTubeCache.get_videos_info(unique_ids, count_misses=False)
+        for video_id in unique_ids:
+            if hits.get(video_id):
+                yield {"video_id": video_id, "info": self._parse_video_info(hits[video_id]), "error": None}
+
+        tasks = [
+            asyncio.ensure_future(_fetch(video_id))
+            for video_id in unique_ids if not hits.get(video_id)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Se o consumidor parar antes do fim, cancela o que ainda não rodou
+            for task in tasks:
+                task.cancel()
+
+    async def get_videos_info(
+        self, video_ids: Iterable[str], **kwargs: Any
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Versão agregada de iter_videos_info: retorna {video_id: info}, com
+        None para os vídeos que falharam.
+        """
+        results = {}
+        async for result in self.iter_videos_info(video_ids, **kwargs):
+            results[result["video_id"]] = result["info"]
+        return results
\ No newline at end of file
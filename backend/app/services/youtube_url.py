@@ -0,0 +1,133 @@
+import re
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+# IDs de vídeo têm 11 caracteres; IDs de canal começam com UC e têm 24
+VIDEO_ID_PATTERN = re.compile(r'^[\w-]{11}$')
+CHANNEL_ID_PATTERN = re.compile(r'^UC[\w-]{22}$')
+HANDLE_PATTERN = re.compile(r'^@[\w.\-]{3,30}$')
+
+YOUTUBE_HOSTS = {
+    "youtube.com",
+    "m.youtube.com",
+    "music.youtube.com",
+    "youtube-nocookie.com",
+}
+SHORT_HOSTS = {"youtu.be"}
+
+# Prefixos de caminho em que o segmento seguinte é o ID do vídeo
+VIDEO_PATH_PREFIXES = {"shorts", "live", "embed", "v", "e"}
+
+# Primeiros segmentos que não são nomes personalizados de canal; URLs com
+# eles não identificam um canal sem consultar o YouTube
+RESERVED_PATHS = VIDEO_PATH_PREFIXES | {
+    "watch", "playlist", "results", "channel", "c", "user",
+    "feed", "hashtag", "post", "redirect", "attribution_link",
+}
+CUSTOM_NAME_PATTERN = re.compile(r'^[\w.\-]+$')
+
+
+def _split_url(url: str):
+    """Normaliza a URL e retorna (host, segmentos do caminho, query)."""
+    url = url.strip()
+    if "://" not in url:
+        url = f"https://{url}"
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    segments = [segment for segment in parsed.path.split("/") if segment]
+    return host, segments, parse_qs(parsed.query)
+
+
+def parse_video_id(url: str) -> Optional[str]:
+    """
+    Extrai o ID do vídeo de uma URL do YouTube sem acessar a rede.
+
+    Reconhece watch?v=, youtu.be, shorts, live, embed e /v/. Retorna None
+    quando a URL não segue nenhum desses formatos.
+    """
+    if not url:
+        return None
+    if VIDEO_ID_PATTERN.match(url.strip()):
+        return url.strip()
+
+    host, segments, query = _split_url(url)
+
+    if host in SHORT_HOSTS:
+        candidate = segments[0] if segments else None
+    elif host in YOUTUBE_HOSTS:
+        if segments[:1] == ["watch"]:
+            candidate = (query.get("v") or [None])[0]
+        elif len(segments) >= 2 and segments[0] in VIDEO_PATH_PREFIXES:
+            candidate = segments[1]
+        else:
+            candidate = None
+    else:
+        return None
+
+    if candidate and VIDEO_ID_PATTERN.match(candidate):
+        return candidate
+    return None
+
+
+def parse_channel_id(url: str) -> Optional[str]:
+    """
+    Extrai o ID (UC…) de uma URL /channel/ sem acessar a rede.
+    URLs de handle ou personalizadas retornam None e precisam ser resolvidas.
+    """
+    if not url:
+        return None
+    if CHANNEL_ID_PATTERN.match(url.strip()):
+        return url.strip()
+
+    host, segments, _ = _split_url(url)
+    if host not in YOUTUBE_HOSTS:
+        return None
+    if len(segments) >= 2 and segments[0] == "channel" and CHANNEL_ID_PATTERN.match(segments[1]):
+        return segments[1]
+    return None
+
+
+def normalize_channel_url(url: str) -> Optional[str]:
+    """
+    Gera uma chave estável para uma URL de canal, usada para memorizar a
+    resolução do ID. Ignora esquema, www, abas (/videos, /playlists...) e
+    diferenças de maiúsculas, que não mudam o canal de destino.
+
+    Só handles, /c/<nome>, /user/<nome> e nomes personalizados antigos
+    (youtube.com/<nome>) têm chave. Para as demais URLs (vídeos, playlists,
+    /channel/ malformado...) retorna None: cada uma pode levar a um canal
+    diferente, então a resolução não é memorizada.
+    """
+    if not url:
+        return None
+    handle = parse_channel_handle(url)
+    if handle:
+        return f"youtube.com/{handle.lower()}"
+
+    host, segments, _ = _split_url(url)
+    if host not in YOUTUBE_HOSTS or not segments:
+        return None
+    if segments[0] in ("c", "user"):
+        if len(segments) >= 2 and CUSTOM_NAME_PATTERN.match(segments[1]):
+            return f"youtube.com/{segments[0]}/{segments[1].lower()}"
+        return None
+    if segments[0].lower() in RESERVED_PATHS or not CUSTOM_NAME_PATTERN.match(segments[0]):
+        return None
+    return f"youtube.com/{segments[0].lower()}"
+
+
+def parse_channel_handle(url: str) -> Optional[str]:
+    """Extrai o handle (@nome) de uma URL de canal, se houver."""
+    if not url:
+        return None
+    if HANDLE_PATTERN.match(url.strip()):
+        return url.strip()
+
+    host, segments, _ = _split_url(url)
+    if host not in YOUTUBE_HOSTS or not segments:
+        return None
+    if HANDLE_PATTERN.match(segments[0]):
+        return segments[0]
+    return None
\ No newline at end of file
@@ -0,0 +1,102 @@
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+from app import models
+from app.core.cache import YouTubeCache
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.core.rate_limit import youtube_rate_limiter
+from app.db.session import SessionLocal
+from app.services.youtube import YouTubeService
+from app.worker.utils import run_async
+
+# Quantidade de vídeos recentes mostrada na página do canal
+_RECENT_VIDEOS_RESULTS = 12
+
+
+def _warm_targets(
+    youtube_service: YouTubeService, channel_id: str
+) -> List[Tuple[str, int, Callable[[], Awaitable[Any]]]]:
+    """
+    Entradas do cache lidas ao abrir um canal: (chave, segundos entre o
+    vencimento e a expiração no Redis, recarga forçada).
+    """
+    channel_url = f"https://www.youtube.com/channel/{channel_id}"
+    methods = (
+        (YouTubeService.get_channel_info, (channel_url,)),
+        (YouTubeService._load_recent_entries, (channel_id, _RECENT_VIDEOS_RESULTS)),
+        (YouTubeService.fetch_playlists, (channel_url,)),
+    )
+    targets = []
+    for method, args in methods:
+        key = method.cache_key(youtube_service, *args)
+        if key is None:
+            continue
+        # Com stale-while-revalidate, a entrada vence antes de sair do Redis
+        stale_margin = method.ttl - method.soft_ttl if method.soft_ttl else 0
+        refresh = getattr(youtube_service, method.__name__)
+        targets.append((
+            key,
+            stale_margin,
+            lambda refresh=refresh, args=args: refresh(*args, force_refresh=True)
+        ))
+    return targets
+
+
+async def _warm_channels(channel_ids: List[str]) -> Dict[str, int]:
+    """
+    Recarrega as entradas dos canais que estão ausentes ou perto de vencer,
+    dos canais mais acessados para os menos, até esgotar o orçamento.
+    """
+    youtube_service = YouTubeService()
+    result = {"channels": len(channel_ids), "refreshed": 0, "failed": 0, "deferred": 0}
+
+    scores = await YouTubeCache.get_channel_access_scores(channel_ids)
+    ordered = sorted(channel_ids, key=lambda channel_id: scores[channel_id], reverse=True)
+    targets = [target for channel_id in ordered for target in _warm_targets(youtube_service, channel_id)]
+    ttls = await YouTubeCache.get_ttls(key for key, _, _ in targets)
+
+    budget = settings.CACHE_WARMING_BUDGET
+    for key, stale_margin, refresh in targets:
+        ttl = ttls[key]
+        if ttl == -1 or ttl - stale_margin > settings.CACHE_WARMING_LEAD_TIME:
+            continue
+        # O aquecimento cede o orçamento de tráfego às leituras da API
+        if budget <= 0 or await youtube_rate_limiter.remaining("channel") < settings.MONITORING_RATE_RESERVE:
+            result["deferred"] += 1
+            continue
+        budget -= 1
+        try:
+            await refresh()
+            result["refreshed"] += 1
+        except Exception:
+            result["failed"] += 1
+
+    await YouTubeCache.decay_channel_access(settings.CACHE_ACCESS_DECAY)
+    return result
+
+
+@celery_app.task(name="warm_monitoring_cache")
+def warm_monitoring_cache():
+    """
+    Mantém aquecido o cache dos canais com monitoramento ativo, para que a
+    abertura de um canal monitorado quase sempre encontre os dados prontos.
+    """
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(models.YoutubeChannel.youtube_id)
+            .join(models.YoutubeMonitoring, models.YoutubeMonitoring.channel_id == models.YoutubeChannel.id)
+            .filter(models.YoutubeMonitoring.status == "active")
+            .distinct()
+            .all()
+        )
+    finally:
+        db.close()
+    return run_async(_warm_channels([row.youtube_id for row in rows]))
+
+
+@celery_app.task(name="sweep_cache_tags")
+def sweep_cache_tags():
+    """
+    Remove das tags do cache as chaves que já expiraram.
+    """
+    return run_async(YouTubeCache.sweep_tags())
@@ -1,9 +1,159 @@
+import yt_dlp
+from contextlib import aclosing
 from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set
 from sqlalchemy.orm import Session
 from app import crud, models
 from app.db.session import SessionLocal
+from app.core.cache import YouTubeCache
 from app.core.celery_app import celery_app
-from app.services.youtube_service import YouTubeService
+from app.core.circuit_breaker import channel_circuit_breaker
+from app.core.config import settings
+from app.core.rate_limit import is_throttling_error, youtube_rate_limiter
+from app.services.youtube import YouTubeService
+from app.worker.utils import run_async
+
+
+def _get_known_video_ids(
+    db: Session, monitoring: models.YoutubeMonitoring, latest_video_id: Optional[str]
+) -> Set[str]:
+    """
+    Retorna os IDs do YouTube que marcam onde a leitura do feed deve parar.
+    Usa o último vídeo registrado no cache (`latest_video_id`) e, na falta
+    dele, os vídeos já vinculados ao monitoramento.
+    """
+    if latest_video_id:
+        return {latest_video_id}
+
+    rows = (
+        db.query(models.YoutubeVideo.video_id)
+        .join(models.MonitoringVideo, models.MonitoringVideo.video_id == models.YoutubeVideo.id)
+        .filter(models.MonitoringVideo.monitoring_id == monitoring.id)
+        .all()
+    )
+    return {row.video_id for row in rows}
+
+
+async def _enrich_videos(
+    youtube_service: YouTubeService, videos: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Completa os vídeos do feed, que não trazem data de publicação, com as
+    informações individuais de cada vídeo, consultadas em lote.
+    """
+    videos_info = await youtube_service.get_videos_info(video["id"] for video in videos)
+
+    enriched = []
+    for video in videos:
+        info = videos_info.get(video["id"])
+        if info:
+            video = {
+                **video,
+                "title": info["title"] or video["title"],
+                "published_at": info["published_at"],
+                "is_live": info["is_live"] or False,
+            }
+        enriched.append(video)
+    return enriched
+
+
+def _register_new_videos(
+    db: Session,
+    monitoring: models.YoutubeMonitoring,
+    channel: models.YoutubeChannel,
+    videos: List[Dict[str, Any]]
+) -> None:
+    """
+    Registra os vídeos descobertos e os vincula ao monitoramento usando uma
+    consulta por tabela em vez de uma por vídeo.
+    """
+    # Do mais antigo para o mais novo, preservando a ordem de publicação
+    db_videos = {
+        db_video.video_id: db_video
+        for db_video in crud.crud_youtube.upsert_videos(
+            db,
+            channel_id=channel.id,
+            videos=[{**video, "video_id": video["id"]} for video in reversed(videos)],
+            commit=False
+        )
+    }
+
+    linked_ids = {
+        row.video_id
+        for row in db.query(models.MonitoringVideo.video_id).filter(
+            models.MonitoringVideo.monitoring_id == monitoring.id,
+            models.MonitoringVideo.video_id.in_([v.id for v in db_videos.values()])
+        ).all()
+    }
+
+    for video in reversed(videos):
+        db_video = db_videos[video["id"]]
+        if db_video.id in linked_ids:
+            continue
+        db.add(models.MonitoringVideo(
+            monitoring_id=monitoring.id,
+            video_id=db_video.id,
+            created_by=monitoring.created_by,
+        ))
+        linked_ids.add(db_video.id)
+
+
+async def _discover_new_videos(
+    db: Session,
+    youtube_service: YouTubeService,
+    monitoring: models.YoutubeMonitoring,
+    channel: models.YoutubeChannel,
+    known_video_ids: Set[str]
+) -> Optional[str]:
+    """
+    Lê o feed do canal página a página, do mais novo ao mais antigo, e
+    persiste os vídeos novos de cada página assim que ela chega. A leitura
+    para no primeiro vídeo conhecido, sem buscar o restante do feed, ou ao
+    atingir MONITORING_DISCOVERY_MAX_RESULTS. Retorna o ID do vídeo mais
+    novo encontrado, se houver.
+    """
+    max_results = settings.MONITORING_DISCOVERY_MAX_RESULTS
+    newest_video_id = None
+    discovered = 0
+
+    pages = youtube_service.iter_recent_videos(
+        channel.youtube_id, page_size=max_results, known_video_ids=known_video_ids
+    )
+    async with aclosing(pages):
+        async for page in pages:
+            videos = page["items"][:max_results - discovered]
+            if videos:
+                videos = await _enrich_videos(youtube_service, videos)
+                _register_new_videos(db, monitoring, channel, videos)
+                db.commit()
+                newest_video_id = newest_video_id or videos[0]["id"]
+                discovered += len(videos)
+
+            if discovered >= max_results:
+                break
+
+    return newest_video_id
+
+
+def _is_channel_error(error: Exception) -> bool:
+    """
+    Indica se a falha é do próprio canal (removido, privado, bloqueado na
+    região), e não um bloqueio por tráfego ou uma falha transitória.
+    """
+    return isinstance(error, yt_dlp.utils.DownloadError) and not is_throttling_error(error)
+
+
+def _apply_circuit_state(monitoring: models.YoutubeMonitoring, state: Dict[str, Any]) -> None:
+    """Reflete no monitoramento o estado do disjuntor do canal."""
+    monitoring.consecutive_failures = state["failures"]
+    if state["open_until"] and state["open_until"] > datetime.now().timestamp():
+        open_until = datetime.fromtimestamp(state["open_until"])
+        monitoring.circuit_open_until = open_until
+        # Não adianta verificar de novo antes de o circuito fechar
+        if not monitoring.next_check_at or monitoring.next_check_at.replace(tzinfo=None) < open_until:
+            monitoring.next_check_at = open_until
+    else:
+        monitoring.circuit_open_until = None
 
 
 @celery_app.task(name="check_monitoring_videos")
@@ -12,6 +162,7 @@ def check_monitoring_videos():
     Verifica os vídeos dos monitoramentos ativos.
     """
     db = SessionLocal()
+    youtube_service = YouTubeService()
     try:
         # Busca monitoramentos ativos que precisam ser verificados
         monitorings = db.query(models.YoutubeMonitoring).filter(
@@ -19,7 +170,16 @@ def check_monitoring_videos():
             models.YoutubeMonitoring.next_check_at <= datetime.now(),
         ).all()
 
+        # Últimos vídeos conhecidos de todos os monitoramentos em uma só leitura
+        latest_video_ids = run_async(YouTubeCache.get_latest_video_ids(m.id for m in monitorings))
+
         for monitoring in monitorings:
+            # Verificações periódicas têm baixa prioridade: se o orçamento de
+            # tráfego estiver no fim, ficam para o próximo ciclo
+            if run_async(youtube_rate_limiter.remaining("channel")) < settings.MONITORING_RATE_RESERVE:
+                break
+
+            channel = None
             try:
                 # Busca o canal
                 channel = db.query(models.YoutubeChannel).filter(
@@ -29,39 +189,22 @@ def check_monitoring_videos():
                 if not channel:
                     continue
 
-                # Busca os vídeos do canal
-                youtube_service = YouTubeService(api_key=decrypted_api_key)
-                videos = youtube_service.get_recent_videos(channel.channel_url)
-
-                # Processa os vídeos
-                for video in videos:
-                    # Verifica se o vídeo já existe
-                    db_video = db.query(models.YoutubeVideo).filter(
-                        models.YoutubeVideo.video_id == video["video_id"]
-                    ).first()
-
-                    if db_video:
-                        # Atualiza o vídeo
-                        for key, value in video.items():
-                            setattr(db_video, key, value)
-                    else:
-                        # Cria o vídeo
-                        db_video = models.YoutubeVideo(**video, channel_id=channel.id)
-                        db.add(db_video)
-
-                    # Verifica se o vídeo já está no monitoramento
-                    monitoring_video = db.query(models.MonitoringVideo).filter(
-                        models.MonitoringVideo.monitoring_id == monitoring.id,
-                        models.MonitoringVideo.video_id == db_video.id,
-                    ).first()
-
-                    if not monitoring_video:
-                        # Adiciona o vídeo ao monitoramento
-                        monitoring_video = models.MonitoringVideo(
-                            monitoring_id=monitoring.id,
-                            video_id=db_video.id,
-                        )
-                        db.add(monitoring_video)
+                # Canais que vêm falhando seguidamente ficam suspensos
+                if not run_async(channel_circuit_breaker.allow(channel.youtube_id)):
+                    _apply_circuit_state(monitoring, run_async(channel_circuit_breaker.state(channel.youtube_id)))
+                    db.commit()
+                    continue
+
+                # Busca apenas os vídeos publicados depois do último conhecido
+                known_video_ids = _get_known_video_ids(db, monitoring, latest_video_ids.get(monitoring.id))
+                newest_video_id = run_async(_discover_new_videos(
+                    db, youtube_service, monitoring, channel, known_video_ids
+                ))
+
+                run_async(channel_circuit_breaker.record_success(channel.youtube_id))
+                monitoring.consecutive_failures = 0
+                monitoring.last_error = None
+                monitoring.circuit_open_until = None
 
                 # Atualiza o último check
                 monitoring.last_check_at = datetime.now()
@@ -73,8 +216,20 @@ def check_monitoring_videos():
 
                 db.commit()
 
+                # Só avança o marcador depois que todas as páginas foram persistidas
+                if newest_video_id:
+                    run_async(YouTubeCache.set_latest_video_id(monitoring.id, newest_video_id))
+
             except Exception as e:
                 db.rollback()
+                try:
+                    monitoring.last_error = str(e) or type(e).__name__
+                    if channel and _is_channel_error(e):
+                        state = run_async(channel_circuit_breaker.record_failure(channel.youtube_id))
+                        _apply_circuit_state(monitoring, state)
+                    db.commit()
+                except Exception:
+                    db.rollback()
                 continue
 
     except Exception as e:
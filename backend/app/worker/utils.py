@@ -0,0 +1,22 @@
+import asyncio
+from typing import Any, Awaitable
+
+from app.core.cache import wait_background_refreshes
+from app.core.redis_pool import disconnect_all
+
+
+def run_async(coro: Awaitable[Any]) -> Any:
+    """
+    Executa uma corrotina dentro de uma task síncrona do Celery.
+    """
+    async def _runner():
+        try:
+            return await coro
+        finally:
+            # O loop é fechado ao final: as recargas do cache iniciadas na
+            # tarefa precisam terminar antes, ou seriam canceladas
+            await wait_background_refreshes()
+            # As conexões do Redis ficam presas ao loop; descarta antes de fechá-lo
+            await disconnect_all()
+
+    return asyncio.run(_runner())
\ No newline at end of file
@@ -0,0 +1,139 @@
+"""
+Benchmark de vazão das rotinas de extração e do worker de monitoramento,
+sem acessar o YouTube.
+
+Usa o extrator sintético (YOUTUBE_EXTRACTOR_BACKEND=synthetic), com
+latência e falhas configuráveis. Requer o Redis em execução.
+
+Exemplos:
+    python benchmark_extraction.py --channels 50 --latency 0.2
+    SQLALCHEMY_DATABASE_URI=sqlite:///benchmark.db python benchmark_extraction.py --worker
+"""
+import argparse
+import asyncio
+import os
+import time
+from contextlib import aclosing
+from datetime import datetime
+from typing import List
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark das extrações do YouTube")
+    parser.add_argument("--channels", type=int, default=20, help="Canais simulados")
+    parser.add_argument("--videos", type=int, default=200, help="Vídeos consultados em lote")
+    parser.add_argument("--latency", type=float, default=0.1, help="Latência simulada por extração (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fração de extrações com erro")
+    parser.add_argument("--worker", action="store_true", help="Executa também o worker de monitoramento")
+    return parser.parse_args()
+
+
+args = parse_args()
+
+# As configurações são lidas na importação do app, então precisam vir antes
+os.environ["YOUTUBE_EXTRACTOR_BACKEND"] = "synthetic"
+os.environ.setdefault("YOUTUBE_FIXTURE_LATENCY", str(args.latency))
+os.environ.setdefault("YOUTUBE_FIXTURE_ERROR_RATE", str(args.error_rate))
+# Sem limite de tráfego: o objetivo é medir a vazão do próprio serviço
+os.environ.setdefault("YOUTUBE_RATE_LIMITS", '{"default": 1000000}')
+os.environ.setdefault("YOUTUBE_RATE_LIMIT_BURST", "1000000")
+
+from app.core.cache import redis  # noqa: E402
+from app.core.executor import extraction_executor  # noqa: E402
+from app.services.youtube import YouTubeService  # noqa: E402
+
+
+def report(label: str, started_at: float, operations: int) -> None:
+    elapsed = time.monotonic() - started_at
+    print(f"{label}: {operations} operações em {elapsed:.2f}s ({operations / elapsed:.1f} op/s)")
+
+
+async def discover(service: YouTubeService, channel_id: str, known_video_ids: List[str]) -> List[dict]:
+    """Lê o feed como o worker de monitoramento: até 50 vídeos, parando no primeiro conhecido."""
+    videos = []
+    pages = service.iter_recent_videos(channel_id, page_size=50, known_video_ids=known_video_ids)
+    async with aclosing(pages):
+        async for page in pages:
+            videos.extend(page["items"][:50 - len(videos)])
+            if len(videos) >= 50:
+                break
+    return videos
+
+
+async def benchmark_service():
+    service = YouTubeService()
+    channel_ids = [service.extractor.channel_id_for(f"@benchmark{i}") for i in range(args.channels)]
+
+    # Descoberta completa: primeira verificação de cada canal
+    started_at = time.monotonic()
+    feeds = await asyncio.gather(*[discover(service, channel_id, []) for channel_id in channel_ids])
+    report("Descoberta inicial", started_at, len(channel_ids))
+
+    # Verificações incrementais: param no primeiro vídeo conhecido
+    started_at = time.monotonic()
+    await asyncio.gather(*[
+        discover(service, channel_id, [feed[0]["id"]])
+        for channel_id, feed in zip(channel_ids, feeds) if feed
+    ])
+    report("Verificação incremental", started_at, len(channel_ids))
+
+    # Informações de vídeos em lote, sem cache
+    video_ids = [video["id"] for feed in feeds for video in feed][:args.videos]
+    await redis.delete(*[f"youtube:video:{video_id}" for video_id in video_ids])
+    started_at = time.monotonic()
+    failures = 0
+    async for result in service.iter_videos_info(video_ids, rate_per_second=1000000):
+        failures += result["error"] is not None
+    report(f"Vídeos em lote ({failures} falhas)", started_at, len(video_ids))
+
+    print(f"Pool de extração: {extraction_executor.stats()}")
+    await redis.connection_pool.disconnect()
+
+
+def benchmark_worker():
+    from app import models
+    from app.db.base_class import Base
+    from app.db.session import SessionLocal, engine
+    from app.worker.monitoring import check_monitoring_videos
+
+    extractor = YouTubeService().extractor
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        user = db.query(models.User).first()
+        if not user:
+            user = models.User(name="Benchmark", email="benchmark@holyvoice.com", hashed_password="-")
+            db.add(user)
+            db.flush()
+        for i in range(args.channels):
+            channel = models.YoutubeChannel(
+                channel_url=f"https://www.youtube.com/@benchmark{i}",
+                youtube_id=extractor.channel_id_for(f"@benchmark{i}"),
+                channel_name=f"Benchmark {i}",
+                api_key="-",
+                created_by=user.id
+            )
+            db.add(channel)
+            db.flush()
+            db.add(models.YoutubeMonitoring(
+                channel_id=channel.id,
+                name=f"Benchmark {i}",
+                status=models.MonitoringStatus.active,
+                is_continuous=True,
+                interval_time=10,
+                created_by=user.id,
+                next_check_at=datetime.now()
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+    started_at = time.monotonic()
+    check_monitoring_videos()
+    report("Worker de monitoramento", started_at, args.channels)
+
+
+if __name__ == "__main__":
+    asyncio.run(benchmark_service())
+    if args.worker:
+        benchmark_worker()
\ No newline at end of file
@@ -0,0 +1,223 @@
+"""
+Benchmark das consultas mais frequentes com e sem os índices de
+add_hot_path_indexes, usando EXPLAIN ANALYZE sobre uma massa grande de dados.
+
+Requer um Postgres com as migrações aplicadas (alembic upgrade head) e
+dedicado ao benchmark: os dados são inseridos nas tabelas do app e, na
+medição "sem índices", os índices são removidos dentro de uma transação
+desfeita ao final, o que bloqueia as tabelas enquanto isso.
+
+Exemplos:
+    python benchmark_queries.py --channels 200 --videos-per-channel 5000
+    python benchmark_queries.py --skip-seed
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+
+from sqlalchemy import func, select, text
+
+from app import models
+from app.db.session import engine
+
+# Índices e restrições criados para os caminhos quentes, removidos na medição "antes"
+HOT_PATH_INDEXES = (
+    "ALTER TABLE youtube_video DROP CONSTRAINT uq_youtube_video_channel_video",
+    "ALTER TABLE monitoring_video DROP CONSTRAINT uq_monitoring_video_monitoring_video",
+    "DROP INDEX ix_monitoring_video_monitoring_status",
+    "DROP INDEX ix_youtube_channel_access_user_channel_view",
+    "DROP INDEX ix_youtube_monitoring_active_next_check",
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="EXPLAIN das consultas com e sem os índices dos caminhos quentes")
+    parser.add_argument("--users", type=int, default=500, help="Usuários com acesso aos canais")
+    parser.add_argument("--channels", type=int, default=100, help="Canais simulados")
+    parser.add_argument("--videos-per-channel", type=int, default=2000, help="Vídeos por canal")
+    parser.add_argument("--skip-seed", action="store_true", help="Reaproveita a massa de uma execução anterior")
+    return parser.parse_args()
+
+
+def seed(connection, args) -> None:
+    """Insere a massa de dados com generate_series, em poucas instruções."""
+    params = {
+        "users": args.users,
+        "channels": args.channels,
+        "videos": args.videos_per_channel,
+    }
+    statements = (
+        # Usuários
+        """
+        INSERT INTO "user" (name, email, hashed_password, is_active, is_superuser)
+        SELECT 'Benchmark ' || n, 'benchmark' || n || '@holyvoice.com', '-', true, false
+        FROM generate_series(1, :users) AS n
+        ON CONFLICT (email) DO NOTHING
+        """,
+        # Canais
+        """
+        INSERT INTO youtube_channel (channel_url, youtube_id, channel_name, api_key, created_by)
+        SELECT 'https://www.youtube.com/@benchmark' || n, 'UCbenchmark' || lpad(n::text, 13, '0'),
+               'Benchmark ' || n, '-', (SELECT min(id) FROM "user")
+        FROM generate_series(1, :channels) AS n
+        """,
+        # Vídeos de cada canal
+        """
+        INSERT INTO youtube_video (channel_id, video_id, title, thumbnail_url, is_live, published_at)
+        SELECT c.id, 'v' || c.id || '_' || n, 'Vídeo ' || n, NULL, false, now() - n * interval '1 hour'
+        FROM youtube_channel c, generate_series(1, :videos) AS n
+        WHERE c.channel_url LIKE 'https://www.youtube.com/@benchmark%'
+        """,
+        # Cada usuário vê uma fração dos canais
+        """
+        INSERT INTO youtube_channel_access (channel_id, user_id, can_view, can_edit, can_delete, created_by)
+        SELECT c.id, u.id, (c.id + u.id) % 3 <> 0, false, false, u.id
+        FROM youtube_channel c, "user" u
+        WHERE c.channel_url LIKE 'https://www.youtube.com/@benchmark%'
+          AND u.email LIKE 'benchmark%@holyvoice.com'
+          AND (c.id * 7 + u.id) % 10 = 0
+        """,
+        # Um monitoramento por canal; um terço deles ativo. Os status vão como
+        # literais soltos para valerem tanto para coluna enum quanto varchar
+        """
+        INSERT INTO youtube_monitoring (channel_id, name, is_continuous, interval_time, status, created_by, next_check_at)
+        SELECT c.id, 'Benchmark ' || c.id, true, 10, 'active',
+               c.created_by, now() - (c.id % 60) * interval '1 minute'
+        FROM youtube_channel c
+        WHERE c.channel_url LIKE 'https://www.youtube.com/@benchmark%' AND c.id % 3 = 0
+        """,
+        """
+        INSERT INTO youtube_monitoring (channel_id, name, is_continuous, interval_time, status, created_by, next_check_at)
+        SELECT c.id, 'Benchmark ' || c.id, true, 10, 'paused',
+               c.created_by, now() - (c.id % 60) * interval '1 minute'
+        FROM youtube_channel c
+        WHERE c.channel_url LIKE 'https://www.youtube.com/@benchmark%' AND c.id % 3 <> 0
+        """,
+        # Todos os vídeos do canal vinculados ao seu monitoramento; um quarto já processado
+        """
+        INSERT INTO monitoring_video (monitoring_id, video_id, status, created_by)
+        SELECT m.id, v.id, 'completed', m.created_by
+        FROM youtube_monitoring m
+        JOIN youtube_video v ON v.channel_id = m.channel_id
+        WHERE m.name LIKE 'Benchmark %' AND v.id % 4 = 0
+        """,
+        """
+        INSERT INTO monitoring_video (monitoring_id, video_id, status, created_by)
+        SELECT m.id, v.id, 'pending', m.created_by
+        FROM youtube_monitoring m
+        JOIN youtube_video v ON v.channel_id = m.channel_id
+        WHERE m.name LIKE 'Benchmark %' AND v.id % 4 <> 0
+        """,
+    )
+    started_at = time.monotonic()
+    for statement in statements:
+        connection.execute(text(statement), params)
+    connection.execute(text("ANALYZE"))
+    print(f"Massa de dados inserida em {time.monotonic() - started_at:.1f}s")
+
+
+def hot_queries(connection):
+    """As consultas dos caminhos quentes, como o app as emite."""
+    video = connection.execute(
+        select(models.YoutubeVideo.video_id, models.YoutubeVideo.channel_id)
+        .order_by(models.YoutubeVideo.id.desc()).limit(1)
+    ).first()
+    monitoring_id = connection.scalar(select(func.max(models.YoutubeMonitoring.id)))
+    access = connection.execute(
+        select(models.YoutubeChannelAccess.user_id, models.YoutubeChannelAccess.channel_id)
+        .order_by(models.YoutubeChannelAccess.id.desc()).limit(1)
+    ).first()
+    video_ids = connection.scalars(
+        select(models.YoutubeVideo.id).filter(models.YoutubeVideo.channel_id == video.channel_id).limit(50)
+    ).all()
+
+    return {
+        # CRUDYoutube.get_video_by_youtube_id
+        "youtube_video por (video_id, channel_id)": select(models.YoutubeVideo).filter(
+            models.YoutubeVideo.video_id == video.video_id,
+            models.YoutubeVideo.channel_id == video.channel_id
+        ).limit(1),
+        # _register_new_videos: vínculos já existentes de uma página do feed
+        "monitoring_video por (monitoring_id, video_id)": select(models.MonitoringVideo.video_id).filter(
+            models.MonitoringVideo.monitoring_id == monitoring_id,
+            models.MonitoringVideo.video_id.in_(video_ids)
+        ),
+        # CRUDMonitoring.get_with_details: vídeos processados
+        "monitoring_video por (monitoring_id, status)": select(func.count(models.MonitoringVideo.id)).filter(
+            models.MonitoringVideo.monitoring_id == monitoring_id,
+            models.MonitoringVideo.status == models.VideoProcessingStatus.completed
+        ),
+        # CRUDYoutube.user_can_access_channel
+        "youtube_channel_access por (user_id, channel_id, can_view)": select(models.YoutubeChannelAccess).filter(
+            models.YoutubeChannelAccess.channel_id == access.channel_id,
+            models.YoutubeChannelAccess.user_id == access.user_id,
+            models.YoutubeChannelAccess.can_view == True
+        ).limit(1),
+        # check_monitoring_videos
+        "youtube_monitoring ativos com verificação vencida": select(models.YoutubeMonitoring).filter(
+            models.YoutubeMonitoring.status == "active",
+            models.YoutubeMonitoring.next_check_at <= datetime.now()
+        ),
+    }
+
+
+def explain(connection, statement):
+    """Executa EXPLAIN ANALYZE e retorna (tempo em ms, nós do plano)."""
+    compiled = statement.compile(connection, compile_kwargs={"literal_binds": True})
+    plan = connection.scalar(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {compiled}"))
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    plan = plan[0]
+
+    nodes = []
+
+    def walk(node):
+        relation = node.get("Index Name") or node.get("Relation Name")
+        nodes.append(f"{node['Node Type']}({relation})" if relation else node["Node Type"])
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan["Plan"])
+    return plan["Execution Time"], nodes
+
+
+def measure(connection, queries):
+    # Duas execuções: a primeira aquece o cache de páginas do Postgres
+    results = {}
+    for label, statement in queries.items():
+        explain(connection, statement)
+        results[label] = explain(connection, statement)
+    return results
+
+
+def main():
+    args = parse_args()
+    with engine.begin() as connection:
+        if not args.skip_seed:
+            seed(connection, args)
+
+    with engine.connect() as connection:
+        queries = hot_queries(connection)
+        # hot_queries já abriu uma transação implícita; encerra antes da medição
+        connection.rollback()
+
+        transaction = connection.begin()
+        for statement in HOT_PATH_INDEXES:
+            connection.execute(text(statement))
+        before = measure(connection, queries)
+        transaction.rollback()
+
+        with connection.begin():
+            after = measure(connection, queries)
+
+    for label in queries:
+        before_ms, before_plan = before[label]
+        after_ms, after_plan = after[label]
+        print(f"\n{label}")
+        print(f"  antes:  {before_ms:9.3f} ms  {' > '.join(before_plan)}")
+        print(f"  depois: {after_ms:9.3f} ms  {' > '.join(after_plan)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import os
+
+import fakeredis
+import pytest
+
+# Settings exige as variáveis do Postgres; os testes não abrem conexões
+os.environ.setdefault("POSTGRES_SERVER", "localhost")
+os.environ.setdefault("POSTGRES_USER", "postgres")
+os.environ.setdefault("POSTGRES_PASSWORD", "postgres")
+os.environ.setdefault("POSTGRES_DB", "holyvoice")
+
+
+@pytest.fixture
+def db():
+    """Sessão em um SQLite em memória com todas as tabelas do app."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    import app.models  # noqa: F401
+    from app.db.base_class import Base
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def redis_server():
+    """Servidor Redis em memória; `connected = False` simula uma queda."""
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def fake_redis(monkeypatch, redis_server):
+    """
+    Troca os clientes do Redis por um servidor em memória, compartilhado
+    entre o cliente de texto e o binário, e esvazia o cache L1.
+    """
+    from app.core import cache, circuit_breaker, rate_limit, singleflight
+
+    server = redis_server
+    client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    binary_client = fakeredis.FakeAsyncRedis(server=server, decode_responses=False)
+    for module in (cache, circuit_breaker, rate_limit, singleflight):
+        monkeypatch.setattr(module, "redis", client)
+    monkeypatch.setattr(cache, "redis_binary", binary_client)
+    cache.local_cache.clear()
+    yield client
+    cache.local_cache.clear()
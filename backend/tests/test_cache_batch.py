@@ -0,0 +1,46 @@
+import asyncio
+
+from app.core import cache
+from app.core.cache import TAG_PREFIX, YouTubeCache
+
+
+def test_set_many_applies_per_key_ttls_and_tags(fake_redis):
+    async def scenario():
+        await YouTubeCache.set_many(
+            {"youtube:video:v1": {"n": 1}, "youtube:video:v2": {"n": 2}},
+            expire=600,
+            ttls={"youtube:video:v2": 60},
+            tags={"youtube:video:v1": ["channel:UC1"]},
+        )
+        return (
+            await fake_redis.ttl("youtube:video:v1"),
+            await fake_redis.ttl("youtube:video:v2"),
+            await fake_redis.smembers(f"{TAG_PREFIX}:channel:UC1"),
+        )
+
+    ttl_1, ttl_2, members = asyncio.run(scenario())
+
+    assert 590 < ttl_1 <= 600
+    assert 50 < ttl_2 <= 60
+    assert members == {"youtube:video:v1"}
+
+
+def test_get_many_mixes_memory_and_redis_and_skips_missing_keys(fake_redis):
+    async def scenario():
+        await YouTubeCache.set_many({"youtube:video:v1": {"n": 1}, "youtube:video:v2": {"n": 2}})
+        cache.local_cache.delete("youtube:video:v2")
+        return await YouTubeCache.get_many(
+            ["youtube:video:v1", "youtube:video:v2", "youtube:video:v3", "youtube:video:v1"]
+        )
+
+    assert asyncio.run(scenario()) == {"youtube:video:v1": {"n": 1}, "youtube:video:v2": {"n": 2}}
+
+
+def test_get_many_without_redis_returns_what_is_in_memory(fake_redis, redis_server):
+    async def scenario():
+        await YouTubeCache.set_many({"youtube:video:v1": {"n": 1}, "youtube:video:v2": {"n": 2}})
+        cache.local_cache.delete("youtube:video:v2")
+        redis_server.connected = False
+        return await YouTubeCache.get_many(["youtube:video:v1", "youtube:video:v2"])
+
+    assert asyncio.run(scenario()) == {"youtube:video:v1": {"n": 1}}
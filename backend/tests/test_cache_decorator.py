@@ -0,0 +1,156 @@
+import asyncio
+
+import pytest
+
+from app.core.cache import YouTubeCache, cached
+
+
+class Missing(Exception):
+    pass
+
+
+class Service:
+    def __init__(self, results):
+        self.results = list(results)
+        self.calls = 0
+
+    @cached("test", ttl=60, key=lambda item_id: item_id, tags=lambda result, item_id: [f"item:{item_id}"])
+    async def load(self, item_id):
+        self.calls += 1
+        return self.results.pop(0)
+
+    @cached("test_swr", ttl=60, soft_ttl=30, key=lambda item_id: item_id)
+    async def load_swr(self, item_id):
+        self.calls += 1
+        return self.results.pop(0)
+
+    @cached(
+        "test_negative",
+        ttl=60,
+        key=lambda item_id: item_id,
+        tags=lambda result, item_id: [f"item:{item_id}"],
+        negative_ttl=30,
+        negative_exceptions=(Missing,)
+    )
+    async def find(self, item_id):
+        self.calls += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+async def _outcome(call):
+    try:
+        return await call
+    except Exception as e:
+        return type(e).__name__, str(e)
+
+
+def test_cached_value_is_served_without_running_the_method(fake_redis):
+    service = Service(["a", "b"])
+
+    async def scenario():
+        return [await service.load("x"), await service.load("x"), await service.load("y")]
+
+    assert asyncio.run(scenario()) == ["a", "a", "b"]
+    assert service.calls == 2
+
+
+def test_none_and_listed_failures_are_cached_negatively(fake_redis):
+    service = Service([None, Missing("Video unavailable"), ValueError("boom"), "late"])
+
+    async def scenario():
+        return [
+            await _outcome(service.find("none")),
+            await _outcome(service.find("none")),
+            await _outcome(service.find("gone")),
+            await _outcome(service.find("gone")),
+            # Só as exceções listadas são memorizadas
+            await _outcome(service.find("error")),
+            await _outcome(service.find("error")),
+        ]
+
+    assert asyncio.run(scenario()) == [
+        None,
+        None,
+        ("Missing", "Video unavailable"),
+        ("CachedFailureError", "Video unavailable"),
+        ("ValueError", "boom"),
+        "late",
+    ]
+    assert service.calls == 4
+
+
+def test_negative_entries_are_invalidated_with_their_tags(fake_redis):
+    service = Service([None, "found"])
+
+    async def scenario():
+        first = await service.find("x")
+        await YouTubeCache.invalidate_tags("item:x")
+        return first, await service.find("x")
+
+    assert asyncio.run(scenario()) == (None, "found")
+    assert service.calls == 2
+
+
+def test_force_refresh_rewrites_the_value_but_never_caches_a_failure(fake_redis):
+    service = Service(["a", "b", Missing("Video unavailable"), None])
+
+    async def scenario():
+        await service.find("x")
+        refreshed = await service.find("x", force_refresh=True)
+        with pytest.raises(Missing):
+            await service.find("x", force_refresh=True)
+        missing = await service.find("x", force_refresh=True)
+        return refreshed, missing, await service.find("x")
+
+    assert asyncio.run(scenario()) == ("b", None, "b")
+    assert service.calls == 4
+
+
+def test_use_cache_false_neither_reads_nor_writes(fake_redis):
+    service = Service(["a", "b", "c"])
+
+    async def scenario():
+        await service.load("x")
+        bypassed = await service.load("x", use_cache=False)
+        return bypassed, await service.load("x")
+
+    assert asyncio.run(scenario()) == ("b", "a")
+
+
+def test_redis_outage_runs_the_method_without_cache(fake_redis, redis_server):
+    redis_server.connected = False
+    service = Service(["a", "b", "c", "d"])
+
+    async def scenario():
+        return [
+            await service.load("x"),
+            await service.load_swr("x"),
+            await YouTubeCache.get_many(["youtube:test:x"]),
+        ]
+
+    assert asyncio.run(scenario()) == ["a", "b", {}]
+    assert service.calls == 2
+
+
+def test_background_refresh_finishes_before_a_worker_task_returns(fake_redis):
+    from app.worker.utils import run_async
+
+    service = Service(["fresh"])
+    key = Service.load_swr.cache_key(service, "x")
+    stale = {"__swr__": 1, "value": "stale", "soft_expires_at": 0, "delta": 0.0}
+
+    async def task():
+        await YouTubeCache.set_cache(key, stale, expire=60)
+        return await service.load_swr("x")
+
+    # O valor antigo é servido na hora e a recarga termina antes de o loop fechar
+    assert run_async(task()) == "stale"
+    assert service.calls == 1
+
+    async def after():
+        return await YouTubeCache.get_cache(key), await fake_redis.exists(f"{key}:refresh")
+
+    assert asyncio.run(after()) == ("fresh", 0)
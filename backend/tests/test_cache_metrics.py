@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+import yt_dlp
+
+from app.core import cache
+from app.core.metrics import CacheMetrics
+from app.services.extractors import BaseExtractor
+from app.services.youtube import YouTubeService
+
+
+class VideoExtractor(BaseExtractor):
+    """Extrai vídeos em memória; os ids em `missing` não existem."""
+
+    def __init__(self, missing=()):
+        self.missing = set(missing)
+        self.calls = 0
+
+    def extract_info(self, url, ydl_opts, process=True):
+        self.calls += 1
+        video_id = url.rsplit("=", 1)[-1]
+        if video_id in self.missing:
+            raise yt_dlp.utils.DownloadError("Video unavailable")
+        return {"id": video_id, "title": video_id, "channel_id": "UCaaaaaaaaaaaaaaaaaaaaaa"}
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    metrics = CacheMetrics()
+    monkeypatch.setattr(cache, "cache_metrics", metrics)
+    monkeypatch.setattr(cache, "_stats", dict.fromkeys(cache._stats, 0))
+    return metrics
+
+
+def _video_counters(metrics):
+    return metrics.snapshot()["families"]["video"]
+
+
+async def _collect(service, video_ids):
+    return [result async for result in service.iter_videos_info(video_ids)]
+
+
+def test_each_uncached_video_counts_one_miss(fake_redis, metrics):
+    service = YouTubeService(extractor=VideoExtractor())
+    video_ids = [f"v{i}" for i in range(6)]
+
+    asyncio.run(_collect(service, video_ids))
+    counters = _video_counters(metrics)
+    assert (counters["hits"], counters["misses"]) == (0, 6)
+    assert cache._stats["l1_misses"] == 6 and cache._stats["l2_misses"] == 6
+
+    asyncio.run(_collect(service, video_ids))
+    counters = _video_counters(metrics)
+    assert (counters["hits"], counters["misses"]) == (6, 6)
+    assert counters["hit_ratio"] == 0.5
+
+
+def test_negative_entries_are_reported_apart_from_hits(fake_redis, metrics):
+    extractor = VideoExtractor(missing={"gone"})
+    service = YouTubeService(extractor=extractor)
+
+    first = asyncio.run(_collect(service, ["gone", "ok"]))
+    second = asyncio.run(_collect(service, ["gone", "ok"]))
+
+    assert extractor.calls == 2
+    assert all(result["error"] for result in first + second if result["video_id"] == "gone")
+    counters = _video_counters(metrics)
+    assert (counters["hits"], counters["negative_hits"], counters["misses"]) == (1, 1, 2)
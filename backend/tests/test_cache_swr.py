@@ -0,0 +1,92 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from app.core import cache
+from app.core.cache import YouTubeCache, cached, wait_background_refreshes
+
+
+class Feed:
+    def __init__(self):
+        self.calls = 0
+
+    @cached("test_swr", ttl=600, soft_ttl=60, key=lambda feed_id: feed_id)
+    async def load(self, feed_id):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return f"v{self.calls}"
+
+
+def _draw(monkeypatch, value):
+    """Fixa o sorteio do vencimento antecipado: 0 nunca antecipa, perto de 1 sempre."""
+    monkeypatch.setattr(cache, "random", SimpleNamespace(random=lambda: value))
+
+
+async def _store(feed, soft_expires_in, delta=0.0):
+    key = Feed.load.cache_key(feed, "f")
+    envelope = {"__swr__": 1, "value": "old", "soft_expires_at": time.time() + soft_expires_in, "delta": delta}
+    await YouTubeCache.set_cache(key, envelope, expire=600)
+    return key
+
+
+def test_first_call_waits_for_the_load_and_stores_an_envelope(fake_redis, monkeypatch):
+    _draw(monkeypatch, 0.0)
+    feed = Feed()
+
+    async def scenario():
+        value = await feed.load("f")
+        stored = await YouTubeCache.get_cache(Feed.load.cache_key(feed, "f"))
+        return value, await feed.load("f"), stored
+
+    assert asyncio.run(scenario()) == ("v1", "v1", "v1")
+    assert feed.calls == 1
+
+
+def test_stale_value_is_served_while_one_refresh_runs(fake_redis, monkeypatch):
+    _draw(monkeypatch, 0.0)
+    feed = Feed()
+
+    async def scenario():
+        key = await _store(feed, soft_expires_in=-1)
+        served = await asyncio.gather(*(feed.load("f") for _ in range(5)))
+        await wait_background_refreshes()
+        return served, await feed.load("f"), await fake_redis.exists(f"{key}:refresh")
+
+    served, refreshed, lock_left = asyncio.run(scenario())
+
+    assert served == ["old"] * 5
+    assert refreshed == "v1"
+    assert feed.calls == 1
+    assert not lock_left
+
+
+def test_refresh_is_skipped_while_another_process_holds_the_lock(fake_redis, monkeypatch):
+    _draw(monkeypatch, 0.0)
+    feed = Feed()
+
+    async def scenario():
+        key = await _store(feed, soft_expires_in=-1)
+        await fake_redis.set(f"{key}:refresh", "other-process")
+        served = await feed.load("f")
+        await wait_background_refreshes()
+        return served
+
+    assert asyncio.run(scenario()) == "old"
+    assert feed.calls == 0
+
+
+def test_costly_entries_may_refresh_before_the_soft_expiry(fake_redis, monkeypatch):
+    feed = Feed()
+
+    async def scenario(draw):
+        _draw(monkeypatch, draw)
+        # Recarga que custou 10s, a 5s do vencimento
+        await _store(feed, soft_expires_in=5, delta=10.0)
+        served = await feed.load("f")
+        await wait_background_refreshes()
+        return served
+
+    assert asyncio.run(scenario(0.0)) == "old"
+    assert feed.calls == 0
+    assert asyncio.run(scenario(0.9)) == "old"
+    assert feed.calls == 1
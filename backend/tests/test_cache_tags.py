@@ -0,0 +1,64 @@
+import asyncio
+import json
+
+from app.core import cache
+from app.core.cache import TAG_PREFIX, YouTubeCache
+
+
+async def _fill():
+    await YouTubeCache.set_cache("youtube:channel:UC1", {"n": 1}, expire=600, tags=["channel:UC1"])
+    await YouTubeCache.set_cache("youtube:video:v1", {"n": 2}, expire=60, tags=["channel:UC1"])
+    await YouTubeCache.set_cache("youtube:channel:UC2", {"n": 3}, expire=600, tags=["channel:UC2"])
+
+
+def test_invalidating_a_tag_removes_only_its_keys(fake_redis):
+    async def scenario():
+        await _fill()
+        removed = await YouTubeCache.invalidate_tags("channel:UC1")
+        values = [
+            await YouTubeCache.get_cache(key)
+            for key in ("youtube:channel:UC1", "youtube:video:v1", "youtube:channel:UC2")
+        ]
+        return removed, values, await fake_redis.exists(f"{TAG_PREFIX}:channel:UC1")
+
+    removed, values, tag_left = asyncio.run(scenario())
+
+    assert removed == 2
+    assert values == [None, None, {"n": 3}]
+    assert not tag_left
+    assert cache.local_cache.get("youtube:channel:UC1") == (False, None)
+
+
+def test_tag_lives_at_least_as_long_as_its_keys(fake_redis):
+    async def scenario():
+        await _fill()
+        return await fake_redis.ttl(f"{TAG_PREFIX}:channel:UC1")
+
+    assert 590 < asyncio.run(scenario()) <= 600
+
+
+def test_invalidation_from_other_processes_clears_the_local_tier(fake_redis):
+    cache.local_cache.set("youtube:channel:UC1", {"n": 1})
+    cache.local_cache.set("youtube:channel:UC2", {"n": 2})
+
+    cache._apply_invalidation(json.dumps({"origin": cache._process_id, "keys": ["youtube:channel:UC2"]}))
+    cache._apply_invalidation(json.dumps({"origin": "other", "keys": ["youtube:channel:UC1"]}))
+
+    assert cache.local_cache.get("youtube:channel:UC1") == (False, None)
+    assert cache.local_cache.get("youtube:channel:UC2") == (True, {"n": 2})
+
+
+def test_sweep_drops_expired_members_and_empty_tags(fake_redis):
+    async def scenario():
+        await _fill()
+        # Simula o vencimento das chaves antes das tags
+        await fake_redis.delete("youtube:video:v1", "youtube:channel:UC2")
+        result = await YouTubeCache.sweep_tags(batch_size=1)
+        members = await fake_redis.smembers(f"{TAG_PREFIX}:channel:UC1")
+        return result, members, await fake_redis.exists(f"{TAG_PREFIX}:channel:UC2")
+
+    result, members, empty_tag_left = asyncio.run(scenario())
+
+    assert result == {"tags": 2, "orphans": 2, "empty_tags": 1}
+    assert members == {"youtube:channel:UC1"}
+    assert not empty_tag_left
@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+from app.core import circuit_breaker
+from app.core.circuit_breaker import CircuitBreaker
+
+
+class Clock:
+    """Substitui o módulo time do disjuntor."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker, "time", clock)
+    return clock
+
+
+def _breaker():
+    return CircuitBreaker(failure_threshold=3, base_cooldown=10, max_cooldown=30)
+
+
+def test_circuit_opens_after_consecutive_failures(fake_redis, clock):
+    breaker = _breaker()
+
+    async def scenario():
+        for _ in range(2):
+            await breaker.record_failure("UC1")
+        still_closed = await breaker.allow("UC1")
+        state = await breaker.record_failure("UC1")
+        return still_closed, state, await breaker.allow("UC1"), await breaker.allow("UC2")
+
+    still_closed, state, allowed, other_allowed = asyncio.run(scenario())
+
+    assert still_closed
+    assert state == {"failures": 3, "trips": 1, "open_until": 1010.0}
+    assert not allowed
+    assert other_allowed
+
+
+def test_one_probe_per_window_and_cooldown_doubles_up_to_the_maximum(fake_redis, clock):
+    breaker = _breaker()
+
+    async def scenario():
+        for _ in range(3):
+            state = await breaker.record_failure("UC1")
+        cooldowns = [state["open_until"] - clock.now]
+        for _ in range(3):
+            clock.now = state["open_until"] + 1
+            assert await breaker.allow("UC1")
+            assert not await breaker.allow("UC1")
+            state = await breaker.record_failure("UC1")
+            cooldowns.append(state["open_until"] - clock.now)
+        return cooldowns
+
+    assert asyncio.run(scenario()) == [10, 20, 30, 30]
+
+
+def test_success_closes_the_circuit(fake_redis, clock):
+    breaker = _breaker()
+
+    async def scenario():
+        for _ in range(3):
+            await breaker.record_failure("UC1")
+        clock.now += 11
+        assert await breaker.allow("UC1")
+        await breaker.record_success("UC1")
+        return await breaker.state("UC1"), await breaker.allow("UC1"), await breaker.allow("UC1")
+
+    state, first, second = asyncio.run(scenario())
+
+    assert state == {"failures": 0, "trips": 0, "open_until": None}
+    assert first and second
+
+
+def test_breaker_lets_calls_through_without_redis(fake_redis, redis_server, clock):
+    redis_server.connected = False
+    breaker = _breaker()
+
+    async def scenario():
+        for _ in range(5):
+            state = await breaker.record_failure("UC1")
+        return state, await breaker.allow("UC1")
+
+    state, allowed = asyncio.run(scenario())
+
+    assert state["open_until"] is None
+    assert allowed
@@ -0,0 +1,56 @@
+from datetime import date, datetime, time, timedelta, timezone
+from enum import Enum
+
+import pytest
+
+from app.core.codec import CodecError, JsonCodec, MsgpackCodec
+
+
+class Status(Enum):
+    ACTIVE = "active"
+
+
+VALUE = {
+    "title": "Vídeo",
+    "views": 123,
+    "published_at": datetime(2024, 3, 1, 12, 30, tzinfo=timezone.utc),
+    "day": date(2024, 3, 1),
+    "at": time(8, 15),
+    "duration": timedelta(minutes=5, seconds=3),
+    "tags": ["a", "b"],
+    "missing": None,
+}
+
+
+@pytest.mark.parametrize("codec_class", [MsgpackCodec, JsonCodec])
+def test_round_trip_keeps_types(codec_class):
+    codec = codec_class()
+
+    decoded = codec.decode(codec.encode({**VALUE, "status": Status.ACTIVE, "ids": {"x"}}))
+
+    assert decoded == {**VALUE, "status": "active", "ids": ["x"]}
+    assert type(decoded["published_at"]) is datetime
+    assert type(decoded["day"]) is date
+
+
+@pytest.mark.parametrize("codec_class", [MsgpackCodec, JsonCodec])
+def test_header_carries_version_and_compression(codec_class):
+    plain = codec_class().encode(VALUE)
+    compressed = codec_class(compress_threshold=16).encode(VALUE)
+
+    assert plain[:4] == b"HV" + bytes((codec_class.version, 0))
+    assert compressed[:4] == b"HV" + bytes((codec_class.version, 1))
+    assert codec_class().decode(compressed) == VALUE
+
+
+def test_other_versions_and_legacy_payloads_are_rejected():
+    payload = MsgpackCodec().encode(VALUE)
+
+    with pytest.raises(CodecError):
+        JsonCodec().decode(payload)
+    with pytest.raises(CodecError):
+        MsgpackCodec().decode(b'{"title": "json antigo"}')
+    with pytest.raises(CodecError):
+        MsgpackCodec().decode(payload[:4] + b"\xc1")
+    with pytest.raises(CodecError):
+        MsgpackCodec().decode(payload[:3] + b"\x01" + payload[4:])
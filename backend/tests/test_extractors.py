@@ -0,0 +1,19 @@
+from app.services.extractors import FixtureExtractor, YtDlpExtractor
+
+FEED_URL = "https://www.youtube.com/channel/UCaaaaaaaaaaaaaaaaaaaaaa/videos"
+
+
+def _feed(*video_ids):
+    return {"_type": "playlist", "entries": [{"id": video_id} for video_id in video_ids]}
+
+
+def test_paged_recordings_do_not_overwrite_the_full_feed(tmp_path):
+    recorder = YtDlpExtractor(record_dir=str(tmp_path))
+    recorder._record(FEED_URL, True, _feed("a", "b", "c", "d"))
+    recorder._record(FEED_URL, True, _feed("c", "d"), playlist_items="3-4")
+
+    replay = FixtureExtractor(str(tmp_path))
+    assert replay.extract_info(FEED_URL, {})["entries"] == _feed("a", "b", "c", "d")["entries"]
+    assert replay.extract_info(FEED_URL, {"playlist_items": "3-4"})["entries"] == _feed("c", "d")["entries"]
+    # Trechos sem gravação própria são recortados da gravação completa
+    assert replay.extract_info(FEED_URL, {"playlist_items": "2-3"})["entries"] == _feed("b", "c")["entries"]
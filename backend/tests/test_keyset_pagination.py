@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import models
+from app.crud.base import InvalidCursorError, decode_keyset_cursor, encode_keyset_cursor
+from app.crud.crud_youtube import crud_youtube
+
+START = datetime(2024, 1, 1)
+
+
+def _add_user(db):
+    user = models.User(name="Teste", email="teste@holyvoice.com", hashed_password="-")
+    db.add(user)
+    db.flush()
+    return user
+
+
+def _add_channel(db, user, created_at):
+    channel = models.YoutubeChannel(
+        channel_url="https://www.youtube.com/@canal",
+        youtube_id="UCaaaaaaaaaaaaaaaaaaaaaa",
+        channel_name="Canal",
+        api_key="-",
+        created_by=user.id,
+        created_at=created_at,
+    )
+    db.add(channel)
+    db.flush()
+    return channel
+
+
+def _walk(fetch, limit):
+    seen, cursor = [], None
+    while True:
+        rows, cursor = fetch(cursor=cursor, limit=limit)
+        seen.extend(row.id for row in rows)
+        if cursor is None:
+            return seen
+
+
+def test_pages_follow_the_sort_key_with_nulls_last(db):
+    user = _add_user(db)
+    dates = [START, START + timedelta(days=1), None, START + timedelta(days=1), None, START - timedelta(days=1)]
+    channels = [_add_channel(db, user, created_at) for created_at in dates]
+    # Sem valor, o INSERT usa o server_default: os NULLs vêm de um UPDATE
+    db.query(models.YoutubeChannel).filter(
+        models.YoutubeChannel.id.in_([c.id for c, d in zip(channels, dates) if d is None])
+    ).update({"created_at": None}, synchronize_session="fetch")
+    db.commit()
+    assert db.query(models.YoutubeChannel).filter(models.YoutubeChannel.created_at.is_(None)).count() == 2
+
+    expected = [
+        channel.id for channel in sorted(
+            channels,
+            key=lambda c: (c.created_at is not None, c.created_at or START, c.id),
+            reverse=True
+        )
+    ]
+    for limit in (1, 2, 4, 10):
+        assert _walk(lambda **kw: crud_youtube.get_page(db, **kw), limit) == expected
+
+
+def test_videos_with_the_same_date_are_not_skipped(db):
+    user = _add_user(db)
+    channel = _add_channel(db, user, START)
+    videos = [
+        models.YoutubeVideo(
+            channel_id=channel.id,
+            video_id=f"video{i:06d}",
+            title=f"Vídeo {i}",
+            published_at=START + timedelta(days=i // 3),
+        )
+        for i in range(9)
+    ]
+    db.add_all(videos)
+    db.commit()
+
+    walked = _walk(
+        lambda **kw: crud_youtube.get_videos_by_channel_page(db, channel_id=channel.id, **kw), 2
+    )
+    expected = [v.id for v in sorted(videos, key=lambda v: (v.published_at, v.id), reverse=True)]
+    assert walked == expected
+
+
+def test_cursor_round_trip_and_scope():
+    cursor = encode_keyset_cursor("videos:channel:1", None, 7)
+    assert decode_keyset_cursor("videos:channel:1", cursor) == (None, 7)
+    assert decode_keyset_cursor("x", encode_keyset_cursor("x", START, 3)) == (START, 3)
+    with pytest.raises(InvalidCursorError):
+        decode_keyset_cursor("videos:channel:2", cursor)
+    with pytest.raises(InvalidCursorError):
+        decode_keyset_cursor("videos:channel:1", "não é um cursor")
@@ -0,0 +1,53 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.core import cache
+from app.core.cache import LocalCache, YouTubeCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    local = LocalCache(max_size=2, ttl=60)
+    local.set("a", 1)
+    local.set("b", 2)
+    local.get("a")
+    local.set("c", 3)
+
+    assert local.get("a") == (True, 1)
+    assert local.get("b") == (False, None)
+    assert len(local) == 2
+
+
+def test_entries_expire_with_the_shorter_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    local = LocalCache(max_size=10, ttl=30)
+    local.set("short", 1, ttl=5)
+    local.set("long", 2, ttl=600)
+
+    now[0] += 10
+    assert local.get("short") == (False, None)
+    assert local.get("long") == (True, 2)
+    now[0] += 30
+    assert local.get("long") == (False, None)
+
+
+def test_reads_are_served_from_memory_before_redis(fake_redis, redis_server):
+    async def scenario():
+        await YouTubeCache.set_cache("youtube:channel:UC1", {"n": 1}, expire=600)
+        redis_server.connected = False
+        return await YouTubeCache.get_cache("youtube:channel:UC1")
+
+    assert asyncio.run(scenario()) == {"n": 1}
+
+
+def test_values_from_redis_are_kept_in_memory(fake_redis):
+    async def scenario():
+        await YouTubeCache.set_cache("youtube:channel:UC1", {"n": 1}, expire=600)
+        cache.local_cache.clear()
+        value = await YouTubeCache.get_cache("youtube:channel:UC1")
+        return value, cache.local_cache.get("youtube:channel:UC1")
+
+    value, local = asyncio.run(scenario())
+
+    assert value == {"n": 1}
+    assert local == (True, {"n": 1})
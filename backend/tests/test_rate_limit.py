@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from app.core import rate_limit
+from app.core.rate_limit import RateLimitExceeded, YouTubeRateLimiter, is_throttling_error
+
+
+def _limiter(per_minute=60, burst=3):
+    return YouTubeRateLimiter(
+        limits={"channel": per_minute, "default": per_minute},
+        burst=burst,
+        backoff_base=1.0,
+        backoff_max=4.0,
+    )
+
+
+def test_burst_is_spent_then_callers_are_held(fake_redis):
+    limiter = _limiter()
+
+    async def scenario():
+        for _ in range(3):
+            await limiter.acquire("channel", timeout=0)
+        remaining = await limiter.remaining("channel")
+        with pytest.raises(RateLimitExceeded):
+            await limiter.acquire("channel", timeout=0.1)
+        # Outras classes têm seu próprio balde
+        await limiter.acquire("video", timeout=0)
+        return remaining
+
+    assert asyncio.run(scenario()) < 1
+
+
+def test_tokens_refill_at_the_configured_rate(fake_redis):
+    limiter = _limiter(per_minute=3000, burst=1)
+
+    async def scenario():
+        await limiter.acquire("channel", timeout=0)
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        await limiter.acquire("channel", timeout=1)
+        return loop.time() - started_at
+
+    assert 0.005 < asyncio.run(scenario()) < 0.5
+
+
+def test_throttling_backoff_doubles_up_to_the_maximum(fake_redis, monkeypatch):
+    monkeypatch.setattr(rate_limit.random, "uniform", lambda low, high: high)
+    limiter = _limiter()
+
+    async def scenario():
+        delays = []
+        for _ in range(4):
+            delays.append(await limiter.report_throttled())
+            # Um segundo bloqueio durante a mesma espera não a aumenta
+            assert await limiter.report_throttled() <= delays[-1]
+            assert await limiter.remaining("channel") == 0
+            with pytest.raises(RateLimitExceeded):
+                await limiter.acquire("video", timeout=0.1)
+            await fake_redis.delete(limiter._backoff_key)
+        return delays
+
+    assert asyncio.run(scenario()) == [1.0, 2.0, 4.0, 4.0]
+
+
+def test_limiter_lets_calls_through_without_redis(fake_redis, redis_server):
+    redis_server.connected = False
+    limiter = _limiter(burst=1)
+
+    async def scenario():
+        for _ in range(5):
+            await limiter.acquire("channel", timeout=0)
+        return await limiter.remaining("channel"), await limiter.report_throttled()
+
+    assert asyncio.run(scenario()) == (1.0, 0.0)
+
+
+def test_throttling_errors_are_recognized():
+    assert is_throttling_error(Exception("HTTP Error 429: Too Many Requests"))
+    assert is_throttling_error(Exception("Sign in to confirm you're not a bot"))
+    assert not is_throttling_error(Exception("Video unavailable"))
@@ -0,0 +1,104 @@
+import asyncio
+import json
+
+from app.core.singleflight import SingleFlight
+
+
+class Loader:
+    def __init__(self, result="ok", delay=0.05):
+        self.result = result
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.result
+
+
+def _flight():
+    return SingleFlight(lock_ttl=5, result_ttl=60, poll_interval=0.01)
+
+
+def test_concurrent_calls_share_one_execution(fake_redis):
+    flight = _flight()
+    loader = Loader(result={"id": "v1"})
+
+    async def scenario():
+        results = await asyncio.gather(*(flight.do("k", loader) for _ in range(5)))
+        return results, await fake_redis.exists("youtube:inflight:k")
+
+    results, lock_left = asyncio.run(scenario())
+
+    assert loader.calls == 1
+    assert results == [{"id": "v1"}] * 5
+    assert not lock_left
+
+
+def test_cancelled_caller_does_not_cancel_the_others(fake_redis):
+    flight = _flight()
+    loader = Loader(delay=0.1)
+
+    async def scenario():
+        first = asyncio.ensure_future(flight.do("k", loader))
+        second = asyncio.ensure_future(flight.do("k", loader))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == "ok"
+    assert loader.calls == 1
+
+
+def test_follower_waits_for_the_result_of_another_process(fake_redis):
+    flight = _flight()
+    loader = Loader()
+
+    async def scenario():
+        await fake_redis.set("youtube:inflight:k", "other-process")
+
+        async def leader():
+            await asyncio.sleep(0.05)
+            await fake_redis.set("youtube:inflight:k:result", json.dumps("from leader"))
+            await fake_redis.delete("youtube:inflight:k")
+
+        _, result = await asyncio.gather(leader(), flight.do("k", loader))
+        return result
+
+    assert asyncio.run(scenario()) == "from leader"
+    assert loader.calls == 0
+
+
+def test_follower_runs_locally_when_the_leader_gives_up(fake_redis):
+    flight = _flight()
+    loader = Loader()
+
+    async def scenario():
+        await fake_redis.set("youtube:inflight:k", "other-process")
+
+        async def failed_leader():
+            await asyncio.sleep(0.05)
+            await fake_redis.delete("youtube:inflight:k")
+
+        _, result = await asyncio.gather(failed_leader(), flight.do("k", loader))
+        return result
+
+    assert asyncio.run(scenario()) == "ok"
+    assert loader.calls == 1
+
+
+def test_without_redis_calls_are_coalesced_in_process(fake_redis, redis_server):
+    redis_server.connected = False
+    flight = _flight()
+    loader = Loader()
+
+    async def scenario():
+        return await asyncio.gather(flight.do("k", loader), flight.do("k", loader))
+
+    assert asyncio.run(scenario()) == ["ok", "ok"]
+    assert loader.calls == 1
+
+
+def test_make_key_ignores_option_order():
+    assert SingleFlight.make_key("m", "u", {"a": 1, "b": 2}) == SingleFlight.make_key("m", "u", {"b": 2, "a": 1})
+    assert SingleFlight.make_key("m", "u", {"a": 1}) != SingleFlight.make_key("m", "u", {"a": 2})
@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from app import models
+from app.crud.crud_youtube import crud_youtube
+
+
+def _video(video_id, title):
+    return {"video_id": video_id, "title": title, "published_at": datetime(2024, 1, 1)}
+
+
+def test_upsert_updates_existing_rows_and_their_timestamp(db):
+    user = models.User(name="Teste", email="teste@holyvoice.com", hashed_password="-")
+    db.add(user)
+    db.flush()
+    channel = models.YoutubeChannel(
+        channel_url="https://www.youtube.com/@canal",
+        youtube_id="UCaaaaaaaaaaaaaaaaaaaaaa",
+        channel_name="Canal",
+        api_key="-",
+        created_by=user.id,
+    )
+    db.add(channel)
+    db.flush()
+
+    first = crud_youtube.upsert_videos(db, channel_id=channel.id, videos=[_video("a", "A"), _video("b", "B")])
+    assert [video.updated_at for video in first] == [None, None]
+
+    second = crud_youtube.upsert_videos(
+        db, channel_id=channel.id, videos=[_video("b", "B2"), _video("c", "C"), _video("b", "B3")]
+    )
+    assert [video.video_id for video in second] == ["b", "c"]
+    assert second[0].id == first[1].id
+    assert second[0].title == "B3"
+    assert second[0].updated_at is not None
+    assert db.query(models.YoutubeVideo).count() == 3
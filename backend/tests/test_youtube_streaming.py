@@ -0,0 +1,75 @@
+import asyncio
+from contextlib import aclosing
+
+from app.services.extractors import BaseExtractor
+from app.services.youtube import YouTubeService
+
+CHANNEL_ID = "UCaaaaaaaaaaaaaaaaaaaaaa"
+
+
+class FeedExtractor(BaseExtractor):
+    """Feed em memória que conta as leituras e as entradas consumidas."""
+
+    def __init__(self, video_ids):
+        self.video_ids = list(video_ids)
+        self.reads = 0
+        self.pulled = 0
+
+    def iter_entries(self, url, ydl_opts):
+        self.reads += 1
+        for video_id in list(self.video_ids):
+            self.pulled += 1
+            yield {"id": video_id, "title": video_id}
+
+
+def _ids(page):
+    return [video["id"] for video in page["items"]]
+
+
+async def _collect(service, **kwargs):
+    pages = []
+    async with aclosing(service.iter_recent_videos(CHANNEL_ID, **kwargs)) as stream:
+        async for page in stream:
+            pages.append(page)
+    return pages
+
+
+def test_pages_come_from_a_single_read(fake_redis):
+    extractor = FeedExtractor(f"v{i}" for i in range(10))
+    service = YouTubeService(extractor=extractor)
+
+    pages = asyncio.run(_collect(service, page_size=3))
+
+    assert [_ids(page) for page in pages] == [
+        ["v0", "v1", "v2"], ["v3", "v4", "v5"], ["v6", "v7", "v8"], ["v9"]
+    ]
+    assert [page["next_cursor"] is None for page in pages] == [False, False, False, True]
+    assert extractor.reads == 1
+
+
+def test_cursor_resumes_after_the_last_delivered_entry(fake_redis):
+    extractor = FeedExtractor(f"v{i}" for i in range(6))
+    service = YouTubeService(extractor=extractor)
+
+    async def scenario():
+        async with aclosing(service.iter_recent_videos(CHANNEL_ID, page_size=2)) as stream:
+            first = await stream.__anext__()
+        # Vídeos novos deslocam o feed entre uma requisição e outra
+        extractor.video_ids[:0] = ["new1", "new2"]
+        resumed = await _collect(service, page_size=2, cursor=first["next_cursor"])
+        return first, resumed
+
+    first, resumed = asyncio.run(scenario())
+    assert _ids(first) == ["v0", "v1"]
+    assert [_ids(page) for page in resumed] == [["v2", "v3"], ["v4", "v5"]]
+
+
+def test_known_video_stops_the_read(fake_redis):
+    extractor = FeedExtractor(f"v{i}" for i in range(1000))
+    service = YouTubeService(extractor=extractor)
+
+    pages = asyncio.run(_collect(service, page_size=50, known_video_ids={"v3"}))
+
+    assert [_ids(page) for page in pages] == [["v0", "v1", "v2"]]
+    # A leitura não adianta mais que uma entrada além da conhecida
+    assert extractor.pulled <= 5
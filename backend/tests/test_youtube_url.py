@@ -0,0 +1,54 @@
+import asyncio
+
+from app.core.cache import YouTubeCache
+from app.services.youtube import YouTubeService
+from app.services.youtube_url import normalize_channel_url
+
+CHANNEL_A = "UCaaaaaaaaaaaaaaaaaaaaaa"
+CHANNEL_B = "UCbbbbbbbbbbbbbbbbbbbbbb"
+
+
+def test_normalize_channel_url_keys_only_channel_urls():
+    assert normalize_channel_url("https://www.youtube.com/@Canal/videos") == "youtube.com/@canal"
+    assert normalize_channel_url("youtube.com/c/Canal") == "youtube.com/c/canal"
+    assert normalize_channel_url("https://youtube.com/user/Canal") == "youtube.com/user/canal"
+    assert normalize_channel_url("https://www.youtube.com/Canal") == "youtube.com/canal"
+
+    assert normalize_channel_url("https://www.youtube.com/watch?v=dQw4w9WgXcQ") is None
+    assert normalize_channel_url("https://www.youtube.com/shorts/dQw4w9WgXcQ") is None
+    assert normalize_channel_url("https://www.youtube.com/embed/dQw4w9WgXcQ") is None
+    assert normalize_channel_url("https://www.youtube.com/live/dQw4w9WgXcQ") is None
+    assert normalize_channel_url("https://www.youtube.com/playlist?list=PL123") is None
+    assert normalize_channel_url("https://www.youtube.com/results?search_query=x") is None
+    assert normalize_channel_url("https://www.youtube.com/channel/UCbad") is None
+    assert normalize_channel_url("https://www.youtube.com/c/") is None
+
+
+def test_watch_urls_do_not_share_a_resolution(monkeypatch):
+    resolutions = {}
+
+    async def get_channel_resolution(url_key):
+        return resolutions.get(url_key)
+
+    async def set_channel_resolution(url_key, youtube_id, expire):
+        resolutions[url_key] = {"youtube_id": youtube_id}
+
+    monkeypatch.setattr(YouTubeCache, "get_channel_resolution", get_channel_resolution)
+    monkeypatch.setattr(YouTubeCache, "set_channel_resolution", set_channel_resolution)
+
+    channels = {
+        "https://www.youtube.com/watch?v=aaaaaaaaaaa": CHANNEL_A,
+        "https://www.youtube.com/watch?v=bbbbbbbbbbb": CHANNEL_B,
+    }
+    service = YouTubeService()
+
+    async def extract_info(method, url, ydl_opts=None, process=True):
+        return {"channel_id": channels[url]}
+
+    monkeypatch.setattr(service, "_extract_info", extract_info)
+
+    async def resolve():
+        return [await service.extract_channel_id(url) for url in channels]
+
+    assert asyncio.run(resolve()) == [CHANNEL_A, CHANNEL_B]
+    assert resolutions == {}